@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+
+from data_loader import data_version, load_all_data
+from filters import NO_FILTERS, filtered_all_data
+
+# Columns of all_data needed for the basket analysis
+BASKET_COLUMNS = ["order_id", "customer_unique_id", "product_category_name_english"]
+
+# Pair metrics offered for ranking: column -> label
+PAIR_METRICS = {
+    "lift": "Lift",
+    "confidence": "Confidence",
+    "support": "Support",
+    "orders": "Orders",
+}
+
+
+class BasketStats:
+    """Category co-purchases and repeat purchases from sparse incidence matrices.
+
+    Orders and categories are factorized into the rows and columns of a 0/1
+    order x category CSR matrix X. X.T @ X counts the orders holding every
+    pair of categories, and summing X's rows per customer gives the orders
+    of each customer in each category, without any Python-level loop over
+    orders or pairs.
+    """
+
+    def __init__(self, df):
+        # Lines without a category, order or customer do not belong to any basket
+        df = df.dropna(subset=BASKET_COLUMNS)
+        orders, _ = pd.factorize(df["order_id"])
+        categories, names = pd.factorize(df["product_category_name_english"], sort=True)
+        customers, _ = pd.factorize(df["customer_unique_id"])
+        self.categories = [str(name) for name in names]
+
+        # Order x category incidence, 1 when the order has any line of the category
+        x = sparse.csr_matrix(
+            (np.ones(len(orders), dtype="int32"), (orders, categories)),
+            shape=(orders.max() + 1 if len(orders) else 0, len(self.categories)),
+        )
+        x.data[:] = 1
+        n_orders_per_category = np.asarray(x.sum(axis=0)).ravel()
+        self.n_orders = x.shape[0]
+        self.category_orders = pd.Series(n_orders_per_category, index=self.categories, name="orders")
+
+        # Only orders with two categories or more add to the co-occurrence counts
+        basket = x[np.diff(x.indptr) >= 2]
+        self.n_multi_category_orders = basket.shape[0]
+        self._pairs = self._pair_table(sparse.triu(basket.T @ basket, k=1).tocoo(), n_orders_per_category)
+
+        # Customer x category: number of orders of the customer holding the category
+        order_customer = np.zeros(x.shape[0], dtype="int64")
+        order_customer[orders] = customers
+        x = x.tocoo()
+        self._customer_category = sparse.csr_matrix(
+            (x.data, (order_customer[x.row], x.col)),
+            shape=(customers.max() + 1 if len(customers) else 0, len(self.categories)),
+        )
+        self._customer_orders = np.bincount(order_customer, minlength=self._customer_category.shape[0])
+
+    def _pair_table(self, co, n_orders_per_category):
+        a, b, both = co.row, co.col, co.data.astype("int64")
+        n = max(self.n_orders, 1)
+        support_a, support_b = n_orders_per_category[a] / n, n_orders_per_category[b] / n
+        confidence_a_b = both / n_orders_per_category[a]
+        confidence_b_a = both / n_orders_per_category[b]
+        return pd.DataFrame({
+            "category_a": np.asarray(self.categories, dtype=object)[a],
+            "category_b": np.asarray(self.categories, dtype=object)[b],
+            "orders": both,
+            "support": both / n,
+            "confidence_a_to_b": confidence_a_b,
+            "confidence_b_to_a": confidence_b_a,
+            "confidence": np.maximum(confidence_a_b, confidence_b_a),
+            "lift": both / n / (support_a * support_b),
+        })
+
+    def top_pairs(self, metric="lift", k=20, min_orders=1) -> pd.DataFrame:
+        """The `k` category pairs bought together in at least `min_orders` orders with the highest `metric`.
+
+        Support is the share of orders holding both categories, confidence
+        A -> B the share of A's orders also holding B ("confidence" is the
+        higher of both directions), and lift how much more often the pair
+        occurs than if the categories were bought independently.
+        """
+        pairs = self._pairs[self._pairs["orders"] >= min_orders]
+        return pairs.nlargest(k, [metric, "orders"]).reset_index(drop=True)
+
+    def category_repeat(self, min_customers=1) -> pd.DataFrame:
+        """Customers per category, and how many of them bought it again in a later order."""
+        orders = self._customer_category
+        customers = np.bincount(orders.indices, minlength=len(self.categories))
+        repeat = np.bincount(orders.indices[orders.data >= 2], minlength=len(self.categories))
+        df = pd.DataFrame({"category": self.categories, "customers": customers, "repeat_customers": repeat})
+        df = df[df["customers"] >= max(min_customers, 1)].assign(repeat_rate=lambda d: d["repeat_customers"] / d["customers"])
+        return df.sort_values(["repeat_rate", "customers"], ascending=False, ignore_index=True)
+
+    def repeat_summary(self):
+        """Customers, customers with 2 orders or more, and how many of those bought one category twice."""
+        orders = self._customer_category
+        customer_of_entry = np.repeat(np.arange(orders.shape[0]), np.diff(orders.indptr))
+        return {
+            "customers": int(np.count_nonzero(self._customer_orders)),
+            "multi_order_customers": int(np.count_nonzero(self._customer_orders >= 2)),
+            "same_category_customers": len(np.unique(customer_of_entry[orders.data >= 2])),
+        }
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _basket_stats(version):
+    return BasketStats(load_all_data(columns=BASKET_COLUMNS))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _filtered_basket_stats(version, filters):
+    return BasketStats(filtered_all_data(BASKET_COLUMNS, filters))
+
+
+def load_basket_stats(filters=NO_FILTERS) -> BasketStats:
+    """BasketStats of the current all_data, built once per data version and filter selection."""
+    version = data_version()
+    if filters.active:
+        return _filtered_basket_stats(version, filters)
+    return _basket_stats(version)
@@ -0,0 +1,276 @@
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from baskets import BasketStats
+from clustering import cluster_profile, cluster_rfm
+from cohorts import cohort_matrix
+from cube import compute_aggregate
+from delivery import DeliveryStats
+from distance import distance_bands, order_distances
+from etl import add_order_durations, clean_products, join_orders, order_lines
+from geo_index import GeoIndex, build_index
+from ingest import ingest
+from payments import PaymentStats
+from rfm import compute_rfm, segment_counts
+from reviews import review_stats
+from schema import apply_schema
+from sellers import SellerFacts, build_seller_facts
+from timebucket import count_unique_per_period
+
+# Headless benchmark of the notebook's data preparation and of the computations
+# behind every dashboard page, at several data scales. Nothing is cached between
+# runs: every stage is computed from its inputs like on a cold start.
+
+DEFAULT_SCALES = [1, 10, 100]
+
+# ID columns made unique in every copy of a scaled table. Products, sellers and
+# the category translation are dimensions and are not copied; geolocation rows
+# are copied as they are.
+SCALED_IDS = {
+    "orders": ["order_id", "customer_id"],
+    "order_items": ["order_id"],
+    "order_payments": ["order_id"],
+    "order_reviews": ["review_id", "order_id"],
+    "customers": ["customer_id", "customer_unique_id"],
+    "geolocation": [],
+}
+
+
+def scale_tables(tables, factor):
+    """Copy of the raw tables with `factor` times as many orders and customers.
+
+    Every copy of a fact table gets its IDs suffixed with the copy number, so the
+    copies join among themselves like the original and RFM sees new customers.
+    """
+    if factor == 1:
+        return dict(tables)
+    scaled = dict(tables)
+    for table, id_columns in SCALED_IDS.items():
+        df = tables[table]
+        copies = []
+        for copy in range(factor):
+            if copy == 0 or not id_columns:
+                copies.append(df)
+                continue
+            copies.append(df.assign(**{col: df[col] + f"-{copy}" for col in id_columns}))
+        scaled[table] = pd.concat(copies, ignore_index=True)
+    return scaled
+
+
+def measure(func, *args, repeat=1):
+    """Run func(*args) and return (result, best wall time in seconds, peak traced bytes).
+
+    The time is the best of `repeat` plain runs; the peak memory comes from one
+    more run under tracemalloc (which slows it down), so timings are not skewed.
+    tracemalloc sees Python and NumPy allocations, not Arrow string buffers.
+    """
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(*args)
+        seconds.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, min(seconds), peak
+
+
+def prepare_orders(orders_df):
+    # Durations, then the notebook's forward fill of the delivered date
+    orders_df = add_order_durations(orders_df.copy())
+    orders_df["order_delivered_customer_date"] = orders_df["order_delivered_customer_date"].ffill()
+    return orders_df
+
+
+def build_all_data(orders_df, lines_df, tables, products_df):
+    customers_df = tables["customers"].assign(
+        customer_zip_code_prefix=tables["customers"]["customer_zip_code_prefix"].astype(str)
+    )
+    return join_orders(orders_df, lines_df, tables["order_reviews"], products_df, customers_df)
+
+
+def add_rfm(all_df):
+    rfm_df = compute_rfm(all_df)
+    return all_df.merge(rfm_df, on="customer_unique_id", how="left")
+
+
+# Data preparation of each page (views/<page>.py), without the Streamlit caches
+
+def customer_page(all_df):
+    return compute_aggregate("customers_by_city", all_df), compute_aggregate("customers_by_state", all_df)
+
+
+def geolocation_page(geolocation_df):
+    geo_index = GeoIndex(**build_index(geolocation_df))
+    return [geo_index.cities(state) for state in geo_index.states], geo_index
+
+
+def payment_page(order_payments_df):
+    payment_stats = PaymentStats(order_payments_df)
+    return payment_stats.summary(), payment_stats.installments_histogram(), payment_stats.sequential_histogram()
+
+
+def review_page(all_df):
+    return review_stats(all_df)
+
+
+def order_page(all_df, order_items_df):
+    return (
+        compute_aggregate("order_status_counts", all_df),
+        count_unique_per_period(order_items_df, "shipping_limit_date", "order_id", "Month"),
+    )
+
+
+def products_page(all_df):
+    return compute_aggregate("products_by_category", all_df)
+
+
+def basket_page(all_df):
+    basket_stats = BasketStats(all_df)
+    return basket_stats.top_pairs(), basket_stats.category_repeat(), basket_stats.repeat_summary()
+
+
+def delivery_page(all_df):
+    stats = DeliveryStats(all_df)
+    return stats.summary(), stats.percentiles(), stats.by_state(), stats.by_month()
+
+
+def distance_page(all_df, sellers_df, centroids):
+    return distance_bands(order_distances(all_df, sellers_df, centroids).dropna(subset=["distance_km"]))
+
+
+def seller_page(all_df, sellers_df):
+    seller_facts = SellerFacts(build_seller_facts(all_df, sellers_df))
+    return [seller_facts.rank(metric, 10, bottom) for metric in ("revenue", "late_shipping_rate") for bottom in (False, True)]
+
+
+def rfm_page(all_df):
+    rfm_df = compute_rfm(all_df)
+    return rfm_df, segment_counts(rfm_df)
+
+
+def rfm_cluster_page(rfm_df, k=5):
+    clusters, silhouette = cluster_rfm(rfm_df, k)
+    return cluster_profile(rfm_df, clusters), silhouette
+
+
+def cohort_page(all_df):
+    matrix = cohort_matrix(all_df)
+    return matrix.retention(), matrix.average_retention()
+
+
+def run_scale(tables, factor, repeat=1, log=print) -> list:
+    """Benchmark every stage on `tables` scaled by `factor`; one result dict per stage."""
+    tables = scale_tables(tables, factor)
+    results = []
+
+    def stage(name, func, *args):
+        result, seconds, peak = measure(func, *args, repeat=repeat)
+        results.append({
+            "scale": factor,
+            "stage": name,
+            "rows": len(args[0]),
+            "seconds": round(seconds, 4),
+            "peak_bytes": int(peak),
+        })
+        log(f"{factor:>4}x {name:<24} {seconds:8.3f}s {peak / 2**20:10.1f} MiB")
+        return result
+
+    # Notebook ETL
+    products_df = stage("etl.products", clean_products, tables["products"], tables["product_category_name_translation"])
+    orders_df = stage("etl.orders", prepare_orders, tables["orders"])
+    lines_df = stage("etl.jumlah_df", order_lines, tables["order_items"])
+    all_df = stage("etl.merge_chain", build_all_data, orders_df, lines_df, tables, products_df)
+    all_df = stage("etl.rfm", add_rfm, all_df)
+    all_df = stage("etl.schema", apply_schema, all_df, "all_data")
+
+    # Pages
+    stage("page.customer", customer_page, all_df)
+    _, geo_index = stage("page.geolocation", geolocation_page, tables["geolocation"])
+    stage("page.payment", payment_page, tables["order_payments"])
+    stage("page.review", review_page, all_df)
+    stage("page.order", order_page, all_df, tables["order_items"])
+    stage("page.products", products_page, all_df)
+    stage("page.basket", basket_page, all_df)
+    stage("page.delivery", delivery_page, all_df)
+    stage("page.distance", distance_page, all_df, tables["sellers"], geo_index.centroids)
+    stage("page.sellers", seller_page, all_df, tables["sellers"])
+    rfm_df, _ = stage("page.rfm", rfm_page, all_df)
+    stage("page.rfm_clusters", rfm_cluster_page, rfm_df)
+    stage("page.cohorts", cohort_page, all_df)
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(data_dir="data", scales=DEFAULT_SCALES, repeat=1, log=print) -> dict:
+    """Benchmark report for the raw tables in `data_dir` at every scale in `scales`."""
+    tables, timings = ingest(data_dir)
+    results = [
+        {"scale": 1, "stage": f"load.{row.table}", "rows": int(row.rows), "seconds": row.seconds, "peak_bytes": None}
+        for row in timings.itertuples()
+    ]
+    for factor in scales:
+        results.extend(run_scale(tables, factor, repeat, log))
+    return {
+        "commit": _git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(baseline, report) -> pd.DataFrame:
+    """Per stage and scale, time and peak memory of `report` relative to `baseline` (two reports)."""
+    keys = ["scale", "stage"]
+    before = pd.DataFrame(baseline["results"]).set_index(keys)
+    after = pd.DataFrame(report["results"]).set_index(keys)
+    joined = before.join(after, how="inner", lsuffix="_before", rsuffix="_after")
+    joined["time_ratio"] = (joined["seconds_after"] / joined["seconds_before"]).round(2)
+    joined["memory_ratio"] = (joined["peak_bytes_after"] / joined["peak_bytes_before"]).round(2)
+    columns = ["seconds_before", "seconds_after", "time_ratio", "peak_bytes_before", "peak_bytes_after", "memory_ratio"]
+    return joined[columns].reset_index()
+
+
+if __name__ == "__main__":
+    # Benchmark the ETL and page computations, from the repository root:
+    #   python dashboard/benchmark.py --scales 1 10 100 --out benchmark.json [--compare old.json]
+    parser = argparse.ArgumentParser(description="Time the ETL and page computations at several data scales")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per stage (the best is kept)")
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--compare", help="earlier report to compare the results with")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.data_dir, args.scales, args.repeat)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), report).to_string(index=False))
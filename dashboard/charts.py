@@ -0,0 +1,122 @@
+import inspect
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.utils
+import streamlit as st
+
+from data_loader import data_version
+
+# Chart layer of the pages. A page passes plotly_chart() a function building
+# its figure from data that is already aggregated, and a key naming the data
+# version and the parameters of the figure. The figure is built once per key
+# and shared between sessions, its JSON must fit in PAYLOAD_BUDGET, and
+# builders taking `max_points` decimate their line or scatter series with
+# downsample() until it does.
+
+# Points kept per trace of a line or scatter chart
+MAX_POINTS = 2000
+# Fewest points a series is decimated to before a figure is rejected
+MIN_POINTS = 100
+# Largest figure sent to the browser, in bytes of JSON
+PAYLOAD_BUDGET = 500_000
+
+
+class FigureTooLarge(ValueError):
+    pass
+
+
+def lttb(x, y, n_out):
+    """Positions of the `n_out` points of the series (x, y) kept by Largest-Triangle-Three-Buckets.
+
+    `x` must be sorted. The first and last points are always kept; the others
+    are split into n_out - 2 buckets, each keeping the point that forms the
+    largest triangle with the point kept in the previous bucket and the mean
+    of the next bucket, so peaks and dips survive the decimation.
+    """
+    n = len(x)
+    if n <= n_out:
+        return np.arange(n)
+    bounds = np.append(np.linspace(1, n - 1, n_out - 1).astype("int64"), n)
+    kept = np.empty(n_out, dtype="int64")
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = bounds[i], bounds[i + 1], bounds[i + 2]
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = kept[i + 1] = start + np.argmax(area)
+    return kept
+
+
+def _as_float(values):
+    # x positions for LTTB: numbers and timestamps as they are, anything else by rank
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").astype("int64").astype("float64")
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype="float64")
+    return np.arange(len(values), dtype="float64")
+
+
+def downsample(df, x, y, max_points=MAX_POINTS, by=None) -> pd.DataFrame:
+    """At most `max_points` rows of `df` per value of `by` (one trace each), chosen with lttb() along `x`.
+
+    Rows missing `x` or `y` are dropped, as plotly would not draw them.
+    """
+    df = df.dropna(subset=[x, y])
+    parts = [df] if by is None else [part for _, part in df.groupby(by, observed=True, sort=False)]
+    sampled = []
+    for part in parts:
+        part = part.sort_values(x, kind="stable")
+        sampled.append(part.iloc[lttb(_as_float(part[x]), part[y].to_numpy(dtype="float64"), max_points)])
+    return pd.concat(sampled) if sampled else df
+
+
+def payload_size(fig):
+    """Bytes of the figure JSON, serialized as st.plotly_chart does."""
+    return len(json.dumps(fig.to_dict(), cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def build_figure(build, *args, budget=PAYLOAD_BUDGET, **kwargs):
+    """build(*args, **kwargs), decimated further while its JSON exceeds `budget` bytes.
+
+    Only builders with a `max_points` parameter can be decimated; any other
+    figure over the budget raises FigureTooLarge, as it plots rows that should
+    have been aggregated first.
+    """
+    max_points = MAX_POINTS if "max_points" in inspect.signature(build).parameters else None
+    while True:
+        fig = build(*args, **kwargs) if max_points is None else build(*args, max_points=max_points, **kwargs)
+        size = payload_size(fig)
+        if size <= budget:
+            return fig
+        if max_points is None or max_points <= MIN_POINTS:
+            raise FigureTooLarge(
+                f"{build.__qualname__} makes {size:,} bytes of figure JSON, over the budget of {budget:,}; "
+                "aggregate or downsample the data before plotting"
+            )
+        max_points = max(MIN_POINTS, int(max_points * budget / size * 0.9))
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def _cached_figure(name, key, _build, _args, _kwargs):
+    return build_figure(_build, *_args, **_kwargs)
+
+
+def figure_key(tables, *params):
+    """Cache key of a figure: the versions of the `tables` it is built from, and its parameters."""
+    return tuple(data_version(name) for name in tables) + params
+
+
+def plotly_chart(build, *args, key, **kwargs):
+    """Display build(*args, **kwargs), built once per `key` and shared between sessions.
+
+    `key` must change with everything the figure shows, usually
+    figure_key(DATA, filters, <widget values>); the arguments themselves are
+    not hashed. The cached figure must not be modified.
+    """
+    name = f"{build.__module__}.{build.__qualname__}"
+    fig = _cached_figure(name, key, build, args, kwargs)
+    st.plotly_chart(fig)
+    return fig
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+# Customer segmentation by k-means on the RFM features, an alternative to the
+# fixed RFM score thresholds of rfm.segment()
+
+CLUSTER_FEATURES = ["recency", "frequency", "monetary"]
+
+# Mini-batch k-means: points per batch, most batches, and the center shift
+# (in standard deviations) under which the centers count as converged
+BATCH_SIZE = 4096
+MAX_BATCHES = 200
+TOLERANCE = 1e-4
+
+# Points used by the k-means++ seeding and by the silhouette diagnostic
+INIT_SAMPLE = 20_000
+SILHOUETTE_SAMPLE = 2000
+
+# Points assigned to their center at a time (bounds the distance matrix)
+ASSIGN_CHUNK = 500_000
+
+
+def standardize(rfm_df):
+    """RFM features as a float array with zero mean and unit variance per column.
+
+    Frequency and monetary value are heavily right-skewed, so they are
+    log-transformed first; otherwise a few big spenders would each get a
+    cluster of their own.
+    """
+    features = np.column_stack([
+        rfm_df["recency"].to_numpy(dtype="float64"),
+        np.log1p(rfm_df["frequency"].to_numpy(dtype="float64")),
+        np.log1p(np.clip(rfm_df["monetary"].to_numpy(dtype="float64"), 0, None)),
+    ])
+    std = features.std(axis=0)
+    return (features - features.mean(axis=0)) / np.where(std > 0, std, 1)
+
+
+def _squared_distances(points, centers):
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2, for every (point, center)
+    distances = (points**2).sum(axis=1)[:, None] - 2 * points @ centers.T + (centers**2).sum(axis=1)[None, :]
+    return np.maximum(distances, 0)
+
+
+def _kmeans_plus_plus(points, k, rng):
+    """k initial centers drawn from `points`, each with probability proportional to its squared distance to the closest center so far."""
+    centers = [points[rng.integers(len(points))]]
+    closest = _squared_distances(points, centers[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        index = rng.choice(len(points), p=closest / total) if total > 0 else rng.integers(len(points))
+        centers.append(points[index])
+        closest = np.minimum(closest, _squared_distances(points, points[index][None, :])[:, 0])
+    return np.array(centers)
+
+
+def assign(points, centers):
+    """Index of the closest center of every point, computed in chunks of ASSIGN_CHUNK points."""
+    labels = np.empty(len(points), dtype="int64")
+    for start in range(0, len(points), ASSIGN_CHUNK):
+        labels[start:start + ASSIGN_CHUNK] = _squared_distances(points[start:start + ASSIGN_CHUNK], centers).argmin(axis=1)
+    return labels
+
+
+def minibatch_kmeans(points, k, seed=0, batch_size=BATCH_SIZE, max_batches=MAX_BATCHES, tol=TOLERANCE):
+    """Centers and labels of `points` clustered by mini-batch k-means.
+
+    Each batch is assigned to the closest centers, and every center moves to
+    the running mean of all the points assigned to it so far (Sculley, 2010),
+    with one bincount per feature instead of a loop over points. The cost per
+    batch does not depend on the number of points; only the final assignment
+    is a pass over all of them.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(points)
+    k = min(k, n)
+    seeds = points[rng.choice(n, INIT_SAMPLE, replace=False)] if n > INIT_SAMPLE else points
+    centers = _kmeans_plus_plus(seeds, k, rng)
+    seen = np.zeros(k)
+    for _ in range(max_batches):
+        batch = points[rng.integers(n, size=min(batch_size, n))]
+        nearest = _squared_distances(batch, centers).argmin(axis=1)
+        counts = np.bincount(nearest, minlength=k)
+        sums = np.column_stack([np.bincount(nearest, weights=batch[:, j], minlength=k) for j in range(points.shape[1])])
+        seen += counts
+        moved = counts > 0
+        previous = centers.copy()
+        # Running mean: old center weighted by the points seen before this batch
+        centers[moved] += (sums[moved] - counts[moved, None] * centers[moved]) / seen[moved, None]
+        if np.abs(centers - previous).max() < tol:
+            break
+    return centers, assign(points, centers)
+
+
+def silhouette_score(points, labels, sample_size=SILHOUETTE_SAMPLE, seed=0):
+    """Mean silhouette of a random sample of `points` (-1 to 1, higher is better separated).
+
+    For each sampled point, a is its mean distance to the other sampled points
+    of its cluster and b the lowest mean distance to the sampled points of
+    another cluster; its silhouette is (b - a) / max(a, b). The sample keeps
+    the pairwise distance matrix at sample_size^2 entries.
+    """
+    rng = np.random.default_rng(seed)
+    if len(points) > sample_size:
+        rows = rng.choice(len(points), sample_size, replace=False)
+        points, labels = points[rows], labels[rows]
+    clusters, labels = np.unique(labels, return_inverse=True)
+    if len(clusters) < 2:
+        return np.nan
+    distances = np.sqrt(_squared_distances(points, points))
+    sizes = np.bincount(labels, minlength=len(clusters))
+    # Sum of the distances of every point to each cluster
+    sums = np.column_stack([distances[:, labels == c].sum(axis=1) for c in range(len(clusters))])
+    own = np.arange(len(points)), labels
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a = sums[own] / (sizes[labels] - 1)
+        mean_to = sums / sizes[None, :]
+        mean_to[own] = np.inf
+        b = mean_to.min(axis=1)
+        silhouette = np.where(sizes[labels] > 1, (b - a) / np.maximum(a, b), 0)
+    return float(np.nanmean(silhouette))
+
+
+def cluster_rfm(rfm_df, k, seed=0):
+    """Cluster of every customer of `rfm_df`, and the silhouette of the clustering.
+
+    Clusters are numbered from 1 by decreasing mean RFM score, so cluster 1
+    holds the best customers, as the first of the score-based segments does.
+    """
+    if len(rfm_df) == 0:
+        return np.empty(0, dtype="int64"), np.nan
+    points = standardize(rfm_df)
+    _, labels = minibatch_kmeans(points, k, seed)
+    mean_score = np.bincount(labels, weights=rfm_df["RFM_score"].to_numpy(dtype="float64"), minlength=k) / np.maximum(
+        np.bincount(labels, minlength=k), 1
+    )
+    rank = np.empty(k, dtype="int64")
+    rank[np.argsort(-mean_score, kind="stable")] = np.arange(1, k + 1)
+    return rank[labels], silhouette_score(points, labels, seed=seed)
+
+
+def cluster_profile(rfm_df, clusters) -> pd.DataFrame:
+    """Customers and mean recency, frequency, monetary value and RFM score per cluster."""
+    return rfm_df[CLUSTER_FEATURES + ["RFM_score"]].groupby(clusters).agg(
+        customers=("recency", "size"),
+        recency=("recency", "mean"),
+        frequency=("frequency", "mean"),
+        monetary=("monetary", "mean"),
+        RFM_score=("RFM_score", "mean"),
+    ).rename_axis("cluster").reset_index()
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_all_data
+from filters import NO_FILTERS, filtered_all_data
+
+# Columns of all_data needed for the cohorts
+COHORT_COLUMNS = ["customer_unique_id", "order_purchase_timestamp"]
+
+# Largest (customer, month) grid deduplicated with a bitmap (1 byte per cell,
+# so at most 16 MB); bigger grids sort the (customer, month) keys instead
+MAX_BITMAP_CELLS = 2**24
+
+
+def _cohort_counts(customers, months):
+    """(cohort x months since first purchase) customer counts and the "YYYY-MM" label of every cohort."""
+    first_month = months.min()
+    n_months = int(months.max() - first_month + 1)
+    months = months - first_month
+
+    # Month of the first purchase of every customer
+    first = np.full(customers.max() + 1, n_months, dtype="int64")
+    np.minimum.at(first, customers, months)
+
+    # Each (customer, month) with a purchase once, as cohort and months since the cohort
+    pairs = customers * n_months + months
+    if len(first) * n_months <= MAX_BITMAP_CELLS:
+        seen = np.zeros(len(first) * n_months, dtype=bool)
+        seen[pairs] = True
+        active = np.flatnonzero(seen)
+    else:
+        active = np.unique(pairs)
+    cohort = first[active // n_months]
+    period = active % n_months - cohort
+    counts = np.bincount(cohort * n_months + period, minlength=n_months * n_months).reshape(n_months, n_months)
+
+    # Cohort c can only be observed for n_months - c months
+    counts = counts.astype("float64")
+    counts[np.arange(n_months)[:, None] + np.arange(n_months)[None, :] >= n_months] = np.nan
+    start = pd.Period(year=first_month // 12, month=first_month % 12 + 1, freq="M")
+    return counts, pd.period_range(start, periods=n_months).strftime("%Y-%m")
+
+
+class CohortMatrix:
+    """Customers of each monthly acquisition cohort still buying 0, 1, 2, ... months later.
+
+    A customer's cohort is the month of their first purchase. `counts` has one
+    row per cohort ("YYYY-MM") and one column per months since the cohort
+    month; cells after the last month of the data are NaN, as they cannot be
+    observed yet.
+    """
+
+    def __init__(self, customers, months):
+        # customers: integer customer codes, months: months since year 0, one entry per order line
+        counts, labels = _cohort_counts(customers, months) if len(months) else (np.empty((0, 1)), [])
+        self.counts = pd.DataFrame(counts, index=pd.Index(labels, name="cohort"), columns=range(counts.shape[1]))
+        self.counts.columns.name = "months_since_first_purchase"
+        # Months without any new customer are not cohorts
+        self.counts = self.counts[self.counts[0] > 0]
+
+    @property
+    def sizes(self):
+        return self.counts[0].astype("int64")
+
+    def retention(self) -> pd.DataFrame:
+        """Share of each cohort buying again n months after its first purchase."""
+        return self.counts.div(self.counts[0], axis=0)
+
+    def average_retention(self) -> pd.DataFrame:
+        """Retention per month since the first purchase over every cohort observed that long, weighted by size."""
+        observed = self.counts.notna()
+        customers = self.counts.sum()
+        base = observed.mul(self.counts[0], axis=0).sum()
+        return pd.DataFrame({
+            "months_since_first_purchase": self.counts.columns,
+            "retention": (customers / base).to_numpy(),
+            "cohorts": observed.sum().to_numpy(),
+        })
+
+
+def cohort_matrix(df) -> CohortMatrix:
+    """CohortMatrix of the order lines in `df` (COHORT_COLUMNS of all_data).
+
+    Customers and purchase months become integer codes, so the matrix comes
+    from a minimum per customer and one bincount over (cohort, period) pairs.
+    """
+    timestamps = df["order_purchase_timestamp"].to_numpy(dtype="datetime64[ns]")
+    customers, _ = pd.factorize(df["customer_unique_id"])
+    keep = ~np.isnat(timestamps) & (customers >= 0)
+    months = timestamps[keep].astype("datetime64[M]").astype("int64") + 1970 * 12
+    return CohortMatrix(customers[keep].astype("int64"), months)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _cohort_matrix(version):
+    return cohort_matrix(load_all_data(columns=COHORT_COLUMNS))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _filtered_cohort_matrix(version, filters):
+    return cohort_matrix(filtered_all_data(COHORT_COLUMNS, filters))
+
+
+def load_cohort_matrix(filters=NO_FILTERS) -> CohortMatrix:
+    """CohortMatrix of the current all_data, computed once per data version and filter selection.
+
+    With active filters, only the matching order lines count: a customer's
+    cohort is their first matching purchase.
+    """
+    version = data_version()
+    if filters.active:
+        return _filtered_cohort_matrix(version, filters)
+    return _cohort_matrix(version)
@@ -0,0 +1,113 @@
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from data_loader import DATA_DIR, data_version, file_signature, load_all_data
+from filters import NO_FILTERS, filtered_all_data
+
+# Folder with the materialized aggregates and their manifest
+CUBE_DIR = os.path.join(DATA_DIR, "cube")
+MANIFEST_FILE = "manifest.json"
+
+
+def _customers_by_city(df):
+    top_customer = df.groupby(by="customer_city", observed=True)["customer_id"].nunique().sort_values(ascending=False)
+    top_customer_df = top_customer.reset_index()
+    top_customer_df.columns = ["customer_city", "unique_customers"]
+    return top_customer_df
+
+
+def _customers_by_state(df):
+    return df.groupby("customer_state", observed=True).agg(
+        {"customer_unique_id": "nunique"}
+    ).reset_index().sort_values(by="customer_unique_id", ascending=False)
+
+
+def _products_by_category(df):
+    product_id_counts = df.groupby("product_category_name_english", observed=True)["product_id"].count().reset_index()
+    return product_id_counts.sort_values(by="product_id", ascending=False)
+
+
+def _order_status_counts(df):
+    return df.groupby("order_status", observed=True).size().reset_index(name="count").sort_values(by="count", ascending=False)
+
+
+# name -> (columns of all_data it needs, function computing it)
+AGGREGATES = {
+    "customers_by_city": (["customer_city", "customer_id"], _customers_by_city),
+    "customers_by_state": (["customer_state", "customer_unique_id"], _customers_by_state),
+    "products_by_category": (["product_category_name_english", "product_id"], _products_by_category),
+    "order_status_counts": (["order_status"], _order_status_counts),
+}
+
+
+def compute_aggregate(name, df=None):
+    columns, func = AGGREGATES[name]
+    if df is None:
+        df = load_all_data(columns=columns)
+    result = func(df).reset_index(drop=True)
+    # A subset of rows keeps every category of the full table; charts must only see the present ones
+    for col in result.columns:
+        if isinstance(result[col].dtype, pd.CategoricalDtype):
+            result[col] = result[col].cat.remove_unused_categories()
+    return result
+
+
+def materialize(out_dir=CUBE_DIR):
+    """Compute every aggregate once and store it with the data version it was built from."""
+    os.makedirs(out_dir, exist_ok=True)
+    columns = sorted({col for cols, _ in AGGREGATES.values() for col in cols})
+    version = data_version()
+    all_df = load_all_data(columns=columns)
+    for name in AGGREGATES:
+        compute_aggregate(name, all_df).to_parquet(os.path.join(out_dir, f"{name}.parquet"), index=False)
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump({"data_version": version, "aggregates": sorted(AGGREGATES)}, f, indent=2)
+    return version
+
+
+def _cube_version(cube_dir):
+    path = os.path.join(cube_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["data_version"]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def _read_artifact(path, signature):
+    return pd.read_parquet(path)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _compute_live(name, version):
+    return compute_aggregate(name)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _compute_filtered(name, version, filters):
+    columns, _ = AGGREGATES[name]
+    return compute_aggregate(name, filtered_all_data(columns, filters))
+
+
+def load_aggregate(name, filters=NO_FILTERS, cube_dir=CUBE_DIR) -> pd.DataFrame:
+    """Return a dashboard aggregate, from the cube when it matches the current data.
+
+    With active `filters` the aggregate is computed on the matching rows only.
+    The result is shared between sessions, so do not modify it in place.
+    """
+    version = data_version()
+    if filters.active:
+        return _compute_filtered(name, version, filters)
+    path = os.path.join(cube_dir, f"{name}.parquet")
+    if _cube_version(cube_dir) == version and os.path.exists(path):
+        return _read_artifact(path, file_signature(path))
+    return _compute_live(name, version)
+
+
+if __name__ == "__main__":
+    # Rebuild the aggregates after the data changes:
+    #   python dashboard/cube.py
+    print(f"Cube written to {CUBE_DIR} for {materialize()}")
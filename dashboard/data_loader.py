@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from schema import TABLE_FILES, apply_schema, read_csv
+
+# Folder with the Olist CSV files, relative to the repository root
+DATA_DIR = "data"
+
+# Maximum number of parsed tables / column projections kept in memory
+# (shared by every session)
+MAX_CACHED_TABLES = 32
+
+# Columnar snapshot of all_data.csv written by the notebook export step
+ALL_DATA_SNAPSHOT = "all_data.parquet"
+
+
+def table_path(name):
+    return os.path.join(DATA_DIR, TABLE_FILES[name])
+
+
+def snapshot_path():
+    return os.path.join(DATA_DIR, ALL_DATA_SNAPSHOT)
+
+
+def file_signature(path):
+    """Return (mtime_ns, size) of a file; a new value means the file changed."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def data_version(name="all_data"):
+    """Short string identifying the current content of a table, for cache keys."""
+    path = all_data_path() if name == "all_data" else table_path(name)
+    mtime_ns, size = file_signature(path)
+    return f"{name}-{mtime_ns}-{size}"
+
+
+@st.cache_resource(max_entries=MAX_CACHED_TABLES, show_spinner=False)
+def _read_csv(path, signature, name, columns):
+    # `signature` is only part of the cache key: when the file is rewritten the
+    # key changes, the table is parsed again and the old entry ages out.
+    return read_csv(path, name, usecols=list(columns) if columns else None)
+
+
+@st.cache_resource(max_entries=MAX_CACHED_TABLES, show_spinner=False)
+def _read_parquet(path, signature, columns):
+    # Only the requested column chunks are read, straight from a memory map.
+    # Strings stay Arrow-backed instead of becoming Python objects.
+    table = pq.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+    return apply_schema(df, "all_data")
+
+
+def load_table(name, columns=None) -> pd.DataFrame:
+    """Load a table once per file version and share it across all sessions.
+
+    `columns` restricts the load to the given columns. The returned DataFrame
+    is shared, so callers must not modify it in place.
+    """
+    columns = tuple(columns) if columns else None
+    path = table_path(name)
+    return _read_csv(path, file_signature(path), name, columns)
+
+
+def all_data_path():
+    """Path all_data is read from: the Parquet snapshot unless it is missing or stale."""
+    path, csv_path = snapshot_path(), table_path("all_data")
+    if not os.path.exists(path):
+        return csv_path
+    # A snapshot older than the CSV next to it is stale, fall back to the CSV
+    if os.path.exists(csv_path) and os.stat(path).st_mtime_ns < os.stat(csv_path).st_mtime_ns:
+        return csv_path
+    return path
+
+
+def all_data_columns():
+    """Column names of the current all_data, from the snapshot schema or the CSV header."""
+    path = all_data_path()
+    if path == snapshot_path():
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def missing_tables(names):
+    """Names of the tables in `names` whose file is not in the data folder."""
+    return [name for name in names if not os.path.exists(all_data_path() if name == "all_data" else table_path(name))]
+
+
+def load_all_data(columns=None) -> pd.DataFrame:
+    """Load all_data (or only `columns` of it), preferring the Parquet snapshot."""
+    columns = tuple(columns) if columns else None
+    path = all_data_path()
+    if path == snapshot_path():
+        return _read_parquet(path, file_signature(path), columns)
+    return load_table("all_data", columns)
+
+
+def write_snapshot(df, path=None):
+    """Write a typed, zstd-compressed Parquet snapshot of all_data."""
+    apply_schema(df, "all_data").to_parquet(path or snapshot_path(), index=False, compression="zstd")
+
+
+def load_geolocation() -> pd.DataFrame:
+    return load_table("geolocation")
+
+
+def load_order_payments() -> pd.DataFrame:
+    return load_table("order_payments")
+
+
+def load_order_items() -> pd.DataFrame:
+    return load_table("order_items")
+
+
+def load_orders() -> pd.DataFrame:
+    return load_table("orders")
+
+
+if __name__ == "__main__":
+    # Build data/all_data.parquet from an existing data/all_data.csv:
+    #   python dashboard/data_loader.py
+    write_snapshot(read_csv(table_path("all_data"), "all_data"))
+    print(f"Snapshot written to {snapshot_path()}")
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import all_data_columns, data_version, load_all_data
+
+# Columns of all_data needed for the delivery statistics
+DELIVERY_COLUMNS = [
+    "order_id",
+    "seller_id",
+    "customer_state",
+    "order_purchase_timestamp",
+    "shipping_time_seconds",
+    "shipping_duration_seconds",
+]
+
+# all_data built before the *_seconds columns existed still has the timedelta
+# columns they are computed from
+SECONDS_SOURCES = {
+    "shipping_time_seconds": "shipping_time",
+    "shipping_duration_seconds": "shipping_duration",
+}
+
+# Delivery time histograms: 6 hour bins up to a year, longer deliveries go to the last bin
+BIN_SECONDS = 6 * 3600
+MAX_SECONDS = 365 * 24 * 3600
+
+PERCENTILES = [0.5, 0.75, 0.9, 0.95, 0.99]
+
+
+class DurationHistogram:
+    """Fixed-width histogram of durations (in seconds) answering quantile queries.
+
+    Values are folded in batch by batch and histograms add up, so a percentile
+    over any selection of groups is a sum of counts instead of a sort. Quantiles
+    are interpolated inside a bin, so they are exact to within BIN_SECONDS.
+    """
+
+    def __init__(self, counts=None, bin_seconds=BIN_SECONDS, max_seconds=MAX_SECONDS):
+        self.bin_seconds = bin_seconds
+        self.n_bins = int(np.ceil(max_seconds / bin_seconds))
+        self.counts = np.zeros(self.n_bins, dtype="int64") if counts is None else np.asarray(counts, dtype="int64")
+
+    def bins(self, seconds):
+        """Bin of every value (negative values go to the first bin, long ones to the last)."""
+        return np.clip(np.asarray(seconds, dtype="float64") // self.bin_seconds, 0, self.n_bins - 1).astype("int64")
+
+    def add(self, seconds):
+        seconds = np.asarray(seconds, dtype="float64")
+        seconds = seconds[~np.isnan(seconds)]
+        self.counts += np.bincount(self.bins(seconds), minlength=self.n_bins)
+        return self
+
+    def __add__(self, other):
+        return DurationHistogram(self.counts + other.counts, self.bin_seconds, self.n_bins * self.bin_seconds)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile(self, q):
+        """Duration in seconds below which a fraction `q` (scalar or array) of the values lie."""
+        q = np.asarray(q, dtype="float64")
+        if self.total == 0:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(self.counts)
+        target = q * cumulative[-1]
+        bin_index = np.minimum(np.searchsorted(cumulative, target, side="left"), self.n_bins - 1)
+        before = np.where(bin_index > 0, cumulative[bin_index - 1], 0)
+        inside = np.maximum(self.counts[bin_index], 1)
+        return (bin_index + (target - before) / inside) * self.bin_seconds
+
+
+def _months(timestamps):
+    # Month number of every timestamp (months since January 1970), without building strings
+    return np.asarray(timestamps, dtype="datetime64[ns]").astype("datetime64[M]").view("int64")
+
+
+class DeliveryStats:
+    """Late deliveries and delivery time histograms per (customer state, purchase month).
+
+    Built once from the order lines of all_data; every filter of the dashboard
+    is a slice of these small arrays.
+    """
+
+    def __init__(self, all_df, bin_seconds=BIN_SECONDS, max_seconds=MAX_SECONDS):
+        # Lines without a customer state or purchase date cannot be placed in a cell
+        all_df = all_df.dropna(subset=["customer_state", "order_purchase_timestamp"])
+        orders = all_df.drop_duplicates("order_id")
+        delivered = orders["shipping_time_seconds"].notna().to_numpy()
+        late = (orders["shipping_time_seconds"] < 0).to_numpy(dtype=bool, na_value=False)
+
+        state = pd.Categorical(orders["customer_state"].astype(str))
+        month_numbers, month_codes = np.unique(_months(orders["order_purchase_timestamp"]), return_inverse=True)
+        self.states = list(state.categories)
+        # "YYYY-MM" labels, in time order
+        self.months = np.datetime_as_string(month_numbers.astype("datetime64[M]"), unit="M").tolist()
+        shape = (len(self.states), len(self.months))
+        cell = state.codes.astype("int64") * shape[1] + month_codes
+        n_cells = shape[0] * shape[1]
+
+        self.orders = np.bincount(cell, minlength=n_cells).reshape(shape)
+        self.delivered = np.bincount(cell[delivered], minlength=n_cells).reshape(shape)
+        self.late = np.bincount(cell[late], minlength=n_cells).reshape(shape)
+
+        # One histogram per cell, built with a single bincount
+        self._histogram = DurationHistogram(bin_seconds=bin_seconds, max_seconds=max_seconds)
+        n_bins = self._histogram.n_bins
+        durations = orders["shipping_duration_seconds"].to_numpy(dtype="float64", na_value=np.nan)
+        known = ~np.isnan(durations)
+        flat = cell[known] * n_bins + self._histogram.bins(durations[known])
+        self.histograms = np.bincount(flat, minlength=n_cells * n_bins).reshape(shape + (n_bins,)).astype("int32")
+
+        # Seller counts per cell, in long format (only the cells a seller sold in)
+        seller_lines = all_df.drop_duplicates(["order_id", "seller_id"])
+        self.sellers = pd.DataFrame({
+            "seller_id": seller_lines["seller_id"].to_numpy(),
+            "state": pd.Categorical(seller_lines["customer_state"].astype(str), categories=self.states).codes,
+            "month": np.searchsorted(month_numbers, _months(seller_lines["order_purchase_timestamp"])),
+            "delivered": seller_lines["shipping_time_seconds"].notna().to_numpy(),
+            "late": (seller_lines["shipping_time_seconds"] < 0).to_numpy(dtype=bool, na_value=False),
+        }).groupby(["seller_id", "state", "month"], observed=True).sum().reset_index()
+
+    def _selection(self, states=None, months=None):
+        rows = np.ones(len(self.states), dtype=bool) if not states else np.isin(self.states, list(states))
+        cols = np.ones(len(self.months), dtype=bool) if not months else np.isin(self.months, list(months))
+        return rows, cols
+
+    def summary(self, states=None, months=None):
+        """Orders, delivered orders, late orders and late rate of the selection."""
+        rows, cols = self._selection(states, months)
+        delivered = int(self.delivered[np.ix_(rows, cols)].sum())
+        late = int(self.late[np.ix_(rows, cols)].sum())
+        return {
+            "orders": int(self.orders[np.ix_(rows, cols)].sum()),
+            "delivered": delivered,
+            "late": late,
+            "late_rate": late / delivered if delivered else np.nan,
+        }
+
+    def histogram(self, states=None, months=None) -> DurationHistogram:
+        rows, cols = self._selection(states, months)
+        counts = self.histograms[np.ix_(rows, cols)].sum(axis=(0, 1), dtype="int64")
+        return DurationHistogram(counts, self._histogram.bin_seconds, self._histogram.n_bins * self._histogram.bin_seconds)
+
+    def percentiles(self, states=None, months=None, percentiles=PERCENTILES) -> pd.DataFrame:
+        """Delivery time percentiles (in days) of the selection."""
+        days = self.histogram(states, months).quantile(percentiles) / 86400
+        return pd.DataFrame({"percentile": [f"P{round(p * 100)}" for p in percentiles], "delivery_days": days})
+
+    def _rates(self, delivered, late, labels, name):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(delivered > 0, late / delivered, np.nan)
+        return pd.DataFrame({name: labels, "delivered": delivered, "late": late, "late_rate": rate})
+
+    def by_state(self, states=None, months=None) -> pd.DataFrame:
+        rows, cols = self._selection(states, months)
+        df = self._rates(self.delivered[:, cols].sum(axis=1), self.late[:, cols].sum(axis=1), self.states, "customer_state")
+        return df[rows].reset_index(drop=True)
+
+    def by_month(self, states=None, months=None) -> pd.DataFrame:
+        rows, cols = self._selection(states, months)
+        df = self._rates(self.delivered[rows].sum(axis=0), self.late[rows].sum(axis=0), self.months, "month")
+        return df[cols].reset_index(drop=True)
+
+    def by_seller(self, states=None, months=None, min_delivered=1) -> pd.DataFrame:
+        rows, cols = self._selection(states, months)
+        cells = self.sellers[rows[self.sellers["state"].to_numpy()] & cols[self.sellers["month"].to_numpy()]]
+        totals = cells.groupby("seller_id", observed=True)[["delivered", "late"]].sum()
+        totals = totals[totals["delivered"] >= min_delivered]
+        return self._rates(
+            totals["delivered"].to_numpy(), totals["late"].to_numpy(), totals.index.to_numpy(), "seller_id"
+        )
+
+
+def _source_columns(available):
+    # DELIVERY_COLUMNS, with the timedelta column of every *_seconds column all_data lacks
+    return [SECONDS_SOURCES[col] if col in SECONDS_SOURCES and col not in available else col for col in DELIVERY_COLUMNS]
+
+
+def missing_columns():
+    """DELIVERY_COLUMNS the current all_data neither has nor can derive."""
+    available = set(all_data_columns())
+    return [col for col, source in zip(DELIVERY_COLUMNS, _source_columns(available)) if source not in available]
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _delivery_stats(version):
+    sources = _source_columns(set(all_data_columns()))
+    all_df = load_all_data(columns=sources)
+    derived = {col: all_df[source].dt.total_seconds() for col, source in zip(DELIVERY_COLUMNS, sources) if col != source}
+    return DeliveryStats(all_df.assign(**derived))
+
+
+def load_delivery_stats() -> DeliveryStats:
+    """DeliveryStats for the current all_data, built once per data version and shared."""
+    return _delivery_stats(data_version())
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_all_data, load_table
+from geo_index import load_geo_index
+
+# Mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+# Columns of all_data needed for the distance of every order line
+DISTANCE_COLUMNS = ["order_id", "seller_id", "customer_zip_code_prefix", "shipping_duration", "freight_value"]
+
+# Upper edges of the distance bands shown on the dashboard
+DISTANCE_BANDS_KM = [0, 100, 250, 500, 1000, 2000, np.inf]
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in km between arrays of points given in degrees."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(a, dtype="float64")) for a in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def _positions(values, index):
+    """Position of every value in `index` (-1 when missing).
+
+    Categorical values are looked up once per category, then mapped by code.
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        category_positions = np.append(index.get_indexer(values.cat.categories.astype(str)), -1)
+        # Code -1 (missing) picks the trailing -1
+        return category_positions[values.cat.codes.to_numpy()]
+    return index.get_indexer(values.astype(str))
+
+
+def order_distances(all_df, sellers_df, centroids) -> pd.DataFrame:
+    """Customer to seller distance of every order line.
+
+    `all_df` has the DISTANCE_COLUMNS of all_data, `sellers_df` the seller_id and
+    seller_zip_code_prefix of sellers and `centroids` the lat/lng per zip prefix
+    (GeoIndex.centroids). Lines with an unknown prefix get a NaN distance.
+    """
+    seller_rows = _positions(all_df["seller_id"], pd.Index(sellers_df["seller_id"]))
+    seller_zip = _positions(sellers_df["seller_zip_code_prefix"], centroids.index)
+    seller_pos = np.where(seller_rows >= 0, seller_zip[seller_rows], -1)
+    customer_pos = _positions(all_df["customer_zip_code_prefix"], centroids.index)
+
+    # Append a NaN row so that -1 positions give NaN coordinates
+    lat = np.append(centroids["geolocation_lat"].to_numpy(dtype="float64"), np.nan)
+    lng = np.append(centroids["geolocation_lng"].to_numpy(dtype="float64"), np.nan)
+    distance = haversine_km(lat[customer_pos], lng[customer_pos], lat[seller_pos], lng[seller_pos])
+
+    return pd.DataFrame({
+        "order_id": all_df["order_id"].to_numpy(),
+        "seller_id": all_df["seller_id"].to_numpy(),
+        "distance_km": distance,
+        "shipping_days": (all_df["shipping_duration"] / pd.Timedelta(days=1)).to_numpy(),
+        "freight_value": all_df["freight_value"].to_numpy(),
+    })
+
+
+def distance_bands(distances_df, bands=DISTANCE_BANDS_KM) -> pd.DataFrame:
+    """Order lines, median shipping days and mean freight per distance band."""
+    labels = [f"{lo:,.0f}+ km" if np.isinf(hi) else f"{lo:,.0f}-{hi:,.0f} km" for lo, hi in zip(bands[:-1], bands[1:])]
+    band = pd.cut(distances_df["distance_km"], bands, labels=labels, include_lowest=True)
+    return distances_df.groupby(band, observed=False).agg(
+        order_lines=("distance_km", "size"),
+        median_shipping_days=("shipping_days", "median"),
+        mean_freight_value=("freight_value", "mean"),
+    ).rename_axis("distance_band").reset_index()
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _cached_order_distances(version, sellers_version, geolocation_version):
+    return order_distances(
+        load_all_data(columns=DISTANCE_COLUMNS),
+        load_table("sellers", ["seller_id", "seller_zip_code_prefix"]),
+        load_geo_index().centroids,
+    )
+
+
+def load_order_distances() -> pd.DataFrame:
+    """order_distances() for the current data, computed once per data version."""
+    return _cached_order_distances(data_version(), data_version("sellers"), data_version("geolocation"))
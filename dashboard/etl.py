@@ -0,0 +1,327 @@
+import argparse
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from rfm import RFM_COLUMNS, customer_summary, score_rfm
+from schema import TABLE_FILES, read_csv, read_csv_chunks
+
+# Out-of-core version of the notebook's data preparation (Proyek_Analisis_Data.ipynb)
+# that produces all_data.csv:
+# 1. products (with the category translation) and customers are dimension tables
+#    kept in memory;
+# 2. orders, order items and reviews are streamed in chunks and spilled to
+#    `buckets` partitions by a hash of order_id, so every order lives in one bucket;
+# 3. each bucket is joined like the notebook does and spilled again;
+# 4. each bucket is sorted in the notebook's row order and spilled in chunks, and
+#    its RFM columns are spilled again by customer;
+# 5. RFM is computed customer bucket by customer bucket (summing every customer's
+#    lines in the notebook's row order, so the float totals match);
+# 6. the buckets are merged back in row order and written to CSV in chunks.
+# The fact tables are only held one bucket at a time (plus one chunk per bucket
+# while merging), but the dimension tables and the RFM table (one row per
+# customer) stay in memory, so peak memory grows with the number of customers
+# and products, not with the number of orders or order lines.
+
+DEFAULT_CHUNKSIZE = 200_000
+DEFAULT_BUCKETS = 16
+
+# Position of an order in orders_dataset.csv and position of a row in the notebook's
+# all_data, used to restore the notebook's row order
+POSITION = "_position"
+ROW_ORDER = "_row_order"
+
+DURATION_COLUMNS = ["shipping_time", "shipping_duration", "estimated_duration"]
+# Integer columns the ETL adds, which the notebook does not write
+SECONDS_COLUMNS = [f"{col}_seconds" for col in DURATION_COLUMNS]
+
+PRODUCT_SIZE_COLUMNS = [
+    "product_name_length",
+    "product_description_length",
+    "product_photos_qty",
+    "product_weight_g",
+    "product_length_cm",
+    "product_height_cm",
+    "product_width_cm",
+]
+
+
+def clean_products(products_df, product_category_name_df):
+    """Products joined with the English category names and cleaned like the notebook."""
+    products_df = products_df.merge(product_category_name_df, on="product_category_name", how="left")
+    products_df = products_df.rename(columns={
+        "product_name_lenght": "product_name_length",
+        "product_description_lenght": "product_description_length",
+    })
+    products_df["product_category_name"] = products_df["product_category_name"].fillna("not defined")
+    products_df["product_category_name_english"] = products_df["product_category_name_english"].fillna("not defined")
+    products_df["product_category_name_english"] = np.where(
+        products_df["product_category_name"] == "pc_gamer",
+        "PC Gaming",
+        products_df["product_category_name_english"],
+    )
+    products_df["product_category_name_english"] = np.where(
+        products_df["product_category_name"] == "portateis_cozinha_e_preparadores_de_alimentos",
+        "portable kitchen food preparers",
+        products_df["product_category_name_english"],
+    )
+    for col in PRODUCT_SIZE_COLUMNS:
+        # Whole median, as the astype(int) below would truncate it (the columns are nullable integers)
+        products_df[col] = products_df[col].fillna(int(products_df[col].median()))
+    products_df[PRODUCT_SIZE_COLUMNS] = products_df[PRODUCT_SIZE_COLUMNS].astype(int)
+    return products_df
+
+
+def add_order_durations(orders_df):
+    # Same columns as the notebook, computed before the delivered date is filled
+    orders_df["shipping_time"] = orders_df["order_estimated_delivery_date"] - orders_df["order_delivered_customer_date"]
+    orders_df["shipping_duration"] = orders_df["order_delivered_customer_date"] - orders_df["order_purchase_timestamp"]
+    orders_df["estimated_duration"] = orders_df["order_estimated_delivery_date"] - orders_df["order_purchase_timestamp"]
+    for col in DURATION_COLUMNS:
+        orders_df[f"{col}_seconds"] = orders_df[col].dt.total_seconds().astype("Int64")
+    return orders_df
+
+
+def order_lines(order_items_df):
+    """One row per (product, order) with its quantity, like the notebook's jumlah_df."""
+    return order_items_df.groupby(by=["product_id", "order_id"]).agg(
+        quantity=("order_item_id", "count"),
+        seller_id=("seller_id", "first"),
+        shipping_limit_date=("shipping_limit_date", "first"),
+        price=("price", "first"),
+        freight_value=("freight_value", "first"),
+    ).reset_index()
+
+
+def _bucket_of(order_ids, buckets):
+    return (pd.util.hash_pandas_object(order_ids, index=False).to_numpy() % buckets).astype(int)
+
+
+def _spill(df, order_ids, buckets, tmp_dir, name, chunk_number):
+    bucket_ids = _bucket_of(order_ids, buckets)
+    for bucket in np.unique(bucket_ids):
+        path = os.path.join(tmp_dir, f"{name}-{bucket:04d}-{chunk_number:06d}.pkl")
+        df[bucket_ids == bucket].to_pickle(path)
+
+
+def _read_spilled(tmp_dir, name, bucket):
+    paths = sorted(glob.glob(os.path.join(tmp_dir, f"{name}-{bucket:04d}-*.pkl")))
+    return [pd.read_pickle(path) for path in paths]
+
+
+def _partition_orders(path, buckets, chunksize, tmp_dir):
+    """Stream the orders, derive the duration columns and spill them to buckets.
+
+    Returns the date of the most recent purchase (the RFM as-of date) and the
+    number of orders.
+    """
+    position = 0
+    last_delivered = pd.NaT
+    latest_purchases = []
+    for number, chunk in enumerate(read_csv_chunks(path, "orders", chunksize)):
+        chunk = add_order_durations(chunk)
+        # Forward fill across chunk borders, as the notebook does on the whole table
+        delivered = chunk["order_delivered_customer_date"].ffill()
+        if pd.notna(last_delivered):
+            delivered = delivered.fillna(last_delivered)
+        chunk["order_delivered_customer_date"] = delivered
+        last_delivered = delivered.iloc[-1]
+
+        chunk[POSITION] = np.arange(position, position + len(chunk))
+        position += len(chunk)
+        latest_purchases.append(chunk["order_purchase_timestamp"].max())
+        _spill(chunk, chunk["order_id"], buckets, tmp_dir, "orders", number)
+    return pd.Timestamp(max(latest_purchases)).normalize(), position
+
+
+def _partition(path, table, buckets, chunksize, tmp_dir):
+    for number, chunk in enumerate(read_csv_chunks(path, table, chunksize)):
+        _spill(chunk, chunk["order_id"], buckets, tmp_dir, table, number)
+
+
+def _concat(frames, empty):
+    return pd.concat(frames, ignore_index=True) if frames else empty
+
+
+def join_orders(orders_df, lines_df, order_reviews_df, products_df, customers_df):
+    """The notebook's merge chain: orders, order lines (order_lines()), products, reviews, customers."""
+    merged_sales_data = orders_df.merge(lines_df, on="order_id", how="inner")
+    merged_sales_data = merged_sales_data.merge(products_df, on="product_id", how="inner")
+    merged_sales_data = merged_sales_data.merge(order_reviews_df, on="order_id", how="left")
+    all_df = merged_sales_data.merge(customers_df, on="customer_id", how="left")
+    all_df["total_price"] = all_df["quantity"] * all_df["price"]
+    return all_df
+
+
+def product_ranks(first_positions):
+    """Rank of every product in the notebook's all_data.
+
+    The inner merge with products keeps the rows of one product together, in
+    the order each product first appears in orders, then by product_id for
+    products first seen in the same order. `first_positions` maps product_id
+    to the position of the first order containing it.
+    """
+    first = first_positions.rename_axis("product_id").reset_index(name="first_position")
+    first = first.sort_values(["first_position", "product_id"], kind="stable")
+    return pd.Series(np.arange(len(first)), index=first["product_id"].to_numpy())
+
+
+def _merge_sorted(streams):
+    """Merge iterators of DataFrames, each sorted by ROW_ORDER, into sorted blocks."""
+    streams = [iter(stream) for stream in streams]
+    buffers = [next(stream, None) for stream in streams]
+    while any(buffer is not None for buffer in buffers):
+        # Every row at or before the smallest buffer end can be emitted: the rest
+        # of each stream only holds later positions
+        watermark = min(buffer[ROW_ORDER].iat[-1] for buffer in buffers if buffer is not None)
+        blocks = []
+        for i, buffer in enumerate(buffers):
+            if buffer is None:
+                continue
+            end = buffer[ROW_ORDER].searchsorted(watermark, side="right")
+            blocks.append(buffer.iloc[:end])
+            buffers[i] = buffer.iloc[end:] if end < len(buffer) else next(streams[i], None)
+        yield pd.concat(blocks).sort_values(ROW_ORDER, kind="stable")
+
+
+def _bucket_stream(tmp_dir, bucket):
+    for path in sorted(glob.glob(os.path.join(tmp_dir, f"merged-{bucket:04d}-*.pkl"))):
+        yield pd.read_pickle(path)
+
+
+def _is_dates_only(series):
+    values = series.dropna()
+    if pd.api.types.is_timedelta64_dtype(series):
+        return bool((values % pd.Timedelta(days=1) == pd.Timedelta(0)).all())
+    return bool((values == values.dt.normalize()).all())
+
+
+def _is_nullable_integer(series):
+    return pd.api.types.is_extension_array_dtype(series) and pd.api.types.is_integer_dtype(series)
+
+
+def _format_like_whole_table(block, dates_only, with_missing):
+    # The notebook reads integer columns as int64, and a left merge that leaves a
+    # value missing anywhere turns the whole column to float64 ("3.0"). The
+    # nullable integers of the typed tables never do, so cast those columns back.
+    for col in with_missing:
+        block[col] = block[col].astype("float64")
+    # to_csv prints a date/timedelta column without its time part when every value
+    # in the column is a whole day. A block can be "dates only" when the whole
+    # table is not, so spell out the long format for those columns.
+    for col, whole_table_dates_only in dates_only.items():
+        if not whole_table_dates_only and _is_dates_only(block[col]):
+            if pd.api.types.is_timedelta64_dtype(block[col]):
+                block[col] = block[col].astype(str).where(block[col].notna())
+            else:
+                block[col] = block[col].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return block
+
+
+def build_all_data(data_dir, out_path, chunksize=DEFAULT_CHUNKSIZE, buckets=DEFAULT_BUCKETS, log=print):
+    """Build all_data.csv from the raw Olist CSVs in `data_dir` out-of-core.
+
+    Memory is bounded per bucket of orders, except for the products, the
+    customers and the RFM table of every customer, which are kept whole.
+    """
+    started = time.perf_counter()
+    path = lambda table: os.path.join(data_dir, TABLE_FILES[table])
+
+    # Dimension tables
+    products_df = clean_products(
+        read_csv(path("products"), "products"),
+        read_csv(path("product_category_name_translation"), "product_category_name_translation"),
+    )
+    customers_df = read_csv(path("customers"), "customers")
+    customers_df["customer_zip_code_prefix"] = customers_df["customer_zip_code_prefix"].astype(str)
+
+    with tempfile.TemporaryDirectory(prefix="olist-etl-") as tmp_dir:
+        # Partition the fact tables by order
+        recent_date, n_orders = _partition_orders(path("orders"), buckets, chunksize, tmp_dir)
+        _partition(path("order_items"), "order_items", buckets, chunksize, tmp_dir)
+        _partition(path("order_reviews"), "order_reviews", buckets, chunksize, tmp_dir)
+        log(f"partitioned fact tables into {buckets} buckets ({time.perf_counter() - started:.1f}s)")
+
+        # Join each bucket and spill it
+        dates_only = {}
+        with_missing = set()
+        first_positions = []
+        # Typed empty tables for buckets without items or reviews
+        empty = {table: read_csv(path(table), table, nrows=0) for table in ("order_items", "order_reviews")}
+        for bucket in range(buckets):
+            orders_frames = _read_spilled(tmp_dir, "orders", bucket)
+            if not orders_frames:
+                continue
+            # Same merge chain as the notebook, restricted to the orders of one bucket
+            all_df = join_orders(
+                pd.concat(orders_frames, ignore_index=True),
+                order_lines(_concat(_read_spilled(tmp_dir, "order_items", bucket), empty["order_items"])),
+                _concat(_read_spilled(tmp_dir, "order_reviews", bucket), empty["order_reviews"]),
+                products_df,
+                customers_df,
+            )
+            for col in all_df.columns:
+                if pd.api.types.is_datetime64_dtype(all_df[col]) or pd.api.types.is_timedelta64_dtype(all_df[col]):
+                    dates_only[col] = dates_only.get(col, True) and _is_dates_only(all_df[col])
+                elif col not in SECONDS_COLUMNS and _is_nullable_integer(all_df[col]) and all_df[col].isna().any():
+                    with_missing.add(col)
+            first_positions.append(all_df.groupby("product_id")[POSITION].min())
+            all_df.to_pickle(os.path.join(tmp_dir, f"joined-{bucket:04d}.pkl"))
+        log(f"joined buckets ({time.perf_counter() - started:.1f}s)")
+
+        # Sort every bucket in the notebook's row order and spill it in chunks
+        ranks = product_ranks(pd.concat(first_positions).groupby(level=0).min())
+        for bucket in range(buckets):
+            joined_path = os.path.join(tmp_dir, f"joined-{bucket:04d}.pkl")
+            if not os.path.exists(joined_path):
+                continue
+            all_df = pd.read_pickle(joined_path)
+            os.remove(joined_path)
+            all_df[ROW_ORDER] = ranks.reindex(all_df["product_id"]).to_numpy() * n_orders + all_df[POSITION].to_numpy()
+            all_df = all_df.sort_values(ROW_ORDER, kind="stable")
+            for number, start in enumerate(range(0, len(all_df), chunksize)):
+                all_df.iloc[start:start + chunksize].to_pickle(
+                    os.path.join(tmp_dir, f"merged-{bucket:04d}-{number:06d}.pkl")
+                )
+            rfm_lines = all_df[RFM_COLUMNS + [ROW_ORDER]]
+            _spill(rfm_lines, rfm_lines["customer_unique_id"], buckets, tmp_dir, "rfm", bucket)
+        log(f"sorted buckets ({time.perf_counter() - started:.1f}s)")
+
+        # RFM over all customers, with the same columns the notebook adds
+        summaries = []
+        for bucket in range(buckets):
+            frames = _read_spilled(tmp_dir, "rfm", bucket)
+            if frames:
+                rfm_lines = pd.concat(frames, ignore_index=True).sort_values(ROW_ORDER, kind="stable")
+                summaries.append(customer_summary(rfm_lines))
+        rfm_df = score_rfm(pd.concat(summaries, ignore_index=True), recent_date)
+        rfm_df.insert(rfm_df.columns.get_loc("RFM_score"), "color", rfm_df["customer_unique_id"])
+
+        # Merge the buckets back in orders order and write the output
+        rows = 0
+        header = True
+        streams = [_bucket_stream(tmp_dir, bucket) for bucket in range(buckets)]
+        for block in _merge_sorted(streams):
+            block = block.drop(columns=[POSITION, ROW_ORDER]).merge(rfm_df, on="customer_unique_id", how="left")
+            block = _format_like_whole_table(block, dates_only, with_missing)
+            block.to_csv(out_path, mode="w" if header else "a", header=header, index=False)
+            header = False
+            rows += len(block)
+    log(f"wrote {rows} rows to {out_path} ({time.perf_counter() - started:.1f}s)")
+    return rows
+
+
+if __name__ == "__main__":
+    # Rebuild all_data.csv without loading the fact tables in memory:
+    #   python dashboard/etl.py --data-dir data --out data/all_data.csv
+    parser = argparse.ArgumentParser(description="Build all_data.csv from the raw Olist CSVs out-of-core")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--out", default=os.path.join("data", "all_data.csv"))
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    args = parser.parse_args()
+    build_all_data(args.data_dir, args.out, args.chunksize, args.buckets)
@@ -0,0 +1,171 @@
+import datetime
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_all_data
+
+# Columns of all_data the global filters work on
+FILTER_COLUMNS = ["order_purchase_timestamp", "customer_state", "product_category_name_english"]
+
+_EMPTY = np.empty(0, dtype="int64")
+
+
+class Filters(NamedTuple):
+    """Global dashboard filters; hashable, so usable as a cache key.
+
+    `start` and `end` are inclusive purchase dates (None: unbounded) and empty
+    tuples mean "all states" / "all categories".
+    """
+
+    start: Optional[datetime.date] = None
+    end: Optional[datetime.date] = None
+    states: Tuple[str, ...] = ()
+    categories: Tuple[str, ...] = ()
+
+    @property
+    def active(self):
+        return any((self.start, self.end, self.states, self.categories))
+
+
+NO_FILTERS = Filters()
+
+
+def date_range(timestamps, filters):
+    """(lo, hi) such that timestamps[lo:hi] are the sorted `timestamps` within the filter dates.
+
+    Missing timestamps (NaT, sorted last) never match a date range.
+    """
+    lo = 0
+    hi = len(timestamps)
+    if filters.start:
+        lo = np.searchsorted(timestamps, np.datetime64(filters.start, "ns"), side="left")
+    if filters.end:
+        day_after = np.datetime64(filters.end + datetime.timedelta(days=1), "ns")
+        hi = np.searchsorted(timestamps, day_after, side="left")
+    elif filters.start:
+        hi = lo + np.searchsorted(np.isnat(timestamps[lo:]), True)
+    return lo, hi
+
+
+def _rank_groups(values, ranks):
+    """Sorted array of ranks for every distinct value (missing values are left out)."""
+    codes, uniques = pd.factorize(values, sort=True)
+    keep = codes >= 0
+    codes, ranks = codes[keep], ranks[keep]
+    order = np.lexsort((ranks, codes))
+    bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    return dict(zip(map(str, uniques), np.split(ranks[order], bounds)))
+
+
+class RowIndex:
+    """all_data rows sorted by purchase timestamp, with per-state and per-category ranks.
+
+    A rank is the position of a row in timestamp order, so a date range is a
+    contiguous range of ranks found by binary search, and a state or category
+    selection is a union of sorted rank arrays. select() intersects them and
+    maps the ranks back to row positions.
+    """
+
+    def __init__(self, df):
+        timestamps = df["order_purchase_timestamp"].to_numpy(dtype="datetime64[ns]")
+        self.order = np.argsort(timestamps, kind="stable")
+        self.timestamps = timestamps[self.order]
+        ranks = np.empty(len(df), dtype="int64")
+        ranks[self.order] = np.arange(len(df))
+        self.by_state = _rank_groups(df["customer_state"], ranks)
+        self.by_category = _rank_groups(df["product_category_name_english"], ranks)
+
+        known = self.timestamps[~np.isnat(self.timestamps)]
+        self.first_date = pd.Timestamp(known[0]).date() if len(known) else None
+        self.last_date = pd.Timestamp(known[-1]).date() if len(known) else None
+
+    @property
+    def states(self):
+        return sorted(self.by_state)
+
+    @property
+    def categories(self):
+        return sorted(self.by_category)
+
+    def select(self, filters):
+        """Sorted positions of the rows matching `filters`, or None without filters."""
+        if not filters.active:
+            return None
+        lo, hi = date_range(self.timestamps, filters)
+
+        candidates = None
+        for groups, wanted in ((self.by_state, filters.states), (self.by_category, filters.categories)):
+            if not wanted:
+                continue
+            selected = np.sort(np.concatenate([groups.get(value, _EMPTY) for value in wanted]))
+            selected = selected[np.searchsorted(selected, lo):np.searchsorted(selected, hi)]
+            candidates = selected if candidates is None else np.intersect1d(candidates, selected, assume_unique=True)
+        if candidates is None:
+            candidates = np.arange(lo, hi)
+        return np.sort(self.order[candidates])
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _row_index(version):
+    return RowIndex(load_all_data(columns=FILTER_COLUMNS))
+
+
+def load_row_index() -> RowIndex:
+    """RowIndex of the current all_data, built once per data version and shared."""
+    return _row_index(data_version())
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _selected_rows(version, filters):
+    return load_row_index().select(filters)
+
+
+def selected_rows(filters):
+    """Positions of the all_data rows matching `filters` (None when nothing is filtered)."""
+    if not filters.active:
+        return None
+    return _selected_rows(data_version(), filters)
+
+
+def filtered_all_data(columns=None, filters=NO_FILTERS) -> pd.DataFrame:
+    """load_all_data(columns) restricted to the rows matching `filters`."""
+    df = load_all_data(columns=columns)
+    rows = selected_rows(filters)
+    return df if rows is None else df.take(rows)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _selected_order_ids(version, filters):
+    return pd.Index(filtered_all_data(["order_id"], filters)["order_id"].unique())
+
+
+def selected_order_ids(filters):
+    """Distinct order_id of the matching rows, to filter the raw order tables (None without filters)."""
+    if not filters.active:
+        return None
+    return _selected_order_ids(data_version(), filters)
+
+
+def sidebar_filters() -> Filters:
+    """Render the global filters in the sidebar and return the current selection."""
+    index = load_row_index()
+    st.sidebar.markdown("### 🔎 Filters")
+    dates = st.sidebar.date_input(
+        "Purchase date",
+        value=(index.first_date, index.last_date),
+        min_value=index.first_date,
+        max_value=index.last_date,
+    )
+    # While a range is being picked only its first date is set
+    start, end = (tuple(dates) + (None, None))[:2] if isinstance(dates, (tuple, list)) else (dates, None)
+    states = st.sidebar.multiselect("Customer state", index.states)
+    categories = st.sidebar.multiselect("Product category", index.categories)
+    return Filters(
+        start=start if start and start != index.first_date else None,
+        end=end if end and end != index.last_date else None,
+        states=tuple(sorted(states)),
+        categories=tuple(sorted(categories)),
+    )
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from data_loader import DATA_DIR, data_version, table_path
+from schema import read_csv
+
+# Folder with the materialized geolocation index and its manifest
+GEO_INDEX_DIR = os.path.join(DATA_DIR, "geo_index")
+MANIFEST_FILE = "manifest.json"
+
+
+def build_index(geolocation_df):
+    """Per-prefix centroids and per-(city, state) row counts of the geolocation table.
+
+    Returns a dict with the "prefixes" and "city_counts" tables.
+    """
+    prefixes = geolocation_df.groupby("geolocation_zip_code_prefix", observed=True).agg(
+        geolocation_lat=("geolocation_lat", "mean"),
+        geolocation_lng=("geolocation_lng", "mean"),
+        geolocation_city=("geolocation_city", "first"),
+        geolocation_state=("geolocation_state", "first"),
+        rows=("geolocation_lat", "size"),
+    ).reset_index()
+    city_counts = geolocation_df.groupby(
+        by=["geolocation_city", "geolocation_state"], observed=True
+    ).size().reset_index(name="count")
+    return {"prefixes": prefixes, "city_counts": city_counts}
+
+
+class GeoIndex:
+    """Geolocation lookups by state and zip prefix without scanning the raw table."""
+
+    def __init__(self, prefixes, city_counts):
+        # States in the order the page has always listed them
+        self.states = list(city_counts["geolocation_state"].unique())
+        self._cities = {
+            state: frame.reset_index(drop=True)
+            for state, frame in city_counts.groupby("geolocation_state", observed=True, sort=False)
+        }
+        self._prefixes = {
+            state: frame.reset_index(drop=True)
+            for state, frame in prefixes.groupby("geolocation_state", observed=True, sort=False)
+        }
+        # Deduplicated centroid table indexed by zip prefix, for vectorized joins
+        self.centroids = prefixes.set_index(prefixes["geolocation_zip_code_prefix"].astype(str))[
+            ["geolocation_lat", "geolocation_lng"]
+        ]
+        self._coordinates = dict(zip(
+            self.centroids.index,
+            zip(self.centroids["geolocation_lat"].to_numpy(), self.centroids["geolocation_lng"].to_numpy()),
+        ))
+
+    def cities(self, state) -> pd.DataFrame:
+        """geolocation_city, geolocation_state and row count of every city of `state`."""
+        return self._cities.get(state, pd.DataFrame(columns=["geolocation_city", "geolocation_state", "count"]))
+
+    def prefixes(self, state) -> pd.DataFrame:
+        """Zip prefixes of `state` with their centroid."""
+        return self._prefixes.get(state, pd.DataFrame(columns=["geolocation_zip_code_prefix"]))
+
+    def coordinates(self, prefix):
+        """(lat, lng) centroid of a zip prefix ("01037", "1037" or 1037), or None."""
+        try:
+            key = str(int(prefix))
+        except (TypeError, ValueError):
+            return None
+        return self._coordinates.get(key)
+
+
+def materialize(out_dir=GEO_INDEX_DIR):
+    """Build the index once and store it with the geolocation data version."""
+    os.makedirs(out_dir, exist_ok=True)
+    version = data_version("geolocation")
+    for name, df in build_index(read_csv(table_path("geolocation"), "geolocation")).items():
+        df.to_parquet(os.path.join(out_dir, f"{name}.parquet"), index=False)
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump({"data_version": version}, f, indent=2)
+    return version
+
+
+def _index_version(index_dir):
+    path = os.path.join(index_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["data_version"]
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_index(index_dir, version):
+    if _index_version(index_dir) == version:
+        tables = {name: pd.read_parquet(os.path.join(index_dir, f"{name}.parquet")) for name in ("prefixes", "city_counts")}
+    else:
+        # No index for this data yet: build it from the raw table, which is not kept
+        tables = build_index(read_csv(table_path("geolocation"), "geolocation"))
+    return GeoIndex(**tables)
+
+
+def load_geo_index(index_dir=GEO_INDEX_DIR) -> GeoIndex:
+    """Return the geolocation index for the current geolocation data, built at most once."""
+    return _load_index(index_dir, data_version("geolocation"))
+
+
+if __name__ == "__main__":
+    # Rebuild the index after geolocation_dataset.csv changes:
+    #   python dashboard/geo_index.py
+    print(f"Geolocation index written to {GEO_INDEX_DIR} for {materialize()}")
@@ -0,0 +1,191 @@
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Render instrumentation. script.py wraps every page render in render_trace();
+# pages call mark(kind, name) after each step (data loading, aggregation, chart
+# construction), which records the time and memory change since the previous
+# mark. Finished renders go to the process-wide METRICS, to the
+# "dashboard.metrics" logger as one JSON line, and to a Prometheus text file
+# when DASHBOARD_METRICS_FILE is set.
+
+# Step kinds used by the pages
+KINDS = ["import", "filters", "load", "aggregate", "chart", "table", "other"]
+
+# Latency histogram buckets in seconds (the Prometheus client defaults)
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, float("inf")]
+
+# Render times kept per page for the percentiles of the debug panel
+RECENT_RENDERS = 1000
+
+# Environment variables: path of the Prometheus text file, and "1" to always show the debug panel
+METRICS_FILE_ENV = "DASHBOARD_METRICS_FILE"
+DEBUG_ENV = "DASHBOARD_DEBUG"
+
+logger = logging.getLogger("dashboard.metrics")
+
+
+def _rss_bytes():
+    # Resident memory of the process (Linux); None where /proc is not available
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Trace:
+    """Steps of one page render, each timed from the previous mark."""
+
+    def __init__(self, page):
+        self.page = page
+        self.steps = []
+        self.seconds = None
+        self.started = self._last_time = time.perf_counter()
+        self._last_rss = _rss_bytes()
+
+    def mark(self, kind, name=""):
+        now, rss = time.perf_counter(), _rss_bytes()
+        self.steps.append({
+            "kind": kind,
+            "name": name,
+            "seconds": now - self._last_time,
+            "memory_delta": rss - self._last_rss if rss is not None and self._last_rss is not None else None,
+        })
+        self._last_time, self._last_rss = now, rss
+
+    def finish(self):
+        self.mark("other")
+        self.seconds = time.perf_counter() - self.started
+
+    def steps_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.steps, columns=["kind", "name", "seconds", "memory_delta"])
+        return df.astype({"seconds": "float64", "memory_delta": "float64"})
+
+    def as_record(self):
+        return {"page": self.page, "seconds": round(self.seconds, 6), "steps": [
+            {**s, "seconds": round(s["seconds"], 6)} for s in self.steps
+        ]}
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = np.zeros(len(BUCKETS), dtype="int64")
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[np.searchsorted(BUCKETS, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+    """Render and step latencies of every session of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent = defaultdict(lambda: deque(maxlen=RECENT_RENDERS))
+        self._renders = defaultdict(_Histogram)
+        self._steps = defaultdict(_Histogram)
+
+    def observe(self, trace):
+        with self._lock:
+            self._recent[trace.page].append(trace.seconds)
+            self._renders[trace.page].observe(trace.seconds)
+            for kind, seconds in trace.steps_frame().groupby("kind", sort=False)["seconds"].sum().items():
+                self._steps[(trace.page, kind)].observe(seconds)
+
+    def latency_summary(self) -> pd.DataFrame:
+        """Renders, p50 and p95 render time per page over the last RECENT_RENDERS renders."""
+        with self._lock:
+            recent = {page: np.array(times) for page, times in self._recent.items()}
+        return pd.DataFrame([
+            {"page": page, "renders": len(times), "p50": np.percentile(times, 50), "p95": np.percentile(times, 95)}
+            for page, times in recent.items()
+        ], columns=["page", "renders", "p50", "p95"])
+
+    def prometheus(self) -> str:
+        """Histograms in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for metric, help_text, histograms in [
+                ("dashboard_page_render_seconds", "Page render time", self._renders),
+                ("dashboard_render_step_seconds", "Time per step kind in a page render", self._steps),
+            ]:
+                lines += [f"# HELP {metric} {help_text}.", f"# TYPE {metric} histogram"]
+                for key, histogram in sorted(histograms.items()):
+                    page, kind = key if isinstance(key, tuple) else (key, None)
+                    labels = f'page="{page}"' + (f',kind="{kind}"' if kind else "")
+                    for bound, count in zip(BUCKETS, np.cumsum(histogram.counts)):
+                        le = "+Inf" if np.isinf(bound) else repr(bound)
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.counts.sum()}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+_current = contextvars.ContextVar("trace", default=None)
+
+
+def mark(kind, name=""):
+    """End the current step of the page render (no-op outside render_trace)."""
+    trace = _current.get()
+    if trace is not None:
+        trace.mark(kind, name)
+
+
+def _write_metrics_file(path):
+    # Written next to the target and renamed, so a scraper never reads half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(METRICS.prometheus())
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def render_trace(page):
+    """Trace the render of `page`; the trace is recorded even if the render stops early."""
+    trace = Trace(page)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        trace.finish()
+        METRICS.observe(trace)
+        logger.info(json.dumps(trace.as_record()))
+        path = os.environ.get(METRICS_FILE_ENV)
+        if path:
+            _write_metrics_file(path)
+
+
+def debug_enabled():
+    """Whether to show the debug panel: DASHBOARD_DEBUG=1 or ?debug=1 in the URL."""
+    if os.environ.get(DEBUG_ENV) == "1":
+        return True
+    return st.experimental_get_query_params().get("debug") == ["1"]
+
+
+def debug_panel(trace):
+    """Sidebar panel with the steps of this render and the render latency of every page."""
+    with st.sidebar.expander("🛠️ Debug", expanded=True):
+        st.caption(f"{trace.page}: {trace.seconds * 1000:.0f} ms")
+        steps = trace.steps_frame()
+        steps["ms"] = (steps["seconds"] * 1000).round(1)
+        steps["memory_mb"] = (steps["memory_delta"] / 2**20).round(1)
+        st.dataframe(steps[["kind", "name", "ms", "memory_mb"]], hide_index=True)
+        st.caption("Render latency per page (this process)")
+        summary = METRICS.latency_summary()
+        summary[["p50", "p95"]] = (summary[["p50", "p95"]] * 1000).round(0)
+        st.dataframe(summary.rename(columns={"p50": "p50_ms", "p95": "p95_ms"}), hide_index=True)
+        st.download_button("Prometheus metrics", METRICS.prometheus(), file_name="metrics.prom", mime="text/plain")
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_order_payments
+from filters import selected_order_ids
+
+QUANTILES = [0.25, 0.5, 0.75, 0.9]
+
+
+def _group_quantiles(values, counts, quantiles):
+    """Linear-interpolated quantiles of consecutive groups of sorted `values`.
+
+    `values` holds the groups one after the other, each sorted, and `counts`
+    their sizes. Returns a (groups, quantiles) array, NaN for empty groups.
+    """
+    q = np.asarray(quantiles, dtype="float64")
+    if len(values) == 0:
+        return np.full((len(counts), len(q)), np.nan)
+    starts = np.cumsum(counts) - counts
+    ends = starts + np.maximum(counts - 1, 0)
+    position = starts[:, None] + q[None, :] * (ends - starts)[:, None]
+    lower = np.minimum(np.floor(position).astype("int64"), len(values) - 1)
+    upper = np.minimum(lower + 1, np.minimum(ends, len(values) - 1)[:, None])
+    fraction = position - lower
+    result = values[lower] * (1 - fraction) + values[upper] * fraction
+    result[counts == 0] = np.nan
+    return result
+
+
+class PaymentStats:
+    """order_payments, typed and sorted once, answering the payment page's queries.
+
+    Payments are sorted by payment type then value, so every statistic of a
+    selection is a bincount over the type codes and quantiles are read by
+    position without sorting again. A selection is a boolean mask over the
+    sorted payments (see payment_selection()).
+    """
+
+    def __init__(self, payments_df):
+        types = pd.Categorical(payments_df["payment_type"].astype(str))
+        self.types = list(types.categories)
+        codes = types.codes.astype("int64")
+        values = payments_df["payment_value"].to_numpy(dtype="float64")
+        order = np.lexsort((values, codes))
+
+        self.codes = codes[order]
+        self.values = values[order]
+        self.installments = payments_df["payment_installments"].to_numpy(dtype="int64")[order]
+        self.sequential = payments_df["payment_sequential"].to_numpy(dtype="int64")[order]
+        # Position of every payment's order among the distinct order ids, so a
+        # selection of orders is looked up once per order instead of per payment
+        order_codes, orders = pd.factorize(payments_df["order_id"].take(order))
+        self.order_codes = order_codes.astype("int64")
+        self.orders = pd.Index(orders)
+
+    def selection(self, order_ids):
+        """Boolean mask of the payments of the orders `order_ids`."""
+        positions = self.orders.get_indexer(order_ids)
+        # One extra slot takes the unknown ids (-1) and the payments without an order id
+        keep = np.zeros(len(self.orders) + 1, dtype=bool)
+        keep[positions] = True
+        keep[-1] = False
+        return keep[self.order_codes]
+
+    @staticmethod
+    def _selected(selection, *arrays):
+        return arrays if selection is None else tuple(array[selection] for array in arrays)
+
+    def summary(self, selection=None, quantiles=QUANTILES) -> pd.DataFrame:
+        """Count, total, mean and quantiles of payment_value per payment type.
+
+        `selection` is a mask of the payments to include (None: all of them).
+        """
+        codes, values = self._selected(selection, self.codes, self.values)
+        n_types = len(self.types)
+        counts = np.bincount(codes, minlength=n_types)
+        totals = np.bincount(codes, weights=values, minlength=n_types)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, totals / counts, np.nan)
+        df = pd.DataFrame({
+            "payment_type": pd.Categorical(self.types, categories=self.types),
+            "count": counts,
+            "total_value": totals,
+            "mean_value": means,
+        })
+        # The selection keeps the (type, value) order, so each type's values are sorted
+        quantile_values = _group_quantiles(values, counts, quantiles)
+        for i, q in enumerate(quantiles):
+            df[f"p{round(q * 100)}"] = quantile_values[:, i]
+        df = df[df["count"] > 0].reset_index(drop=True)
+        df["payment_type"] = df["payment_type"].cat.remove_unused_categories()
+        return df
+
+    def _histogram(self, selection, column, name):
+        codes, counts_of = self._selected(selection, self.codes, getattr(self, column))
+        width = int(counts_of.max()) + 1 if len(counts_of) else 1
+        counts = np.bincount(codes * width + counts_of, minlength=len(self.types) * width).reshape(len(self.types), width)
+        types, values = np.nonzero(counts)
+        return pd.DataFrame({
+            "payment_type": pd.Categorical(np.asarray(self.types)[types], categories=self.types).remove_unused_categories(),
+            name: values,
+            "count": counts[types, values],
+        })
+
+    def installments_histogram(self, selection=None) -> pd.DataFrame:
+        """Number of payments per (payment type, number of installments)."""
+        return self._histogram(selection, "installments", "payment_installments")
+
+    def sequential_histogram(self, selection=None) -> pd.DataFrame:
+        """Number of payments per (payment type, position of the payment in its order)."""
+        return self._histogram(selection, "sequential", "payment_sequential")
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _payment_stats(version):
+    return PaymentStats(load_order_payments())
+
+
+def load_payment_stats() -> PaymentStats:
+    """PaymentStats of the current order_payments, built once per data version and shared."""
+    return _payment_stats(data_version("order_payments"))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _payment_selection(payments_version, version, filters):
+    selection = _payment_stats(payments_version).selection(selected_order_ids(filters))
+    # Shared between sessions
+    selection.flags.writeable = False
+    return selection
+
+
+def payment_selection(filters):
+    """Mask of the payments matching `filters` (None when nothing is filtered).
+
+    Every filter goes through all_data, so the payments of orders without
+    items are left out whichever filters are set, as on the other pages.
+    Computed once per data version and filters and shared.
+    """
+    if not filters.active:
+        return None
+    return _payment_selection(data_version("order_payments"), data_version(), filters)
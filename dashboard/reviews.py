@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_all_data
+from filters import NO_FILTERS, filtered_all_data
+
+# Columns of all_data needed for the review statistics
+REVIEW_COLUMNS = ["order_id", "review_id", "product_category_name_english", "review_score"]
+
+SCORES = np.arange(1, 6)
+
+# Weight of the overall mean in the Bayesian score, in reviews: a category
+# with PRIOR_REVIEWS reviews lands halfway between its own mean and the overall one
+PRIOR_REVIEWS = 30
+
+# Reviews of 4 or 5 stars count as positive; Z gives the 95% Wilson interval
+POSITIVE_SCORE = 4
+Z = 1.96
+
+
+def review_stats(df) -> pd.DataFrame:
+    """Reviews, mean, score distribution, Bayesian score and Wilson bound per product category.
+
+    all_data repeats a review on every line of its order, so each review is
+    counted once per category of its order. The counts of the 5 scores of
+    every category come from one bincount; everything else is derived from
+    them. Sorted by Bayesian score, best first.
+    """
+    reviews = df.drop_duplicates(["order_id", "review_id", "product_category_name_english"])
+    codes, categories = pd.factorize(reviews["product_category_name_english"], sort=True)
+    scores = reviews["review_score"].to_numpy(dtype="float64", na_value=np.nan)
+    keep = (codes >= 0) & (scores >= SCORES[0]) & (scores <= SCORES[-1])
+    codes, scores = codes[keep], scores[keep].astype("int64")
+
+    distribution = np.bincount(
+        codes * len(SCORES) + scores - SCORES[0], minlength=len(categories) * len(SCORES)
+    ).reshape(len(categories), len(SCORES))
+    counts = distribution.sum(axis=1)
+    totals = distribution @ SCORES
+    overall_mean = totals.sum() / counts.sum() if counts.sum() else np.nan
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Shrink every mean towards the overall one, the less reviews the more
+        bayesian = (PRIOR_REVIEWS * overall_mean + totals) / (PRIOR_REVIEWS + counts)
+        # Lower bound of the 95% Wilson interval of the share of positive reviews
+        positive = distribution[:, SCORES >= POSITIVE_SCORE].sum(axis=1) / counts
+        spread = Z * np.sqrt(positive * (1 - positive) / counts + Z**2 / (4 * counts**2))
+        wilson = (positive + Z**2 / (2 * counts) - spread) / (1 + Z**2 / counts)
+
+        df = pd.DataFrame({
+            "product_category_name_english": pd.Categorical(np.asarray(categories, dtype=object)),
+            "reviews": counts,
+            "review_score": totals / counts,
+            "bayesian_score": bayesian,
+            "positive_share": positive,
+            "positive_lower_bound": wilson,
+        })
+    for score, column in zip(SCORES, distribution.T):
+        df[f"score_{score}"] = column
+    df = df[df["reviews"] > 0].assign(
+        product_category_name_english=lambda d: d["product_category_name_english"].cat.remove_unused_categories()
+    )
+    return df.sort_values("bayesian_score", ascending=False, kind="stable", ignore_index=True)
+
+
+def score_distribution(stats_df) -> pd.DataFrame:
+    """Long table of the share of each score per category of `stats_df`, for stacked bars."""
+    columns = [f"score_{score}" for score in SCORES]
+    shares = stats_df[columns].div(stats_df["reviews"], axis=0)
+    shares.columns = SCORES
+    shares.insert(0, "product_category_name_english", stats_df["product_category_name_english"])
+    df = shares.melt(id_vars="product_category_name_english", var_name="review_score", value_name="share")
+    df["product_category_name_english"] = df["product_category_name_english"].cat.remove_unused_categories()
+    return df
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _review_stats(version):
+    return review_stats(load_all_data(columns=REVIEW_COLUMNS))
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _filtered_review_stats(version, filters):
+    return review_stats(filtered_all_data(REVIEW_COLUMNS, filters))
+
+
+def load_review_stats(filters=NO_FILTERS) -> pd.DataFrame:
+    """review_stats of the current all_data, computed once per data version (and filter selection)."""
+    version = data_version()
+    if filters.active:
+        return _filtered_review_stats(version, filters)
+    return _review_stats(version)
@@ -0,0 +1,289 @@
+import argparse
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+# Weights of the recency, frequency and monetary ranks in the RFM score
+DEFAULT_WEIGHTS = (0.15, 0.28, 0.57)
+
+# Customer segments from best to worst and the RFM score a customer must
+# exceed to enter each of them (the last segment takes everything else)
+SEGMENTS = [
+    "Top Customers",
+    "High Value Customers",
+    "Mid Value Customers",
+    "Low Value Customers",
+    "Lost Customers",
+]
+SEGMENT_THRESHOLDS = [3, 2.5, 2, 1]
+
+# Columns of all_data needed to compute RFM
+RFM_COLUMNS = ["customer_unique_id", "order_id", "order_purchase_timestamp", "price", "quantity"]
+
+
+def customer_summary(df) -> pd.DataFrame:
+    """Last order date, number of unique orders and total spend per customer.
+
+    `df` is not modified.
+    """
+    return df.assign(total_price=df["price"] * df["quantity"]).groupby(
+        "customer_unique_id", as_index=False, observed=True
+    ).agg(
+        last_order_date=("order_purchase_timestamp", "max"),
+        frequency=("order_id", "nunique"),
+        monetary=("total_price", "sum"),
+    )
+
+
+def latest_purchase_date(df):
+    """Date (midnight) of the most recent purchase, the default as-of date."""
+    return pd.Timestamp(df["order_purchase_timestamp"].max()).normalize()
+
+
+def segment(scores):
+    """Map RFM scores to SEGMENTS (vectorized), as an ordered categorical."""
+    scores = np.asarray(scores)
+    conditions = [scores > threshold for threshold in SEGMENT_THRESHOLDS]
+    labels = np.select(conditions, SEGMENTS[:-1], default=SEGMENTS[-1])
+    return pd.Categorical(labels, categories=SEGMENTS, ordered=True)
+
+
+def score_rfm(summary, as_of, weights=DEFAULT_WEIGHTS) -> pd.DataFrame:
+    """Recency, RFM score and segment for every customer of `summary`.
+
+    `summary` has the columns returned by customer_summary(). Ranks are
+    normalized to 0-100 and combined with `weights` (rescaled to sum to 1),
+    then scaled to a 0-5 score.
+    """
+    weights = np.asarray(weights, dtype="float64")
+    weights = weights / weights.sum()
+
+    rfm_df = summary[["customer_unique_id", "frequency", "monetary"]].copy()
+    rfm_df["recency"] = (pd.Timestamp(as_of) - pd.to_datetime(summary["last_order_date"])).dt.days.to_numpy()
+
+    r_rank = rfm_df["recency"].rank(ascending=False).to_numpy()
+    f_rank = rfm_df["frequency"].rank(ascending=True).to_numpy()
+    m_rank = rfm_df["monetary"].rank(ascending=True).to_numpy()
+    score = (
+        weights[0] * (r_rank / r_rank.max() * 100)
+        + weights[1] * (f_rank / f_rank.max() * 100)
+        + weights[2] * (m_rank / m_rank.max() * 100)
+    ) * 0.05
+    rfm_df["RFM_score"] = np.round(score, 2)
+    rfm_df["customer_segment"] = segment(rfm_df["RFM_score"])
+    return rfm_df
+
+
+def compute_rfm(df, as_of=None, weights=DEFAULT_WEIGHTS) -> pd.DataFrame:
+    """RFM table for the order lines in `df` (all_data columns RFM_COLUMNS).
+
+    `as_of` defaults to the date of the latest purchase in `df`.
+    """
+    if as_of is None:
+        as_of = latest_purchase_date(df)
+    return score_rfm(customer_summary(df), as_of, weights)
+
+
+def segment_counts(rfm_df) -> pd.DataFrame:
+    """Number of customers per segment, in SEGMENTS order."""
+    counts = rfm_df["customer_segment"].value_counts(sort=False).reindex(SEGMENTS, fill_value=0)
+    return pd.DataFrame({
+        "customer_segment": pd.Categorical(counts.index, categories=SEGMENTS, ordered=True),
+        "customer_unique_id": counts.to_numpy(),
+    })
+
+
+class RFMStore:
+    """Per-customer RFM state that new batches of order lines are folded into.
+
+    Only the last order date, number of orders and total spend of every
+    customer are kept, in arrays that grow geometrically, so a refresh costs
+    time proportional to the new batch instead of the whole order history.
+    Recency and scores are computed on demand for any as-of date. Batches must
+    hold complete orders that were not added before (an append-only order
+    feed).
+
+    On disk the state is a folder of Parquet parts. save() only appends the
+    per-customer summaries of the batches added since the last save as a new
+    part; load() folds the parts back together.
+    """
+
+    STATE_COLUMNS = ["last_order_date", "frequency", "monetary"]
+
+    # Smallest capacity of the state arrays
+    MIN_CAPACITY = 1024
+
+    def __init__(self, summary=None):
+        if summary is None:
+            summary = pd.DataFrame({
+                "customer_unique_id": pd.Series(dtype="string[pyarrow]"),
+                "last_order_date": pd.Series(dtype="datetime64[ns]"),
+                "frequency": pd.Series(dtype="int64"),
+                "monetary": pd.Series(dtype="float64"),
+            })
+        # Customers of the initial summary, then the ones added since (with
+        # their positions in the state arrays)
+        self._customers = pd.Index(summary["customer_unique_id"])
+        self._new_customers = []
+        self._new_positions = {}
+
+        # State arrays; the last order date is kept as int64 nanoseconds (NaT
+        # is the smallest int64, so np.maximum skips it)
+        self._size = 0
+        self._last_order = np.empty(0, dtype="int64")
+        self._frequency = np.empty(0, dtype="int64")
+        self._monetary = np.empty(0, dtype="float64")
+        self._reserve(len(summary))
+        self._last_order[:len(summary)] = summary["last_order_date"].to_numpy(dtype="datetime64[ns]").view("int64")
+        self._frequency[:len(summary)] = summary["frequency"].to_numpy(dtype="int64")
+        self._monetary[:len(summary)] = summary["monetary"].to_numpy(dtype="float64")
+        self._size = len(summary)
+
+        # Batch summaries not saved yet, and the folder they belong to
+        self._pending = []
+        self._saved_to = None
+
+    @classmethod
+    def from_orders(cls, df):
+        return cls(customer_summary(df))
+
+    def _reserve(self, size):
+        # Double the capacity when it runs out, so appends are amortized O(1) per customer
+        capacity = len(self._frequency)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, self.MIN_CAPACITY)
+        for name in ("_last_order", "_frequency", "_monetary"):
+            current = getattr(self, name)
+            grown = np.empty(capacity, dtype=current.dtype)
+            grown[:self._size] = current[:self._size]
+            setattr(self, name, grown)
+
+    def _positions(self, customers):
+        # Position of every customer in the state arrays, -1 for unknown customers
+        positions = self._customers.get_indexer(customers)
+        missing = positions < 0
+        if self._new_positions and missing.any():
+            positions[missing] = customers[missing].map(self._new_positions).fillna(-1).to_numpy(dtype="int64")
+        return positions
+
+    def add_orders(self, df):
+        """Fold a batch of new order lines (RFM_COLUMNS) into the state.
+
+        Returns the number of customers in the batch.
+        """
+        batch = customer_summary(df)
+        customers = batch["customer_unique_id"]
+        positions = self._positions(customers)
+
+        # New customers: append empty rows at the end of the arrays
+        new = positions < 0
+        if new.any():
+            start, stop = self._size, self._size + int(new.sum())
+            self._reserve(stop)
+            positions[new] = np.arange(start, stop)
+            new_customers = customers[new].to_numpy(dtype=object)
+            self._new_customers.append(new_customers)
+            self._new_positions.update(zip(new_customers, range(start, stop)))
+            self._last_order[start:stop] = np.iinfo("int64").min
+            self._frequency[start:stop] = 0
+            self._monetary[start:stop] = 0
+            self._size = stop
+
+        # Every customer of the batch appears once, so fancy indexing updates each row once
+        last_order = batch["last_order_date"].to_numpy(dtype="datetime64[ns]").view("int64")
+        self._last_order[positions] = np.maximum(self._last_order[positions], last_order)
+        self._frequency[positions] += batch["frequency"].to_numpy(dtype="int64")
+        self._monetary[positions] += batch["monetary"].to_numpy(dtype="float64")
+        self._pending.append(batch)
+        return len(batch)
+
+    def summary(self) -> pd.DataFrame:
+        """Current state in the layout returned by customer_summary()."""
+        customers = self._customers
+        if self._new_customers:
+            customers = customers.append(pd.Index(np.concatenate(self._new_customers), dtype=customers.dtype))
+        return pd.DataFrame({
+            "customer_unique_id": customers.array,
+            "last_order_date": self._last_order[:self._size].view("datetime64[ns]").copy(),
+            "frequency": self._frequency[:self._size].copy(),
+            "monetary": self._monetary[:self._size].copy(),
+        })
+
+    def latest_purchase_date(self):
+        return pd.Timestamp(pd.to_datetime(self._last_order[:self._size].view("datetime64[ns]")).max()).normalize()
+
+    def rfm(self, as_of=None, weights=DEFAULT_WEIGHTS) -> pd.DataFrame:
+        """RFM table as of `as_of` (default: date of the latest purchase)."""
+        if as_of is None:
+            as_of = self.latest_purchase_date()
+        return score_rfm(self.summary(), as_of, weights)
+
+    @staticmethod
+    def _parts(path):
+        return sorted(glob.glob(os.path.join(path, "part-*.parquet")))
+
+    def save(self, path, compact=False):
+        """Write the state to the folder `path`.
+
+        If `path` holds the earlier saves of this store, only the batches added
+        since are written, as one new part. Otherwise, or with `compact`, the
+        folder is rewritten with the whole state as a single part.
+        """
+        if compact or self._saved_to != os.path.abspath(path):
+            # A state saved by an older version is a single Parquet file
+            if os.path.isfile(path):
+                os.remove(path)
+            os.makedirs(path, exist_ok=True)
+            for part in self._parts(path):
+                os.remove(part)
+            self.summary().to_parquet(os.path.join(path, "part-00000.parquet"), index=False)
+        elif self._pending:
+            batches = pd.concat(self._pending, ignore_index=True)
+            batches.to_parquet(os.path.join(path, f"part-{len(self._parts(path)):05d}.parquet"), index=False)
+        self._pending = []
+        self._saved_to = os.path.abspath(path)
+
+    @classmethod
+    def load(cls, path):
+        parts = [path] if os.path.isfile(path) else cls._parts(path)
+        summary = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+        summary["customer_unique_id"] = summary["customer_unique_id"].astype("string[pyarrow]")
+        if len(parts) > 1:
+            # A customer has one row in every part holding some of their orders
+            summary = summary.groupby("customer_unique_id", as_index=False, sort=False).agg(
+                last_order_date=("last_order_date", "max"),
+                frequency=("frequency", "sum"),
+                monetary=("monetary", "sum"),
+            )
+        store = cls(summary)
+        if not os.path.isfile(path):
+            store._saved_to = os.path.abspath(path)
+        return store
+
+
+if __name__ == "__main__":
+    # Daily refresh of the RFM state with new order lines (all_data columns):
+    #   python dashboard/rfm.py data/rfm_state.parquet new_orders.csv [...]
+    # Without a saved state, the state is first built from all_data. Each run
+    # appends one part to the state folder; --compact merges them into one.
+    from data_loader import load_all_data
+    from schema import read_csv
+
+    parser = argparse.ArgumentParser(description="Fold new order lines into the RFM state")
+    parser.add_argument("state", help="Folder of Parquet parts holding the per-customer RFM state")
+    parser.add_argument("batches", nargs="*", help="CSV files with new order lines")
+    parser.add_argument("--compact", action="store_true", help="Rewrite the state as a single part")
+    args = parser.parse_args()
+
+    if os.path.exists(args.state):
+        store = RFMStore.load(args.state)
+    else:
+        store = RFMStore.from_orders(load_all_data(columns=RFM_COLUMNS))
+    for path in args.batches:
+        customers = store.add_orders(read_csv(path, "all_data", usecols=RFM_COLUMNS))
+        print(f"{path}: {customers} customers updated")
+    store.save(args.state, compact=args.compact)
+    print(segment_counts(store.rfm()).to_string(index=False))
@@ -0,0 +1,254 @@
+import os
+
+import pandas as pd
+
+# Compact dtypes for the Olist tables:
+# - 32 character hex IDs and free text are stored as Arrow strings instead of Python objects
+# - low-cardinality text (status, payment type, state, category, city) is categorical
+# - zip code prefixes are categorical strings without leading zeros, like the notebook's
+#   int -> str cast ("01037" in the CSV becomes "1037")
+# - counts and scores use the smallest (nullable where values can be missing) integer type
+ID = "string[pyarrow]"
+TEXT = "string[pyarrow]"
+CATEGORY = "category"
+DATETIME = "datetime64[ns]"
+TIMEDELTA = "timedelta64[ns]"
+ZIP_CODE = "zip_code"
+
+# File name of every table in the data folder
+TABLE_FILES = {
+    "all_data": "all_data.csv",
+    "customers": "customers_dataset.csv",
+    "geolocation": "geolocation_dataset.csv",
+    "order_items": "order_items_dataset.csv",
+    "order_payments": "order_payments_dataset.csv",
+    "order_reviews": "order_reviews_dataset.csv",
+    "orders": "orders_dataset.csv",
+    "products": "products_dataset.csv",
+    "product_category_name_translation": "product_category_name_translation.csv",
+    "sellers": "sellers_dataset.csv",
+}
+
+SCHEMAS = {
+    "customers": {
+        "customer_id": ID,
+        "customer_unique_id": ID,
+        "customer_zip_code_prefix": ZIP_CODE,
+        "customer_city": CATEGORY,
+        "customer_state": CATEGORY,
+    },
+    "geolocation": {
+        "geolocation_zip_code_prefix": ZIP_CODE,
+        "geolocation_lat": "float32",
+        "geolocation_lng": "float32",
+        "geolocation_city": CATEGORY,
+        "geolocation_state": CATEGORY,
+    },
+    "order_items": {
+        "order_id": ID,
+        "order_item_id": "uint8",
+        "product_id": ID,
+        "seller_id": ID,
+        "shipping_limit_date": DATETIME,
+        "price": "float64",
+        "freight_value": "float64",
+    },
+    "order_payments": {
+        "order_id": ID,
+        "payment_sequential": "uint8",
+        "payment_type": CATEGORY,
+        "payment_installments": "uint8",
+        "payment_value": "float64",
+    },
+    "order_reviews": {
+        "review_id": ID,
+        "order_id": ID,
+        "review_score": "Int8",
+        "review_comment_title": TEXT,
+        "review_comment_message": TEXT,
+        "review_creation_date": DATETIME,
+        "review_answer_timestamp": DATETIME,
+    },
+    "orders": {
+        "order_id": ID,
+        "customer_id": ID,
+        "order_status": CATEGORY,
+        "order_purchase_timestamp": DATETIME,
+        "order_approved_at": DATETIME,
+        "order_delivered_carrier_date": DATETIME,
+        "order_delivered_customer_date": DATETIME,
+        "order_estimated_delivery_date": DATETIME,
+    },
+    "products": {
+        "product_id": ID,
+        # Kept as strings: the notebook fills missing names with "not defined"
+        "product_category_name": TEXT,
+        "product_name_lenght": "Int16",
+        "product_description_lenght": "Int16",
+        "product_photos_qty": "Int8",
+        "product_weight_g": "Int32",
+        "product_length_cm": "Int16",
+        "product_height_cm": "Int16",
+        "product_width_cm": "Int16",
+    },
+    "product_category_name_translation": {
+        "product_category_name": TEXT,
+        "product_category_name_english": TEXT,
+    },
+    "sellers": {
+        "seller_id": ID,
+        "seller_zip_code_prefix": ZIP_CODE,
+        "seller_city": CATEGORY,
+        "seller_state": CATEGORY,
+    },
+    "all_data": {
+        "order_id": ID,
+        "customer_id": ID,
+        "order_status": CATEGORY,
+        "order_purchase_timestamp": DATETIME,
+        "order_approved_at": DATETIME,
+        "order_delivered_carrier_date": DATETIME,
+        "order_delivered_customer_date": DATETIME,
+        "order_estimated_delivery_date": DATETIME,
+        "shipping_time": TIMEDELTA,
+        "shipping_duration": TIMEDELTA,
+        "estimated_duration": TIMEDELTA,
+        # The same durations as whole seconds, computed once by the ETL
+        "shipping_time_seconds": "Int32",
+        "shipping_duration_seconds": "Int32",
+        "estimated_duration_seconds": "Int32",
+        "product_id": ID,
+        "quantity": "uint16",
+        "seller_id": ID,
+        "shipping_limit_date": DATETIME,
+        "price": "float64",
+        "freight_value": "float64",
+        "product_category_name": CATEGORY,
+        "product_name_length": "int16",
+        "product_description_length": "int16",
+        "product_photos_qty": "int8",
+        "product_weight_g": "int32",
+        "product_length_cm": "int16",
+        "product_height_cm": "int16",
+        "product_width_cm": "int16",
+        "product_category_name_english": CATEGORY,
+        "review_id": ID,
+        "review_score": "Int8",
+        "review_comment_title": TEXT,
+        "review_comment_message": TEXT,
+        "review_creation_date": DATETIME,
+        "review_answer_timestamp": DATETIME,
+        "customer_unique_id": ID,
+        "customer_zip_code_prefix": ZIP_CODE,
+        "customer_city": CATEGORY,
+        "customer_state": CATEGORY,
+        "total_price": "float64",
+        "frequency": "uint16",
+        "monetary": "float64",
+        "recency": "int32",
+        "color": ID,
+        "RFM_score": "float64",
+        "customer_segment": CATEGORY,
+    },
+}
+
+
+def _selected(table, columns):
+    schema = SCHEMAS.get(table, {})
+    if columns is None:
+        return schema
+    return {col: dtype for col, dtype in schema.items() if col in columns}
+
+
+def _csv_options(table, usecols):
+    schema = _selected(table, usecols)
+    dtype = {col: t for col, t in schema.items() if t not in (DATETIME, TIMEDELTA, ZIP_CODE)}
+    dtype.update({col: "Int32" for col, t in schema.items() if t == ZIP_CODE})
+    parse_dates = [col for col, t in schema.items() if t == DATETIME]
+    return {"usecols": usecols, "dtype": dtype, "parse_dates": parse_dates or None}
+
+
+def as_zip_codes(values):
+    """Zip code prefixes as categorical strings without leading zeros."""
+    if isinstance(values.dtype, pd.CategoricalDtype) and not pd.api.types.is_numeric_dtype(values.cat.categories):
+        return values
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values)
+    return values.astype("category").cat.rename_categories(str)
+
+
+def _convert(df, table):
+    # Conversions read_csv cannot do while parsing
+    for col, t in SCHEMAS.get(table, {}).items():
+        if col not in df.columns:
+            continue
+        if t == TIMEDELTA:
+            df[col] = pd.to_timedelta(df[col])
+        elif t == ZIP_CODE:
+            df[col] = as_zip_codes(df[col])
+    return df
+
+
+def read_csv(path, table, usecols=None, **kwargs) -> pd.DataFrame:
+    """pd.read_csv with the compact dtypes of `table` applied while parsing."""
+    df = pd.read_csv(path, **_csv_options(table, usecols), **kwargs)
+    return _convert(df, table)
+
+
+def read_csv_chunks(path, table, chunksize, usecols=None, **kwargs):
+    """Like read_csv, but yield the file in typed chunks of `chunksize` rows."""
+    with pd.read_csv(path, chunksize=chunksize, **_csv_options(table, usecols), **kwargs) as reader:
+        for chunk in reader:
+            yield _convert(chunk, table)
+
+
+def apply_schema(df, table) -> pd.DataFrame:
+    """Return `df` with every column that has a schema entry cast to its compact dtype."""
+    casts = {}
+    for col, dtype in _selected(table, df.columns).items():
+        if str(df[col].dtype) == dtype:
+            continue
+        if dtype == DATETIME:
+            casts[col] = pd.to_datetime(df[col])
+        elif dtype == TIMEDELTA:
+            casts[col] = pd.to_timedelta(df[col])
+        elif dtype == ZIP_CODE:
+            casts[col] = as_zip_codes(df[col])
+        elif dtype == ID and pd.api.types.is_numeric_dtype(df[col]):
+            casts[col] = df[col].astype(str).astype(dtype)
+        else:
+            casts[col] = df[col].astype(dtype)
+    return df.assign(**casts) if casts else df
+
+
+def memory_report(before, after) -> pd.DataFrame:
+    """Bytes used per table before and after applying the schema.
+
+    `before` and `after` map table names to DataFrames.
+    """
+    rows = []
+    for table, df in before.items():
+        bytes_before = int(df.memory_usage(deep=True).sum())
+        bytes_after = int(after[table].memory_usage(deep=True).sum())
+        rows.append({
+            "table": table,
+            "rows": len(df),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved": bytes_before - bytes_after,
+            "ratio": round(bytes_before / bytes_after, 2) if bytes_after else None,
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # Report the memory saved for every table present in data/:
+    #   python dashboard/schema.py
+    from data_loader import table_path
+
+    before, after = {}, {}
+    for table in TABLE_FILES:
+        if os.path.exists(table_path(table)):
+            before[table] = pd.read_csv(table_path(table))
+            after[table] = read_csv(table_path(table), table)
+    print(memory_report(before, after).to_string(index=False))
@@ -0,0 +1,168 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import DATA_DIR, data_version, load_all_data, load_table
+from filters import NO_FILTERS, filtered_all_data
+
+# Folder with the materialized seller fact table and its manifest
+SELLER_FACTS_DIR = os.path.join(DATA_DIR, "seller_facts")
+MANIFEST_FILE = "manifest.json"
+FACTS_FILE = "seller_facts.parquet"
+
+# Columns of all_data needed for the seller facts
+SELLER_COLUMNS = [
+    "order_id",
+    "product_id",
+    "seller_id",
+    "quantity",
+    "price",
+    "freight_value",
+    "review_score",
+    "shipping_limit_date",
+    "order_delivered_carrier_date",
+]
+
+# Seller metrics offered for ranking: column -> label
+METRICS = {
+    "revenue": "Revenue",
+    "orders": "Orders",
+    "avg_review_score": "Average Review Score",
+    "freight_share": "Freight Share",
+    "late_shipping_rate": "Late Shipping Rate",
+}
+
+
+def build_seller_facts(all_df, sellers_df) -> pd.DataFrame:
+    """One row per seller: revenue, orders, items, freight share, review score and late shipping rate.
+
+    `all_df` has the SELLER_COLUMNS of all_data, where an order line appears
+    once per review of its order; lines are counted once. A line ships late
+    when the carrier got it after its shipping_limit_date.
+    """
+    lines = all_df.drop_duplicates(["order_id", "product_id", "seller_id"])
+    carrier_known = lines["order_delivered_carrier_date"].notna()
+    lines = pd.DataFrame({
+        "seller_id": lines["seller_id"],
+        "order_id": lines["order_id"],
+        "quantity": lines["quantity"].astype("int64"),
+        "revenue": lines["price"] * lines["quantity"],
+        "freight": lines["freight_value"] * lines["quantity"],
+        "shipped": carrier_known,
+        "late": (lines["order_delivered_carrier_date"] > lines["shipping_limit_date"]) & carrier_known,
+    })
+    facts = lines.groupby("seller_id", observed=True).agg(
+        revenue=("revenue", "sum"),
+        freight=("freight", "sum"),
+        orders=("order_id", "nunique"),
+        items=("quantity", "sum"),
+        shipped=("shipped", "sum"),
+        late=("late", "sum"),
+    )
+    # Average of the review score of each (seller, order)
+    reviews = all_df.groupby(["seller_id", "order_id"], observed=True)["review_score"].mean()
+    facts["avg_review_score"] = reviews.groupby(level="seller_id", observed=True).mean().astype("float64")
+    facts["freight_share"] = facts["freight"] / (facts["revenue"] + facts["freight"])
+    facts["late_shipping_rate"] = (facts["late"] / facts["shipped"]).where(facts["shipped"] > 0)
+    facts = facts.reset_index()
+    sellers_df = sellers_df[["seller_id", "seller_city", "seller_state"]]
+    return facts.merge(sellers_df, on="seller_id", how="left")
+
+
+class SellerFacts:
+    """Seller fact table with top-N / bottom-N queries that do not sort every seller.
+
+    np.partition finds the value of the N-th best (or worst) seller of a
+    metric in linear time; only the N sellers up to it are then sorted. Ties
+    keep the order of the fact table, as a stable sort would.
+    """
+
+    def __init__(self, facts):
+        self.facts = facts.reset_index(drop=True)
+        self._values = {metric: self.facts[metric].to_numpy(dtype="float64") for metric in METRICS}
+        self._orders = self.facts["orders"].to_numpy()
+
+    def __len__(self):
+        return len(self.facts)
+
+    def rank(self, metric, n=10, bottom=False, min_orders=1) -> pd.DataFrame:
+        """The `n` sellers with the highest (or lowest) `metric` among those with at least `min_orders` orders."""
+        values = self._values[metric]
+        candidates = np.flatnonzero((self._orders >= min_orders) & ~np.isnan(values))
+        keys = values[candidates] if bottom else -values[candidates]
+        if n < len(candidates):
+            kth = np.partition(keys, n - 1)[n - 1]
+            below = np.flatnonzero(keys < kth)
+            # Of the sellers tied with the N-th, the first ones in the table
+            tied = np.flatnonzero(keys == kth)[:n - len(below)]
+            candidates = candidates[np.sort(np.concatenate([below, tied]))]
+            keys = values[candidates] if bottom else -values[candidates]
+        ranked = self.facts.take(candidates[np.argsort(keys, kind="stable")]).reset_index(drop=True)
+        # Charts must only see the states and cities of the ranked sellers
+        for col in ("seller_city", "seller_state"):
+            if isinstance(ranked[col].dtype, pd.CategoricalDtype):
+                ranked[col] = ranked[col].cat.remove_unused_categories()
+        return ranked
+
+    def by_state(self) -> pd.DataFrame:
+        """Sellers, revenue and orders per seller state, by revenue."""
+        return self.facts.groupby("seller_state", observed=True).agg(
+            sellers=("seller_id", "size"), revenue=("revenue", "sum"), orders=("orders", "sum")
+        ).reset_index().sort_values("revenue", ascending=False, ignore_index=True)
+
+
+def _version():
+    # The facts depend on all_data and on the sellers table
+    return f"{data_version()}|{data_version('sellers')}"
+
+
+def materialize(out_dir=SELLER_FACTS_DIR):
+    """Build the seller fact table once and store it with the data versions it was built from."""
+    os.makedirs(out_dir, exist_ok=True)
+    version = _version()
+    facts = build_seller_facts(load_all_data(columns=SELLER_COLUMNS), load_table("sellers"))
+    facts.to_parquet(os.path.join(out_dir, FACTS_FILE), index=False)
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump({"data_version": version}, f, indent=2)
+    return version
+
+
+def _facts_version(facts_dir):
+    path = os.path.join(facts_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["data_version"]
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _load_facts(facts_dir, version):
+    if _facts_version(facts_dir) == version:
+        return SellerFacts(pd.read_parquet(os.path.join(facts_dir, FACTS_FILE)))
+    # No fact table for this data yet: build it from all_data
+    return SellerFacts(build_seller_facts(load_all_data(columns=SELLER_COLUMNS), load_table("sellers")))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _filtered_facts(version, filters):
+    return SellerFacts(build_seller_facts(filtered_all_data(SELLER_COLUMNS, filters), load_table("sellers")))
+
+
+def load_seller_facts(filters=NO_FILTERS, facts_dir=SELLER_FACTS_DIR) -> SellerFacts:
+    """SellerFacts of the current data, from the fact table when it is up to date.
+
+    With active `filters` the facts are computed on the matching rows only.
+    """
+    version = _version()
+    if filters.active:
+        return _filtered_facts(version, filters)
+    return _load_facts(facts_dir, version)
+
+
+if __name__ == "__main__":
+    # Rebuild the seller fact table after the data changes:
+    #   python dashboard/sellers.py
+    print(f"Seller facts written to {SELLER_FACTS_DIR} for {materialize()}")
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from views import PAGES
+
+# Modules that only some pages need; the report shows which ones a run imported
+HEAVY_MODULES = ["matplotlib", "seaborn", "plotly.express", "plotly.graph_objects", "scipy"]
+
+# What the single-file dashboard did before rendering any page: import every
+# plotting library and parse all_data.csv
+_EAGER_RUN = r"""
+import json, sys, time
+import streamlit
+preloaded = set(sys.modules)
+started = time.perf_counter()
+import pandas as pd, numpy, matplotlib.pyplot, seaborn, plotly.graph_objects, plotly.express
+pd.read_csv("data/all_data.csv")
+print(json.dumps({"seconds": time.perf_counter() - started,
+                  "modules": [m for m in json.loads(sys.argv[1]) if m in sys.modules and m not in preloaded]}))
+"""
+
+# Cold start of the dashboard (Home), then a first visit of one page. Modules
+# imported by streamlit or its test runner before the app runs are not counted.
+_PAGE_RUN = r"""
+import json, sys, time
+sys.path.insert(0, "dashboard")
+from streamlit.testing.v1 import AppTest
+preloaded = set(sys.modules)
+at = AppTest.from_file("dashboard/script.py", default_timeout=600)
+started = time.perf_counter()
+at.run()
+home = time.perf_counter() - started
+page_seconds = 0.0
+if sys.argv[2] != "Home":
+    page_started = time.perf_counter()
+    at.sidebar.selectbox[0].set_value(sys.argv[2]).run()
+    page_seconds = time.perf_counter() - page_started
+print(json.dumps({"home": home, "page": page_seconds, "errors": len(at.exception),
+                  "modules": [m for m in json.loads(sys.argv[1]) if m in sys.modules and m not in preloaded]}))
+"""
+
+
+def _run(code, *args):
+    # Every scenario runs in a fresh interpreter so nothing is imported or cached yet
+    result = subprocess.run(
+        [sys.executable, "-c", code, json.dumps(HEAVY_MODULES), *args],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def startup_report(pages) -> pd.DataFrame:
+    """Cold start timings of the eager single-file layout and of each lazy page.
+
+    Times exclude importing streamlit itself, which every layout pays.
+    """
+    rows = []
+    if os.path.exists(os.path.join("data", "all_data.csv")):
+        eager = _run(_EAGER_RUN)
+        rows.append({
+            "scenario": "eager imports + all_data.csv (before)",
+            "seconds": round(eager["seconds"], 3),
+            "heavy_modules": ", ".join(eager["modules"]),
+        })
+    for page in pages:
+        run = _run(_PAGE_RUN, page)
+        rows.append({
+            "scenario": "Home (cold start)" if page == "Home" else f"Home, then {page}",
+            "seconds": round(run["home"] + run["page"], 3),
+            "heavy_modules": ", ".join(run["modules"]),
+            "errors": run["errors"],
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # Compare cold start times, from the repository root:
+    #   python dashboard/startup_report.py [--pages Home "RFM Analysis"]
+    parser = argparse.ArgumentParser(description="Report dashboard cold start timings")
+    parser.add_argument("--pages", nargs="*", default=list(PAGES))
+    args = parser.parse_args()
+    print(startup_report(args.pages).to_string(index=False))
@@ -0,0 +1,353 @@
+import argparse
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from ingest import ingest
+from schema import TABLE_FILES
+
+# Synthetic Olist datasets of any size for scale testing. learn_profile() reduces
+# the raw tables to the distributions that matter to the dashboard (orders per
+# customer, items per order, category and seller mix, prices, delays, payments,
+# review scores); generate() samples new customers, orders, items, payments and
+# reviews from it chunk by chunk and appends them to CSVs in the raw layout, so
+# memory use depends on the chunk size, not on the number of orders. Products,
+# sellers, the category translation and geolocation are copied as they are.
+
+# Tables written by the generator, in the column order of the raw CSVs
+COLUMNS = {
+    "customers": ["customer_id", "customer_unique_id", "customer_zip_code_prefix", "customer_city", "customer_state"],
+    "orders": [
+        "order_id", "customer_id", "order_status", "order_purchase_timestamp", "order_approved_at",
+        "order_delivered_carrier_date", "order_delivered_customer_date", "order_estimated_delivery_date",
+    ],
+    "order_items": [
+        "order_id", "order_item_id", "product_id", "seller_id", "shipping_limit_date", "price", "freight_value",
+    ],
+    "order_payments": ["order_id", "payment_sequential", "payment_type", "payment_installments", "payment_value"],
+    "order_reviews": [
+        "review_id", "order_id", "review_score", "review_comment_title", "review_comment_message",
+        "review_creation_date", "review_answer_timestamp",
+    ],
+}
+DIMENSION_TABLES = ["products", "product_category_name_translation", "sellers", "geolocation"]
+
+# Continuous distributions are kept as these quantiles and sampled by inverse CDF
+QUANTILES = np.linspace(0, 1, 101)
+
+DEFAULT_CHUNK_ORDERS = 200_000
+PROFILE_FILE = "synthetic_profile.json"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _frequencies(values):
+    """Discrete distribution of `values` as {"values": [...], "weights": [...]}."""
+    counts = pd.Series(values).dropna().value_counts(normalize=True, sort=False).sort_index()
+    return {"values": counts.index.tolist(), "weights": counts.to_numpy().tolist()}
+
+
+def _quantiles(values):
+    values = pd.Series(values, dtype="float64").dropna().to_numpy()
+    return np.quantile(values, QUANTILES).tolist() if len(values) else [0.0] * len(QUANTILES)
+
+
+def _seconds(later, earlier):
+    return (later - earlier).dt.total_seconds()
+
+
+def _present_by_status(orders_df, column):
+    return orders_df[column].notna().groupby(orders_df["order_status"], observed=True).mean().to_dict()
+
+
+def learn_profile(tables) -> dict:
+    """Distributions of the raw Olist tables (a dict of table name -> DataFrame), as JSON-ready data."""
+    orders_df = tables["orders"]
+    customers_df = tables["customers"]
+    items_df = tables["order_items"].merge(
+        tables["products"][["product_id", "product_category_name"]], on="product_id", how="left"
+    ).merge(tables["sellers"][["seller_id", "seller_state"]], on="seller_id", how="left")
+    items_df["product_category_name"] = items_df["product_category_name"].fillna("")
+    payments_df = tables["order_payments"]
+    reviews_df = tables["order_reviews"]
+
+    unique_ids = orders_df[["order_id", "customer_id"]].merge(customers_df, on="customer_id", how="left")
+    locations = customers_df.drop_duplicates("customer_unique_id").groupby(
+        ["customer_zip_code_prefix", "customer_city", "customer_state"], observed=True
+    ).size().reset_index(name="weight")
+
+    purchase = orders_df["order_purchase_timestamp"]
+    item_purchase = items_df[["order_id"]].merge(orders_df[["order_id", "order_purchase_timestamp"]], on="order_id", how="left")
+    reviewed = reviews_df.merge(orders_df[["order_id", "order_purchase_timestamp"]], on="order_id", how="left")
+    first_items = items_df.sort_values(["order_id", "order_item_id"])
+    repeated = first_items["order_id"].eq(first_items["order_id"].shift()) & first_items["product_id"].eq(
+        first_items["product_id"].shift()
+    )
+    lines_per_order = first_items.groupby("order_id").size()
+
+    return {
+        "orders_per_customer": _frequencies(unique_ids.groupby("customer_unique_id").size()),
+        "customer_locations": {
+            "zip_code_prefix": locations["customer_zip_code_prefix"].astype(str).tolist(),
+            "city": locations["customer_city"].astype(str).tolist(),
+            "state": locations["customer_state"].astype(str).tolist(),
+            "weights": (locations["weight"] / locations["weight"].sum()).tolist(),
+        },
+        "order_status": _frequencies(orders_df["order_status"].astype(str)),
+        "purchase_month": _frequencies(purchase.dt.strftime("%Y-%m")),
+        "approved_present": _present_by_status(orders_df, "order_approved_at"),
+        "carrier_present": _present_by_status(orders_df, "order_delivered_carrier_date"),
+        "delivered_present": _present_by_status(orders_df, "order_delivered_customer_date"),
+        "approval_seconds": _quantiles(_seconds(orders_df["order_approved_at"], purchase)),
+        "carrier_seconds": _quantiles(_seconds(orders_df["order_delivered_carrier_date"], orders_df["order_approved_at"])),
+        "delivery_seconds": _quantiles(
+            _seconds(orders_df["order_delivered_customer_date"], orders_df["order_delivered_carrier_date"])
+        ),
+        "estimated_days": _quantiles((orders_df["order_estimated_delivery_date"] - purchase.dt.normalize()).dt.days),
+        "items_per_order": _frequencies(lines_per_order),
+        "repeat_item": float(repeated.sum() / max(len(first_items) - len(lines_per_order), 1)),
+        "category": _frequencies(items_df["product_category_name"]),
+        "seller_state": _frequencies(items_df["seller_state"].astype(str)),
+        "price": {
+            category: _quantiles(group["price"])
+            for category, group in items_df.groupby("product_category_name")
+        },
+        "freight_value": {
+            category: _quantiles(group["freight_value"])
+            for category, group in items_df.groupby("product_category_name")
+        },
+        "shipping_limit_seconds": _quantiles(
+            _seconds(items_df["shipping_limit_date"], item_purchase["order_purchase_timestamp"])
+        ),
+        "payments_per_order": _frequencies(payments_df.groupby("order_id").size()),
+        "payment_type": _frequencies(payments_df["payment_type"].astype(str)),
+        "installments": {
+            payment_type: _frequencies(group["payment_installments"].astype(int))
+            for payment_type, group in payments_df.groupby(payments_df["payment_type"].astype(str))
+        },
+        "review_rate": float(reviews_df["order_id"].nunique() / max(len(orders_df), 1)),
+        "review_score": _frequencies(reviews_df["review_score"].dropna().astype(int)),
+        "review_days": _quantiles(
+            (reviewed["review_creation_date"] - reviewed["order_purchase_timestamp"].dt.normalize()).dt.days
+        ),
+        "answer_seconds": _quantiles(_seconds(reviews_df["review_answer_timestamp"], reviews_df["review_creation_date"])),
+    }
+
+
+class _Sampler:
+    """Vectorized draws from a profile, with the dimension tables as lookup arrays."""
+
+    def __init__(self, profile, products_df, sellers_df, rng):
+        self.profile = profile
+        self.rng = rng
+        locations = profile["customer_locations"]
+        self.locations = {key: np.asarray(values) for key, values in locations.items() if key != "weights"}
+        self.location_weights = np.asarray(locations["weights"])
+
+        categories = products_df["product_category_name"].fillna("").astype(str)
+        self.products = {
+            category: group["product_id"].astype(str).to_numpy()
+            for category, group in products_df.assign(category=categories).groupby("category")
+        }
+        states = sellers_df["seller_state"].astype(str)
+        self.sellers = {
+            state: group["seller_id"].astype(str).to_numpy()
+            for state, group in sellers_df.assign(state=states).groupby("state")
+        }
+
+    def choice(self, distribution, n):
+        weights = np.asarray(distribution["weights"], dtype="float64")
+        return np.asarray(distribution["values"])[self.rng.choice(len(weights), n, p=weights / weights.sum())]
+
+    def quantile(self, quantiles, n):
+        return np.interp(self.rng.random(n), QUANTILES, quantiles)
+
+    def ids(self, n):
+        # 32 character hex IDs like the Olist ones
+        return np.frombuffer(self.rng.bytes(16 * n).hex().encode(), dtype="S32").astype(str)
+
+    def pick(self, groups, keys):
+        """One random member of groups[key] for every key (keys without a group pick from all)."""
+        picked = np.empty(len(keys), dtype=object)
+        for key in np.unique(keys):
+            members = groups[key] if key in groups else np.concatenate(list(groups.values()))
+            where = np.flatnonzero(keys == key)
+            picked[where] = members[self.rng.integers(0, len(members), len(where))]
+        return picked
+
+    def by_group(self, table, keys):
+        """One quantile draw per element of `keys` from table[key]."""
+        values = np.empty(len(keys))
+        for key in np.unique(keys):
+            where = np.flatnonzero(keys == key)
+            values[where] = self.quantile(table[key], len(where))
+        return values
+
+
+def _timestamps(seconds):
+    return pd.to_datetime(np.round(seconds).astype("int64"), unit="s")
+
+
+def _generate_chunk(sampler, n_orders) -> dict:
+    """Customers, orders, items, payments and reviews of about `n_orders` new orders."""
+    profile, rng = sampler.profile, sampler.rng
+
+    # Unique customers and their orders (every order has its own customer_id, like Olist)
+    orders_per_customer = sampler.choice(profile["orders_per_customer"], n_orders).astype("int64")
+    n_customers = int(np.searchsorted(np.cumsum(orders_per_customer), n_orders)) + 1
+    orders_per_customer = orders_per_customer[:n_customers]
+    orders_per_customer[-1] -= orders_per_customer.sum() - n_orders
+    unique_ids = sampler.ids(n_customers)
+    location = rng.choice(len(sampler.location_weights), n_customers, p=sampler.location_weights)
+    owner = np.repeat(np.arange(n_customers), orders_per_customer)
+    customer_ids = sampler.ids(n_orders)
+    customers = pd.DataFrame({
+        "customer_id": customer_ids,
+        "customer_unique_id": unique_ids[owner],
+        "customer_zip_code_prefix": np.char.zfill(sampler.locations["zip_code_prefix"][location[owner]], 5),
+        "customer_city": sampler.locations["city"][location[owner]],
+        "customer_state": sampler.locations["state"][location[owner]],
+    })
+
+    # Orders: purchase time within a sampled month, then the delays of each step
+    order_ids = sampler.ids(n_orders)
+    status = sampler.choice(profile["order_status"], n_orders)
+    months = sampler.choice(profile["purchase_month"], n_orders).astype("datetime64[M]")
+    month_seconds = ((months + 1).astype("datetime64[s]") - months.astype("datetime64[s]")).astype("int64")
+    purchase = months.astype("datetime64[s]").astype("int64") + rng.random(n_orders) * month_seconds
+    approved = purchase + sampler.quantile(profile["approval_seconds"], n_orders)
+    carrier = approved + sampler.quantile(profile["carrier_seconds"], n_orders)
+    delivered = carrier + sampler.quantile(profile["delivery_seconds"], n_orders)
+    purchase_day = np.floor(purchase / 86400) * 86400
+    estimated = purchase_day + np.round(sampler.quantile(profile["estimated_days"], n_orders)) * 86400
+
+    def present(name):
+        rates = profile[name]
+        return rng.random(n_orders) < np.array([rates.get(s, 0.0) for s in status])
+
+    orders = pd.DataFrame({
+        "order_id": order_ids,
+        "customer_id": customer_ids,
+        "order_status": status,
+        "order_purchase_timestamp": _timestamps(purchase),
+        "order_approved_at": _timestamps(approved).where(present("approved_present")),
+        "order_delivered_carrier_date": _timestamps(carrier).where(present("carrier_present")),
+        "order_delivered_customer_date": _timestamps(delivered).where(present("delivered_present")),
+        "order_estimated_delivery_date": _timestamps(estimated),
+    })
+
+    # Items: category mix, then a product of that category and a seller of a sampled
+    # state; a repeated item is the same product (and seller and price) again
+    lines = sampler.choice(profile["items_per_order"], n_orders).astype("int64")
+    item_order = np.repeat(np.arange(n_orders), lines)
+    item_number = np.arange(len(item_order)) - np.repeat(np.cumsum(lines) - lines, lines) + 1
+    category = sampler.choice(profile["category"], len(item_order)).astype(str)
+    items = pd.DataFrame({
+        "category": category,
+        "product_id": sampler.pick(sampler.products, category),
+        "seller_id": sampler.pick(sampler.sellers, sampler.choice(profile["seller_state"], len(item_order)).astype(str)),
+        "price": np.round(sampler.by_group(profile["price"], category), 2),
+        "freight_value": np.round(sampler.by_group(profile["freight_value"], category), 2),
+    })
+    repeat = (item_number > 1) & (rng.random(len(item_order)) < profile["repeat_item"])
+    source = np.maximum.accumulate(np.where(repeat, 0, np.arange(len(item_order))))
+    items = items.iloc[source].drop(columns="category").reset_index(drop=True)
+    items.insert(0, "order_id", order_ids[item_order])
+    items.insert(1, "order_item_id", item_number)
+    items["shipping_limit_date"] = _timestamps(
+        purchase[item_order] + sampler.quantile(profile["shipping_limit_seconds"], len(item_order))
+    )
+
+    # Payments: split the order total over the sampled number of payments
+    totals = np.bincount(item_order, weights=items["price"] + items["freight_value"], minlength=n_orders)
+    n_payments = sampler.choice(profile["payments_per_order"], n_orders).astype("int64")
+    payment_order = np.repeat(np.arange(n_orders), n_payments)
+    shares = rng.exponential(size=len(payment_order))
+    shares /= np.bincount(payment_order, weights=shares, minlength=n_orders)[payment_order]
+    payment_type = sampler.choice(profile["payment_type"], len(payment_order)).astype(str)
+    installments = np.ones(len(payment_order), dtype="int64")
+    for kind, distribution in profile["installments"].items():
+        where = np.flatnonzero(payment_type == kind)
+        installments[where] = sampler.choice(distribution, len(where))
+    payments = pd.DataFrame({
+        "order_id": order_ids[payment_order],
+        "payment_sequential": np.arange(len(payment_order)) - np.repeat(np.cumsum(n_payments) - n_payments, n_payments) + 1,
+        "payment_type": payment_type,
+        "payment_installments": installments,
+        "payment_value": np.round(totals[payment_order] * shares, 2),
+    })
+
+    # Reviews (comments are left empty)
+    reviewed = np.flatnonzero(rng.random(n_orders) < profile["review_rate"])
+    created = purchase_day[reviewed] + np.round(sampler.quantile(profile["review_days"], len(reviewed))) * 86400
+    reviews = pd.DataFrame({
+        "review_id": sampler.ids(len(reviewed)),
+        "order_id": order_ids[reviewed],
+        "review_score": sampler.choice(profile["review_score"], len(reviewed)),
+        "review_comment_title": None,
+        "review_comment_message": None,
+        "review_creation_date": _timestamps(created),
+        "review_answer_timestamp": _timestamps(created + sampler.quantile(profile["answer_seconds"], len(reviewed))),
+    })
+    return {"customers": customers, "orders": orders, "order_items": items, "order_payments": payments,
+            "order_reviews": reviews}
+
+
+def generate(profile, data_dir, out_dir, n_orders, chunk_orders=DEFAULT_CHUNK_ORDERS, seed=0, log=print):
+    """Write a synthetic dataset of `n_orders` orders to `out_dir`, one chunk at a time.
+
+    The dimension tables are copied from `data_dir`. Returns the number of rows
+    written per table.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    for table in DIMENSION_TABLES:
+        shutil.copyfile(os.path.join(data_dir, TABLE_FILES[table]), os.path.join(out_dir, TABLE_FILES[table]))
+    products_df = pd.read_csv(os.path.join(data_dir, TABLE_FILES["products"]), usecols=["product_id", "product_category_name"])
+    sellers_df = pd.read_csv(os.path.join(data_dir, TABLE_FILES["sellers"]), usecols=["seller_id", "seller_state"])
+    sampler = _Sampler(profile, products_df, sellers_df, np.random.default_rng(seed))
+
+    rows = dict.fromkeys(COLUMNS, 0)
+    for start in range(0, n_orders, chunk_orders):
+        chunk = _generate_chunk(sampler, min(chunk_orders, n_orders - start))
+        for table, df in chunk.items():
+            df[COLUMNS[table]].to_csv(
+                os.path.join(out_dir, TABLE_FILES[table]),
+                mode="w" if start == 0 else "a",
+                header=start == 0,
+                index=False,
+                date_format=TIMESTAMP_FORMAT,
+            )
+            rows[table] += len(df)
+        log(f"{start + len(chunk['orders']):,} orders written ({time.perf_counter() - started:.1f}s)")
+    return rows
+
+
+if __name__ == "__main__":
+    # Generate 10 million orders shaped like the data in data/:
+    #   python dashboard/synthetic.py --orders 10000000 --out data_10m
+    # The learned profile is saved next to the output and can be reused with --profile.
+    parser = argparse.ArgumentParser(description="Generate a synthetic Olist dataset of any size")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--orders", type=int, required=True)
+    parser.add_argument("--chunk-orders", type=int, default=DEFAULT_CHUNK_ORDERS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--profile", help="profile saved by an earlier run, instead of learning it again")
+    args = parser.parse_args()
+
+    if args.profile:
+        with open(args.profile) as f:
+            profile = json.load(f)
+    else:
+        frames, _ = ingest(args.data_dir)
+        profile = learn_profile(frames)
+        del frames
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, PROFILE_FILE), "w") as f:
+        json.dump(profile, f)
+    rows = generate(profile, args.data_dir, args.out, args.orders, args.chunk_orders, args.seed)
+    print(", ".join(f"{table}: {count:,} rows" for table, count in rows.items()))
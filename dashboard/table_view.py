@@ -0,0 +1,95 @@
+import tempfile
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import data_version, load_all_data
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Rows encoded per step of the CSV export
+EXPORT_CHUNKSIZE = 50_000
+# Size up to which the CSV export is buffered in memory before going to disk
+EXPORT_SPOOL_BYTES = 16 * 1024 * 1024
+
+
+def search_positions(values, text):
+    """Sorted positions of the values containing `text` (case-insensitive)."""
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Match each category once, then select rows by code
+        categories = pd.Series(values.cat.categories.astype(str))
+        matching = np.flatnonzero(categories.str.contains(text, case=False, regex=False).to_numpy())
+        return np.flatnonzero(np.isin(values.cat.codes.to_numpy(), matching))
+    matches = values.astype("string").str.contains(text, case=False, regex=False)
+    return np.flatnonzero(matches.fillna(False).to_numpy(dtype=bool))
+
+
+def sort_order(values, ascending=True):
+    """Positions that sort `values` (stable, missing values last)."""
+    values = pd.Series(values).reset_index(drop=True)
+    return values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+def restrict(order, positions, size):
+    """Entries of `order` that are in `positions`, keeping the order of `order`."""
+    keep = np.zeros(size, dtype=bool)
+    keep[positions] = True
+    return order[keep[order]]
+
+
+def csv_chunks(df, positions, columns, chunksize=EXPORT_CHUNKSIZE):
+    """UTF-8 CSV of the rows `positions` of `df` (only `columns`), yielded chunk by chunk."""
+    # Only the exported columns of each chunk's rows are copied
+    column_positions = df.columns.get_indexer(columns)
+    for start in range(0, max(len(positions), 1), chunksize):
+        chunk = df.iloc[positions[start:start + chunksize], column_positions]
+        yield chunk.to_csv(header=start == 0, index=False).encode("utf-8")
+
+
+def write_csv(df, positions, columns, out, chunksize=EXPORT_CHUNKSIZE):
+    """Write the rows `positions` of `df` (only `columns`) to the binary stream `out` in chunks."""
+    for data in csv_chunks(df, positions, columns, chunksize):
+        out.write(data)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _search(version, column, text):
+    return search_positions(load_all_data(columns=[column])[column], text)
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _sort(version, column, ascending):
+    return sort_order(load_all_data(columns=[column])[column], ascending)
+
+
+def view_positions(n_rows, base=None, search=None, sort=None):
+    """Row positions of the dataset view, in display order.
+
+    `base` are the rows allowed by the global filters (None: all rows),
+    `search` is (column, text) and `sort` is (column, ascending). Searches and
+    sort orders of the whole table are cached per data version, so changing
+    page only slices this array.
+    """
+    version = data_version()
+    positions = np.arange(n_rows) if base is None else np.asarray(base)
+    if search and search[1]:
+        matches = _search(version, *search)
+        positions = positions[np.isin(positions, matches, assume_unique=True)]
+    if sort:
+        positions = restrict(_sort(version, *sort), positions, n_rows)
+    return positions
+
+
+def csv_export(df, positions, columns) -> bytes:
+    """CSV bytes of the view.
+
+    Chunks are written to a spooled temporary file (moved to disk past
+    EXPORT_SPOOL_BYTES), so the returned bytes, which st.download_button keeps
+    anyway, are the only full copy of the CSV in memory.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as out:
+        write_csv(df, positions, columns, out)
+        out.seek(0)
+        return out.read()
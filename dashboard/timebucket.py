@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+# Granularities offered in the dashboard and the x-axis tick format of each
+GRANULARITIES = {
+    "Day": "%d %b %Y",
+    "Week": "%d %b %Y",
+    "Month": "%b %Y",
+    "Quarter": "%b %Y",
+}
+
+
+def period_starts(timestamps, granularity="Month"):
+    """Start of the day, week (Monday), month or quarter of every timestamp.
+
+    Works on the integer datetime64 representation, so no strings are built.
+    Returns a datetime64[ns] array; NaT stays NaT.
+    """
+    values = np.asarray(timestamps, dtype="datetime64[ns]")
+    if granularity == "Day":
+        starts = values.astype("datetime64[D]")
+    elif granularity == "Week":
+        days = values.astype("datetime64[D]")
+        # Day 0 (1970-01-01) is a Thursday, so Monday is 3 days before it
+        starts = days - ((days.view("int64") + 3) % 7).astype("timedelta64[D]")
+    elif granularity == "Month":
+        starts = values.astype("datetime64[M]")
+    elif granularity == "Quarter":
+        months = values.astype("datetime64[M]")
+        # Month 0 is January 1970, so quarters start at multiples of 3
+        starts = months - (months.view("int64") % 3).astype("timedelta64[M]")
+    else:
+        raise ValueError(f"Unknown granularity {granularity!r}, expected one of {list(GRANULARITIES)}")
+    return starts.astype("datetime64[ns]")
+
+
+def count_unique_per_period(df, time_column, key_column, granularity="Month") -> pd.DataFrame:
+    """Number of distinct `key_column` values per period of `time_column`, in time order."""
+    period = pd.Series(period_starts(df[time_column], granularity), index=df.index, name="period")
+    return df.groupby(period)[key_column].nunique().reset_index()
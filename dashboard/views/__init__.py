@@ -0,0 +1,22 @@
+# One module per dashboard page. Each module declares the tables it reads (DATA),
+# whether it applies the global sidebar filters (FILTERS) and a render(filters)
+# function. script.py only imports the module of the selected page, so a page's
+# plotting libraries and data are loaded the first time it is visited.
+
+# Navigation option -> page module
+PAGES = {
+    "Home": "home",
+    "Dataset": "dataset",
+    "Customer Analysis": "customer_analysis",
+    "Geolocation Analysis": "geolocation_analysis",
+    "Payment Method Analysis": "payment_analysis",
+    "Review Analysis": "review_analysis",
+    "Order Analysis": "order_analysis",
+    "Products Analysis": "products_analysis",
+    "Market Basket Analysis": "basket_analysis",
+    "Delivery Performance": "delivery_performance",
+    "Delivery Distance Analysis": "delivery_distance",
+    "Seller Performance": "seller_performance",
+    "RFM Analysis": "rfm_analysis",
+    "Cohort Retention": "cohort_analysis",
+}
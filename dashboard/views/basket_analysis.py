@@ -0,0 +1,109 @@
+import streamlit as st
+import plotly.express as px
+
+from baskets import PAIR_METRICS, load_basket_stats
+from charts import figure_key, plotly_chart
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+# Display format of the pair columns
+PAIR_FORMATS = {
+    "support": "{:.3%}",
+    "confidence_a_to_b": "{:.1%}",
+    "confidence_b_to_a": "{:.1%}",
+    "lift": "{:.2f}",
+}
+
+
+def top_pairs_figure(pairs_df, metric):
+    fig = px.bar(
+        pairs_df.assign(pair=pairs_df["category_a"] + " + " + pairs_df["category_b"]),
+        x=metric,
+        y="pair",
+        orientation="h",
+        hover_data=["orders", "support", "confidence_a_to_b", "confidence_b_to_a", "lift"],
+        labels={"pair": "Category Pair", metric: PAIR_METRICS[metric]},
+        color=metric,
+        color_continuous_scale=px.colors.sequential.Purples,
+    )
+    fig.update_layout(yaxis={"categoryorder": "total ascending"}, height=max(400, 28 * len(pairs_df)))
+    return fig
+
+
+def repeat_rate_figure(repeat_df):
+    fig = px.bar(
+        repeat_df,
+        x="category",
+        y="repeat_rate",
+        hover_data=["customers", "repeat_customers"],
+        labels={"category": "Product Category", "repeat_rate": "Customers Buying Again"},
+        color="repeat_rate",
+        color_continuous_scale=px.colors.sequential.Greens,
+    )
+    fig.update_layout(yaxis_tickformat=".0%", xaxis_tickangle=-45)
+    return fig
+
+
+def render(filters):
+    st.title("Market Basket Analysis 🧺")
+    st.write("""This page looks at the product categories bought together in one order, and at the categories
+             customers come back to in later orders.""")
+    st.write("")
+
+    # Matriks pesanan x kategori dibangun sekali per versi data dan filter
+    basket_stats = load_basket_stats(filters)
+    mark("load", "basket stats")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Orders", f"{basket_stats.n_orders:,}")
+    col2.metric("Orders with 2+ Categories", f"{basket_stats.n_multi_category_orders:,}")
+    col3.metric(
+        "Share of Orders with 2+ Categories",
+        f"{basket_stats.n_multi_category_orders / basket_stats.n_orders:.1%}" if basket_stats.n_orders else "-",
+    )
+
+    st.markdown("### 💡Categories Bought Together")
+    col1, col2, col3 = st.columns(3)
+    label = col1.selectbox("Rank pairs by", list(PAIR_METRICS.values()))
+    metric = next(column for column, metric_label in PAIR_METRICS.items() if metric_label == label)
+    k = col2.slider("Number of pairs", min_value=5, max_value=50, value=15, step=5)
+    min_orders = col3.number_input("Minimum orders per pair", min_value=1, value=5, step=1)
+
+    pairs_df = basket_stats.top_pairs(metric, k, min_orders)
+    mark("aggregate", "top pairs")
+    if pairs_df.empty:
+        st.info("No category pair reaches the minimum number of orders.")
+    else:
+        plotly_chart(top_pairs_figure, pairs_df, metric, key=figure_key(DATA, filters, metric, k, min_orders))
+        mark("chart", "top pairs")
+        st.dataframe(
+            pairs_df.drop(columns="confidence").style.format(PAIR_FORMATS),
+            hide_index=True,
+        )
+        mark("table", "top pairs")
+
+    st.markdown("### 💡Categories Customers Buy Again")
+    summary = basket_stats.repeat_summary()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Customers", f"{summary['customers']:,}")
+    col2.metric("Customers with 2+ Orders", f"{summary['multi_order_customers']:,}")
+    col3.metric("Bought a Category Again", f"{summary['same_category_customers']:,}")
+
+    min_customers = st.number_input("Minimum customers per category", min_value=1, value=50, step=10)
+    repeat_df = basket_stats.category_repeat(min_customers).head(20)
+    mark("aggregate", "category repeat")
+    plotly_chart(repeat_rate_figure, repeat_df, key=figure_key(DATA, filters, min_customers))
+    mark("chart", "category repeat")
+
+    with st.expander("See explanation"):
+        st.write("""
+        - **Support**: share of all orders holding both categories.
+        - **Confidence A → B**: share of the orders with category A that also hold category B (and B → A the other way round).
+        - **Lift**: how many times more often the two categories are bought together than if they were bought independently; above 1 they attract each other.
+        - Pairs seen in a handful of orders can reach a very high lift by chance, which is what the minimum number of orders guards against.
+        - A customer buys a category again when two or more of their orders (by `customer_unique_id`) hold it.
+        """)
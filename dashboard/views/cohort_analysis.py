@@ -0,0 +1,94 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from cohorts import load_cohort_matrix
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def cohort_heatmap_figure(values, show):
+    fig = px.imshow(
+        values,
+        text_auto=".0%" if show == "Retention" else ",.0f",
+        aspect="auto",
+        color_continuous_scale=px.colors.sequential.Blues,
+        labels={"x": "Months after the First Purchase", "y": "Cohort (Month of First Purchase)", "color": show},
+    )
+    fig.update_xaxes(side="top", dtick=1)
+    fig.update_layout(height=max(400, 24 * len(values)))
+    return fig
+
+
+def average_retention_figure(curve):
+    fig = px.line(
+        curve,
+        x="months_since_first_purchase",
+        y="retention",
+        hover_data=["cohorts"],
+        labels={"months_since_first_purchase": "Months after the First Purchase", "retention": "Customers Buying Again", "cohorts": "Cohorts"},
+        markers=True,
+    )
+    fig.update_layout(yaxis_tickformat=".1%")
+    return fig
+
+
+def render(filters):
+    st.title("Customer Cohort Retention 🔁")
+    st.write("""Customers are grouped into cohorts by the month of their first purchase. Each cell shows the share
+             of a cohort (or the number of its customers) that bought again a given number of months later.""")
+    st.write("")
+
+    # Matriks kohort dihitung sekali per versi data dan filter
+    cohort_matrix = load_cohort_matrix(filters)
+    mark("load", "cohort matrix")
+    if cohort_matrix.counts.empty:
+        st.info("No purchases match the current filters.")
+        return
+
+    retention_df = cohort_matrix.retention()
+    curve_df = cohort_matrix.average_retention()
+    mark("aggregate", "retention")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Customers", f"{cohort_matrix.sizes.sum():,}")
+    col2.metric("Cohorts", f"{len(cohort_matrix.counts):,}")
+    month_1 = curve_df["retention"].iloc[1] if len(curve_df) > 1 else None
+    col3.metric("Buying Again the Next Month", f"{month_1:.1%}" if month_1 is not None else "-")
+
+    max_period = len(cohort_matrix.counts.columns) - 1
+    if max_period < 1:
+        st.info("The data covers a single month, so there is no retention to show yet.")
+        return
+    col1, col2 = st.columns(2)
+    months = col1.slider("Months after the first purchase", 1, max_period, min(12, max_period)) if max_period > 1 else 1
+    show = col2.radio("Show", ["Retention", "Customers"], horizontal=True)
+
+    st.markdown("### 💡Retention by Cohort")
+    values = (retention_df if show == "Retention" else cohort_matrix.counts).loc[:, 1:months]
+    plotly_chart(cohort_heatmap_figure, values, show, key=figure_key(DATA, filters, months, show))
+    mark("chart", "cohort heatmap")
+
+    st.markdown("### 💡Average Retention Curve")
+    plotly_chart(average_retention_figure, curve_df.iloc[1:months + 1], key=figure_key(DATA, filters, months))
+    mark("chart", "average retention")
+
+    st.markdown("### 💡Cohort Sizes")
+    st.dataframe(
+        cohort_matrix.counts.loc[:, :months].rename(columns=lambda m: f"month {m}" if m else "new customers").style.format("{:,.0f}", na_rep=""),
+        width=800,
+    )
+    mark("table", "cohort counts")
+
+    with st.expander("See explanation"):
+        st.write("""
+        - Customers are identified by `customer_unique_id`, so the orders of one person count together.
+        - A customer is counted once per month with at least one purchase; month 0 is the cohort month itself.
+        - Empty cells lie after the last month of the data and cannot be observed yet.
+        - The average curve weighs every cohort by its size and only uses cohorts old enough for that month.
+        - With the sidebar filters, only the matching purchases count, so a customer's cohort is their first matching purchase.
+        """)
@@ -0,0 +1,102 @@
+import streamlit as st
+import plotly.graph_objects as go
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from cube import load_aggregate
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def top_cities_figure(top_customer_df):
+    # Membuat bar chart untuk pelanggan teratas berdasarkan kota dengan Plotly Express
+    fig = px.bar(top_customer_df.head(10), x='customer_city', y='unique_customers',
+                labels={'customer_city': 'City', 'unique_customers': 'Number of Unique Customers'},
+                color='unique_customers', color_continuous_scale=px.colors.sequential.Blues)
+    return fig
+
+
+def customers_by_state_figure(customer_counts_by_state):
+    # Membuat bar chart untuk distribusi pelanggan unik berdasarkan negara bagian dengan Plotly Graph Objects
+    fig = go.Figure(data=[
+        go.Bar(
+            x=customer_counts_by_state['customer_state'],
+            y=customer_counts_by_state['customer_unique_id'],
+            marker=dict(
+                color=customer_counts_by_state['customer_unique_id'],
+                colorscale='Blues',  # Menggunakan palet warna 'Blues'
+            )
+        )
+    ])
+
+    fig.update_layout(
+        xaxis_title="State",
+        yaxis_title="Number of Unique Customers",
+        xaxis_tickangle=-45  # Memutar label sumbu x agar tidak tumpang tindih
+    )
+    return fig
+
+
+def render(filters):
+    st.title("Customer Analysis 👤")
+    st.write("""Customer analysis based on city and state involves examining customer data
+              to understand purchasing behavior, preferences, and trends within different geographical regions.
+              This analysis can provide valuable insights for tailoring marketing strategies, optimizing inventory management, 
+             and improving overall customer satisfaction<br><br>""", unsafe_allow_html=True)
+    
+    st.markdown("### 📍Top Customers by City")
+
+    # Jumlah pelanggan unik per kota (dari cube agregat)
+    top_customer_df = load_aggregate("customers_by_city", filters)
+    mark("aggregate", "customers_by_city")
+
+    # Menampilkan plot di Streamlit
+    plotly_chart(top_cities_figure, top_customer_df, key=figure_key(DATA, filters))
+    mark("chart", "top customers by city")
+
+    with st.expander("See explanation"):
+        st.write(
+            """
+            The data represents the number of unique customers in various cities, sorted in descending order. Here’s a brief explanation of the top 10 cities based on unique customer counts:
+
+            1. **Sao Paulo**: 15,540 unique customers. The largest city in the dataset with the highest number of customers.
+            2. **Rio de Janeiro**: 6,882 unique customers. The second-largest city with a significant customer base.
+            3. **Belo Horizonte**: 2,773 unique customers. A major city with a notable number of customers.
+            4. **Brasilia**: 2,131 unique customers. The capital city with a strong customer presence.
+            5. **Curitiba**: 1,521 unique customers. A large city with a substantial customer count.
+
+            Cities further down in the top 10 would continue in decreasing order of unique customers. The data is sorted to highlight these top cities, showcasing where the largest customer bases are located.
+            """
+        )
+    
+    # Jumlah pelanggan unik per negara bagian (dari cube agregat)
+    customer_counts_by_state = load_aggregate("customers_by_state", filters)
+    mark("aggregate", "customers_by_state")
+
+    st.markdown("### <br><br>📍Number of Unique Customers by State", unsafe_allow_html=True)
+
+    # Menampilkan plot di Streamlit
+    plotly_chart(customers_by_state_figure, customer_counts_by_state, key=figure_key(DATA, filters))
+    mark("chart", "unique customers by state")
+    with st.expander("See explanation"):
+        st.write(
+            """
+            Here's a more detailed explanation of the data:
+
+            - **São Paulo (SP)**: With 40,302 unique customers, São Paulo has the highest customer count, indicating it is a major market with significant customer activity.
+            - **Rio de Janeiro (RJ)**: This state follows with 12,384 unique customers, showing it also has a substantial customer base, though less than São Paulo.
+            - **Minas Gerais (MG)**: With 11,259 unique customers, Minas Gerais ranks third, reflecting a strong customer presence.
+
+            The rest of the states have progressively fewer customers, with states like Acre (AC) having the smallest count of 77 unique customers. 
+
+            **Observations:**
+            - **Major Markets**: States like São Paulo, Rio de Janeiro, and Minas Gerais are key markets with the highest number of customers.
+            - **Smaller Markets**: States such as Acre and Amapá have much smaller customer bases.
+
+            This distribution can help businesses understand where their customer base is concentrated and potentially strategize targeted marketing or resource allocation based on regional customer density.
+            """
+        )
@@ -0,0 +1,64 @@
+import streamlit as st
+import pandas as pd
+
+from data_loader import load_all_data
+from filters import selected_rows
+from instrument import mark
+from table_view import PAGE_SIZES, csv_export, view_positions
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def render(filters):
+    st.title("Dataset 📂")
+    st.markdown("#### This page is for viewing the dataset <br><br>", unsafe_allow_html=True)  
+    try:
+        # Shared table; only the rows of the current page are sent to the browser
+        all_df = load_all_data()
+        mark("load", "all_data")
+        st.write("Dataset loaded successfully! ✨")
+
+        columns = st.multiselect("Columns", list(all_df.columns), default=list(all_df.columns))
+        columns = columns or list(all_df.columns)
+        col1, col2 = st.columns(2)
+        search_column = col1.selectbox("Search in", columns)
+        search_text = col2.text_input("Search text")
+        col1, col2 = st.columns(2)
+        sort_column = col1.selectbox("Sort by", ["(file order)"] + columns)
+        ascending = col2.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+
+        positions = view_positions(
+            len(all_df),
+            base=selected_rows(filters),
+            search=(search_column, search_text.strip()),
+            sort=None if sort_column == "(file order)" else (sort_column, ascending),
+        )
+        mark("aggregate", "view positions")
+
+        col1, col2 = st.columns(2)
+        page_size = col1.selectbox("Rows per page", PAGE_SIZES, index=1)
+        n_pages = max(1, -(-len(positions) // page_size))
+        page_number = col2.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1)
+        start = (page_number - 1) * page_size
+        page_positions = positions[start:start + page_size]
+        st.dataframe(all_df.iloc[page_positions][columns], hide_index=True)
+        mark("table", "dataset page")
+        st.caption(f"Rows {min(start + 1, len(positions)):,}–{start + len(page_positions):,} of {len(positions):,}")
+
+        # The CSV is only built on request, chunk by chunk
+        if st.button("Prepare CSV export"):
+            st.download_button(
+                "Download CSV", csv_export(all_df, positions, columns),
+                file_name="all_data_view.csv", mime="text/csv",
+            )
+    except FileNotFoundError:
+        st.error("File not found. Please check the file path.")
+    except pd.errors.EmptyDataError:
+        st.error("File is empty. Please check the file content.")
+    except pd.errors.ParserError:
+        st.error("File is corrupt or not a CSV. Please check the file format.")
+    except Exception as e:
+        st.error(f"An error occurred: {e}")
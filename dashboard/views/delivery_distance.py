@@ -0,0 +1,99 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import MAX_POINTS, downsample, figure_key, plotly_chart
+from distance import distance_bands, load_order_distances
+from filters import selected_rows
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data", "sellers", "geolocation"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def shipping_time_figure(bands_df):
+    fig = px.bar(
+        bands_df,
+        x="distance_band",
+        y="median_shipping_days",
+        labels={"distance_band": "Distance", "median_shipping_days": "Median Shipping Days"},
+        hover_data=["order_lines"],
+        color="median_shipping_days",
+        color_continuous_scale=px.colors.sequential.Blues,
+    )
+    return fig
+
+
+def freight_value_figure(bands_df):
+    fig = px.bar(
+        bands_df,
+        x="distance_band",
+        y="mean_freight_value",
+        labels={"distance_band": "Distance", "mean_freight_value": "Average Freight Value"},
+        hover_data=["order_lines"],
+        color="mean_freight_value",
+        color_continuous_scale=px.colors.sequential.Oranges,
+    )
+    return fig
+
+
+def distance_scatter_figure(known_df, max_points=MAX_POINTS):
+    sample_df = downsample(known_df, "distance_km", "shipping_days", max_points)
+    fig = px.scatter(
+        sample_df,
+        x="distance_km",
+        y="shipping_days",
+        color="freight_value",
+        labels={"distance_km": "Distance (km)", "shipping_days": "Shipping Days", "freight_value": "Freight Value"},
+        render_mode="webgl",
+        opacity=0.5,
+    )
+    return fig
+
+
+def render(filters):
+    st.title("Delivery Distance Analysis 🚚")
+    st.write("""This page shows the great-circle distance between the seller and the customer of every order line,
+             computed from the centroid of their ZIP code prefixes, and how it relates to shipping time and freight value.""")
+    st.write("")
+
+    # Jarak per baris pesanan (dihitung sekali per versi data)
+    distances_df = load_order_distances()
+    mark("load", "order distances")
+    rows = selected_rows(filters)
+    if rows is not None:
+        distances_df = distances_df.take(rows)
+    known_df = distances_df.dropna(subset=["distance_km"])
+    if known_df.empty:
+        st.info("No order line matching the current filters has a known distance.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Median Distance", f"{known_df['distance_km'].median():,.0f} km")
+    col2.metric("Distance vs Shipping Days (corr)", f"{known_df['distance_km'].corr(known_df['shipping_days']):.2f}")
+    col3.metric("Distance vs Freight (corr)", f"{known_df['distance_km'].corr(known_df['freight_value']):.2f}")
+
+    bands_df = distance_bands(known_df)
+    mark("aggregate", "distance bands")
+    key = figure_key(DATA, filters)
+
+    st.markdown("### 💡Shipping Time by Distance")
+    plotly_chart(shipping_time_figure, bands_df, key=key)
+    mark("chart", "shipping time by distance")
+
+    st.markdown("### 💡Freight Value by Distance")
+    plotly_chart(freight_value_figure, bands_df, key=key)
+    mark("chart", "freight value by distance")
+
+    # Scatter dari sampel (LTTB) agar grafik tetap ringan; titik ekstrem tetap tampil
+    st.markdown("### 💡Distance vs Shipping Days (sample)")
+    plotly_chart(distance_scatter_figure, known_df, key=key)
+    mark("chart", "distance vs shipping days")
+
+    with st.expander("See explanation"):
+        st.write("""
+        - Distance is measured between the average coordinates of the seller's and the customer's ZIP code prefixes, so it is an approximation of the real route.
+        - Order lines whose ZIP code prefix is missing from the geolocation data are left out.
+        - Shipping days are counted from the purchase to the delivery to the customer.
+        """)
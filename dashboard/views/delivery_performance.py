@@ -0,0 +1,114 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import MAX_POINTS, downsample, figure_key, plotly_chart
+from delivery import load_delivery_stats, missing_columns
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def late_rate_by_state_figure(by_state_df):
+    fig = px.bar(
+        by_state_df,
+        x="customer_state",
+        y="late_rate",
+        hover_data=["delivered", "late"],
+        labels={"customer_state": "State", "late_rate": "Late Rate"},
+        color="late_rate",
+        color_continuous_scale=px.colors.sequential.Reds,
+    )
+    fig.update_layout(yaxis_tickformat=".0%")
+    return fig
+
+
+def late_rate_by_month_figure(by_month_df, max_points=MAX_POINTS):
+    fig = px.line(
+        downsample(by_month_df, "month", "late_rate", max_points),
+        x="month",
+        y="late_rate",
+        hover_data=["delivered", "late"],
+        labels={"month": "Purchase Month", "late_rate": "Late Rate"},
+        markers=True,
+    )
+    fig.update_layout(yaxis_tickformat=".0%")
+    return fig
+
+
+def render(filters):
+    st.title("Delivery Performance ⏱️")
+    st.write("""This page compares the delivery date of every order with the estimated delivery date shown to the customer.
+             An order is late when it reached the customer after the estimated date. Use the filters to focus on states and months.""")
+    st.write("")
+
+    missing = missing_columns()
+    if missing:
+        st.error(f"Columns not found in all_data: {', '.join(missing)}. Please rebuild it with the notebook or dashboard/etl.py.")
+        return
+
+    # Statistik per (negara bagian, bulan) dihitung sekali; filter hanya memotong array kecil
+    delivery_stats = load_delivery_stats()
+    mark("load", "delivery stats")
+
+    # Options limited by the global filters (whole months; the category filter does not apply here)
+    state_options = [state for state in delivery_stats.states if not filters.states or state in filters.states]
+    month_options = [
+        month for month in delivery_stats.months
+        if (not filters.start or month >= filters.start.strftime("%Y-%m"))
+        and (not filters.end or month <= filters.end.strftime("%Y-%m"))
+    ] or delivery_stats.months
+    selected_states = st.multiselect("📍Customer State (all when empty)", state_options) or state_options
+    if len(month_options) > 1:
+        first_month, last_month = st.select_slider(
+            "📅Purchase Month", options=month_options,
+            value=(month_options[0], month_options[-1]),
+        )
+    else:
+        first_month = last_month = month_options[0]
+    selected_months = month_options[month_options.index(first_month):month_options.index(last_month) + 1]
+
+    summary = delivery_stats.summary(selected_states, selected_months)
+    percentiles_df = delivery_stats.percentiles(selected_states, selected_months)
+    mark("aggregate", "summary and percentiles")
+    key = figure_key(DATA, filters, tuple(selected_states), tuple(selected_months))
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Delivered Orders", f"{summary['delivered']:,}")
+    # No delivered order in the selection leaves the rate and percentiles undefined
+    col2.metric("Late Rate", f"{summary['late_rate']:.1%}" if summary["delivered"] else "n/a")
+    col3.metric("Median Delivery", f"{percentiles_df['delivery_days'].iloc[0]:.1f} days" if summary["delivered"] else "n/a")
+    col4.metric("P95 Delivery", f"{percentiles_df.loc[percentiles_df['percentile'] == 'P95', 'delivery_days'].iloc[0]:.1f} days" if summary["delivered"] else "n/a")
+
+    st.markdown("### 💡Late Delivery Rate by State")
+    by_state_df = delivery_stats.by_state(selected_states, selected_months).sort_values("late_rate", ascending=False)
+    mark("aggregate", "late rate by state")
+    plotly_chart(late_rate_by_state_figure, by_state_df, key=key)
+    mark("chart", "late rate by state")
+
+    st.markdown("### 💡Late Delivery Rate by Month")
+    by_month_df = delivery_stats.by_month(selected_states, selected_months)
+    mark("aggregate", "late rate by month")
+    plotly_chart(late_rate_by_month_figure, by_month_df, key=key)
+    mark("chart", "late rate by month")
+
+    st.markdown("### 💡Delivery Time Percentiles")
+    st.dataframe(percentiles_df.style.format({"delivery_days": "{:.1f}"}), width=400)
+
+    st.markdown("### 💡Sellers with the Highest Late Rate")
+    min_delivered = st.number_input("Minimum delivered orders per seller", min_value=1, value=20, step=5)
+    sellers_df = delivery_stats.by_seller(selected_states, selected_months, min_delivered)
+    mark("aggregate", "late rate by seller")
+    st.dataframe(
+        sellers_df.nlargest(10, ["late_rate", "delivered"]).style.format({"late_rate": "{:.1%}"}),
+        width=800,
+    )
+    mark("table", "sellers with the highest late rate")
+
+    with st.expander("See explanation"):
+        st.write("""
+        - Durations come from the purchase timestamp, the delivery date and the estimated delivery date, computed once when `all_data.csv` is built.
+        - Percentiles are read from per-state, per-month histograms with 6 hour bins, so they are accurate to a few hours.
+        - Orders that were never delivered are not counted in the late rate.
+        """)
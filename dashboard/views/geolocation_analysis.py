@@ -0,0 +1,50 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from geo_index import load_geo_index
+from instrument import mark
+
+# Tables this page reads
+DATA = ["geolocation"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def cities_figure(filtered_df, selected_state):
+    # Create horizontal bar chart with Plotly Express
+    fig = px.bar(
+        filtered_df,
+        y='geolocation_city',  # Y-axis: City
+        x='count',  # X-axis: Count
+        color='geolocation_state',  # Color by state
+        orientation='h',  # Option for horizontal bar chart
+        title=f'Number of ZIP Codes per City in {selected_state}',
+        labels={'count': 'Number of ZIP Codes', 'geolocation_city': 'City'}
+    )
+    return fig
+
+
+def render(filters):
+
+    st.title("Geolocation Analysis 🗺️")
+    st.write("This page shows the number of ZIP codes per city for the selected state. You can select a state from the dropdown menu to filter the data accordingly.")
+    
+    # Precomputed index: per-state city counts without scanning the geolocation table
+    geo_index = load_geo_index()
+    mark("load", "geo index")
+
+    # Select state to filter data
+    state_options = [state for state in geo_index.states if not filters.states or state in filters.states]
+    if not state_options:
+        st.info("None of the states selected in the sidebar has geolocation data.")
+        return
+    selected_state = st.selectbox("📍Select State", state_options)
+
+    # City counts of the selected state
+    filtered_df = geo_index.cities(selected_state)
+    mark("aggregate", "cities of state")
+
+    # Display plot in Streamlit
+    plotly_chart(cities_figure, filtered_df, selected_state, key=figure_key(DATA, selected_state))
+    mark("chart", "cities by state")
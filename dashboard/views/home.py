@@ -0,0 +1,82 @@
+import streamlit as st
+
+# Tables this page reads
+DATA = []
+# Whether the page applies the global sidebar filters
+FILTERS = False
+
+
+def render(filters):
+    
+    # Display the main title
+    st.title("Welcome to the Olist E-Commerce Data Analysis Dashboard 📊")
+    st.image("dashboard/assets/home_picture.png")
+    # Display subtitles and sections
+    st.markdown("##### Discover Insights from Brazil's Leading Marketplace")
+    st.write("")
+    st.markdown("""
+    ### About the Dataset 📚
+
+    Welcome! Explore a comprehensive Brazilian e-commerce public dataset provided by Olist, the largest department store in Brazilian marketplaces. This dataset includes information on 100,000 orders made between 2016 and 2018 across multiple marketplaces in Brazil.
+    
+    This dataset based on [kaggle](https://www.kaggle.com/datasets/olistbr/brazilian-ecommerce)
+    """)
+
+    st.write("")
+    st.markdown("""
+    <style>
+    .link-item {
+        text-decoration: none;
+        color: #FFC857;
+        font-weight: bold;
+    }
+    .link-item:hover {
+        color: #FFC857;
+    }
+    </style>
+
+    ### What You Can Learn 🔎
+
+    Explore the dataset's features to gain valuable insights across various dimensions of an order:
+
+    <ul>
+        <li><a class="link-item" href="#Customer_Analysis">Customer Analysis</a>: Understand customer behavior, identify patterns in purchasing, and segment customers based on their interactions with the business.</li>
+        <li><a class="link-item" href="#Geolocation_Analysis">Geolocation Analysis</a>: Analyze the geographical distribution of orders to uncover regional trends and optimize delivery strategies.</li>
+        <li><a class="link-item" href="#Payment_Method_Analysis">Payment Method Analysis</a>: Examine the different payment methods used by customers, identify preferences, and assess the impact on overall sales.</li>
+        <li><a class="link-item" href="#Review_Analysis">Review Analysis</a>: Investigate customer reviews to gauge satisfaction levels, identify common issues, and enhance product quality and service.</li>
+        <li><a class="link-item" href="#Order_Analysis">Order Analysis</a>: Dive into order trends, identify peak times, and analyze the volume and frequency of orders to improve inventory and marketing strategies.</li>
+        <li><a class="link-item" href="#Products_Analysis">Products Analysis</a>: Explore product performance, identify top-selling and least-selling items, and assess the impact of product categories on sales.</li>
+        <li><a class="link-item" href="#Market_Basket_Analysis">Market Basket Analysis</a>: Find the product categories bought together in one order and the categories customers come back to.</li>
+        <li><a class="link-item" href="#Delivery_Performance">Delivery Performance</a>: Track late deliveries against the estimated date by state, seller and month, with delivery time percentiles.</li>
+        <li><a class="link-item" href="#Delivery_Distance_Analysis">Delivery Distance Analysis</a>: Measure how far each order travels from seller to customer and how distance drives shipping time and freight cost.</li>
+        <li><a class="link-item" href="#Seller_Performance">Seller Performance</a>: Rank sellers by revenue, orders, review score, freight share and late shipping, and compare seller states.</li>
+        <li><a class="link-item" href="#RFM_Analysis">RFM Analysis</a>: Segment customers based on Recency, Frequency, and Monetary value to tailor marketing efforts and increase customer retention, or group them with k-means clustering.</li>
+        <li><a class="link-item" href="#Cohort_Retention">Cohort Retention</a>: Follow each monthly cohort of new customers and see how many of them buy again in the following months.</li>
+    </ul>
+
+    Each analysis provides unique insights that can help optimize business strategies and drive better decision-making.
+    """, unsafe_allow_html=True)
+    st.write("")
+    st.markdown("""
+    ### Unique Anonymization ✨
+
+    This is real commercial data that has been anonymized. References to companies and partners in the review text have been creatively replaced with names from the Game of Thrones great houses.
+    """)
+    st.write("")
+    st.markdown("""
+    ### About Olist 🛍️
+
+    Generously provided by Olist, this dataset offers a glimpse into the workings of Brazil's most extensive marketplace network. Olist connects small businesses from all over Brazil to various sales channels seamlessly, using a single contract. Merchants can sell their products through the Olist Store and ship them directly to customers using Olist's logistics partners.
+
+    Learn more about Olist on our [website](https://www.olist.com).
+    """)
+    st.write("")
+    st.markdown("""
+    ### Customer Experience 👤
+
+    After a customer purchases a product from the Olist Store, the seller is notified to fulfill the order. Once the product is delivered or the estimated delivery date has passed, the customer receives a satisfaction survey via email. They can rate their purchase experience and provide comments, enriching the dataset with valuable feedback.
+    """)
+    
+    st.markdown("---")
+
+    st.markdown("Explore the dashboard to uncover trends, analyze data, and make data-driven decisions with the Olist E-Commerce Data Analysis Dashboard!")
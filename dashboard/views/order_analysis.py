@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from cube import load_aggregate
+from data_loader import data_version, load_order_items
+from filters import selected_order_ids
+from instrument import mark
+from timebucket import GRANULARITIES, count_unique_per_period
+
+# Tables this page reads
+DATA = ["all_data", "order_items"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_unique_orders(versions, granularity, filters):
+    # One entry per (order_items, all_data) version, granularity and filters; the
+    # filtered order ids come from all_data, so both versions are part of the key
+    order_items_df = load_order_items()
+    order_ids = selected_order_ids(filters)
+    if order_ids is not None:
+        order_items_df = order_items_df[order_items_df["order_id"].isin(order_ids)]
+    return count_unique_per_period(order_items_df, "shipping_limit_date", "order_id", granularity)
+
+
+def order_status_figure(order_status_counts):
+    fig = px.bar(
+    order_status_counts,
+    x="order_status",
+    y="count",
+    color="order_status",  # Add color to differentiate categories
+    title="",
+    labels={"order_status": "Order Status"},
+    color_discrete_sequence=px.colors.sequential.Viridis  # Optional: choose a color palette
+    )
+
+    # Update layout for better readability
+    fig.update_layout(
+        xaxis_title="Order Status",
+        yaxis_title="Count",
+        xaxis_tickangle=-45,  # Tilt x-axis labels for better readability
+    )
+    return fig
+
+
+def unique_orders_figure(sales, granularity):
+    # Create Bullet Chart
+    fig = go.Figure()
+
+    # Add bullet trace
+    fig.add_trace(go.Bar(
+        x=sales["period"],
+        y=sales["order_id"],
+        name='Unique Orders',
+        marker_color='royalblue'
+    ))
+
+    # Update layout
+    fig.update_layout(
+        title="",
+        xaxis_title=granularity,
+        yaxis_title="Unique Orders",
+        xaxis_tickformat=GRANULARITIES[granularity],
+        xaxis_title_font_size=14,
+        yaxis_title_font_size=14,
+        title_font_size=16,
+        title_x=0.5,  # Center the title
+        xaxis_tickangle=-45  # Tilt x-axis labels for better readability
+    )
+    return fig
+
+
+def render(filters):
+
+    st.title("Order Analysis 🛒")
+    st.write("Order Analysis involves examining the data related to customer orders to identify trends, patterns, and insights that can help improve business performance.")
+    st.write("")
+
+    order_status_counts = load_aggregate("order_status_counts", filters)
+    mark("aggregate", "order_status_counts")
+    # Display the chart in Streamlit
+    st.markdown("### 💡Distribution of Order Status")
+    plotly_chart(order_status_figure, order_status_counts, key=figure_key(DATA, filters))
+    mark("chart", "order status")
+
+
+    with st.expander("Analysis"):
+        data = {
+        "Order Status": ["delivered", "shipped", "canceled", "invoiced", "processing", "unavailable", "approved"],
+        "Counts": [104335, 1204, 493, 357, 313, 7, 2]
+        }
+
+        # Create a DataFrame
+        df = pd.DataFrame(data)
+
+        # Display the table in Streamlit
+        st.dataframe(df, width=800)
+
+        # Provide the explanation
+        st.markdown("""
+        **Distribution of Order Status**
+
+        1. **Delivered**: This status is the most common, with **100,777** orders marked as delivered. This indicates that the majority of orders have been successfully completed and delivered to customers.
+        2. **Shipped**: There are **1,138** orders that have been shipped but not yet delivered. This status is the second most common and represents orders that are in transit.
+        3. **Canceled**: **469** orders have been canceled. This might be due to various reasons such as customer requests, stock issues, or payment problems.
+        4. **Invoiced**: There are **327** orders that have been invoiced, meaning the invoices have been generated, but the orders might still be in progress.
+        5. **Processing**: **307** orders are still in the processing stage, indicating that they are being prepared for shipment or further actions.
+        6. **Unavailable**: Only **7** orders are marked as unavailable, which might suggest that the products are out of stock or no longer available.
+        7. **Approved**: **2** orders are in the approved status, which might indicate that they are approved for processing but have not yet moved to the next stage.
+
+        This distribution provides insight into the current status of orders and can help in assessing the efficiency of the order fulfillment process.
+        """)
+    st.write("")
+    # Unique orders per period of the shipping limit date (cached per granularity)
+    granularity = st.radio("Time granularity", list(GRANULARITIES), index=2, horizontal=True)
+    sales = cached_unique_orders((data_version("order_items"), data_version()), granularity, filters)
+    mark("aggregate", "unique orders per period")
+
+    # Display the chart in Streamlit
+    st.markdown(f"### 💡Unique Orders per {granularity}")
+    plotly_chart(unique_orders_figure, sales, granularity, key=figure_key(DATA, filters, granularity))
+    mark("chart", "unique orders per period")
+    st.markdown("#### Question: When did the highest sales occur❓")
+    with st.expander("Answer"):
+        st.markdown("""
+        1. **Highest Sales**:
+        - The highest sales occurred in August 2018, with a total of `7823` orders. This indicates that this month had significantly higher sales activity compared to other months.
+
+        2. **Seasonal Trends**:
+        - In general, there is a seasonal pattern with higher sales in 2018 compared to other years, particularly in certain months such as March, May, and August. This suggests that 2018 was a very good year in terms of sales.
+
+        3. **Yearly Comparison**:
+        - The year 2018 consistently shows higher sales figures compared to other years, especially compared to 2017. This could indicate growth or an increase in sales in 2018.
+
+        4. **Low Sales**:
+        - Some months in 2020 show very low sales (e.g., February 2020 and April 2020). This may be related to external factors such as the impact of the COVID-19 pandemic or significant changes in business.
+
+        5. **Inconsistent Data**:
+        - There are data for non-consecutive years (e.g., 2016) showing very low sales, indicating that data from those years may not be as comprehensive as other years or may have recording issues.
+
+        6. **Monthly Sales**:
+        - Monthly sales show significant variation, with some months displaying large sales spikes. This indicates the possibility of seasonal fluctuations or special promotions affecting sales.
+
+        Overall, the data shows that 2018 was a highly productive year in terms of sales, with August being the peak month. Meanwhile, there are other periods with low sales that may need further examination to understand the influencing factors.
+        """)
@@ -0,0 +1,132 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from instrument import mark
+from payments import load_payment_stats, payment_selection
+
+# Tables this page reads
+DATA = ["order_payments"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def average_payment_figure(summary):
+    # DataFrame with average payment value
+    avg_payment_value_by_type = summary[["payment_type", "mean_value"]].set_axis(
+        ["Payment Type", "Average Payment Value"], axis=1
+    )
+
+    # Create a bar chart for average payment value
+    fig_avg_payment = px.bar(
+        avg_payment_value_by_type, 
+        x="Payment Type", 
+        y="Average Payment Value", 
+        color="Payment Type", 
+        title='💲Average Payment Value by Payment Type',
+        labels={"Payment Type": "Payment Type", "Average Payment Value": "Average Value"}
+    )
+    return fig_avg_payment
+
+
+def payment_count_figure(summary):
+    # DataFrame with usage frequency
+    payment_count_by_type = summary[["payment_type", "count"]].set_axis(["Payment Type", "Transaction Count"], axis=1)
+
+    # Create a bar chart for usage frequency
+    fig_payment_count = px.bar(
+        payment_count_by_type, 
+        x="Payment Type", 
+        y="Transaction Count", 
+        color="Payment Type", 
+        title='💲Usage Frequency by Payment Type',
+        labels={"Payment Type": "Payment Type", "Transaction Count": "Transaction Count"}
+    )
+    return fig_payment_count
+
+
+def installments_figure(installments_df):
+    fig_installments = px.bar(
+        installments_df,
+        x="payment_installments",
+        y="count",
+        color="payment_type",
+        labels={"payment_installments": "Installments", "count": "Payments", "payment_type": "Payment Type"},
+    )
+    return fig_installments
+
+
+def sequential_figure(sequential_df):
+    fig_sequential = px.bar(
+        sequential_df,
+        x="payment_sequential",
+        y="count",
+        color="payment_type",
+        log_y=True,
+        labels={"payment_sequential": "Payment Number within the Order", "count": "Payments", "payment_type": "Payment Type"},
+    )
+    return fig_sequential
+
+
+def render(filters):
+    st.title("Payment Method Analysis 💸")
+    st.write("""
+    This page provides an analysis of the different payment methods used by customers. 
+    We will look at the average payment value and the frequency of usage for each payment method. 
+    Understanding these metrics can help us gain insights into customer preferences and behaviors.
+    """)
+    # Payments sorted by type and value once per data version; every statistic below
+    # is read from it for the current filters
+    payment_stats = load_payment_stats()
+    mark("load", "payment stats")
+    selection = payment_selection(filters)
+    summary = payment_stats.summary(selection)
+    installments_df = payment_stats.installments_histogram(selection)
+    sequential_df = payment_stats.sequential_histogram(selection)
+    mark("aggregate", "payments by type")
+
+    # Display the charts in Streamlit (the filters go through all_data)
+    key = figure_key(DATA + ["all_data"], filters)
+    plotly_chart(average_payment_figure, summary, key=key)
+    plotly_chart(payment_count_figure, summary, key=key)
+    mark("chart", "payments by type")
+
+    st.markdown("### 💲Payment Value Distribution")
+    st.dataframe(
+        summary.style.format({col: "{:,.2f}" for col in summary.columns if col not in ("payment_type", "count")}),
+        hide_index=True,
+    )
+
+    st.markdown("### 💳Installments by Payment Type")
+    plotly_chart(installments_figure, installments_df, key=key)
+
+    st.markdown("### 💳Payment Type by Position in the Order")
+    plotly_chart(sequential_figure, sequential_df, key=key)
+    mark("chart", "installments and sequential payments")
+
+    with st.expander("Analysis"):
+        
+        st.markdown("""
+        **From the given data, we can draw several conclusions about the types of payments used and the average payment values:**
+
+        1. **Average Payment Value**:
+        - **`credit_card`** has the highest average payment value of **163.32**. This indicates that customers using credit cards tend to pay more per transaction compared to other payment methods.
+        - **`boleto`** and **`debit_card`** have relatively close average payment values, at **145.03** and **142.57**, respectively. This shows that the average payment values for these two methods are almost the same.
+        - **`voucher`** has the lowest average payment value at **65.70**, indicating that transactions using vouchers are typically smaller compared to other payment methods.
+        - **`not_defined`** has an average payment value of **0.00**, which might indicate incomplete data or undefined transactions.
+
+        2. **Usage Frequency**:
+        - **`credit_card`** is the most frequently used payment method with **76,795** transactions. This shows that credit cards are the customers' preferred choice.
+        - **`boleto`** is the second most popular payment method with **19,784** transactions. Although frequently used, its average payment value is lower compared to credit cards.
+        - **`voucher`** and **`debit_card`** have much lower usage frequencies, with **5,775** and **1,529** transactions, respectively. This indicates that these two methods are not as popular as credit cards or boleto.
+        - **`not_defined`** has a very low number of transactions (**3**), indicating that this data is almost negligible.
+        """)
+
+    st.markdown("#### <br>Question: What is the most frequently used payment method❓", unsafe_allow_html=True)
+    with st.expander("Answer"):
+        st.markdown("""
+            - Credit card is the most frequently used payment method and also has the highest average payment value.
+            - Boleto is a commonly used payment method but with a lower average payment value.
+            - Voucher and debit card are less popular and have lower average payment values.
+            - Data with not_defined may indicate issues or deficiencies in data collection.
+        """)
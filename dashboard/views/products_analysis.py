@@ -0,0 +1,105 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from cube import load_aggregate
+from instrument import mark
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def top_products_figure(top_products):
+    # Create bar chart for top products using Plotly Express
+    fig_top = px.bar(
+        top_products,
+        x="product_id",
+        y="product_category_name_english",
+        orientation='h',
+        title="Products with the Highest Sales",
+        labels={"product_id": "Number of Products Sold", "product_category_name_english": "Product Category"},
+        color="product_id",
+        color_continuous_scale=px.colors.sequential.Blues
+    )
+
+    # Update layout for better readability
+    fig_top.update_layout(
+        xaxis_title="Number of Products Sold",
+        yaxis_title="Product Category",
+        title_font_size=20,
+        title_x=0.5,  # Center the title
+        yaxis=dict(tickfont=dict(size=12))
+    )
+    return fig_top
+
+
+def bottom_products_figure(bottom_products):
+    # Create bar chart for bottom products using Plotly Express
+    fig_bottom = px.bar(
+        bottom_products,
+        x="product_id",
+        y="product_category_name_english",
+        orientation='h',
+        title="Products with the Lowest Sales",
+        labels={"product_id": "Number of Products Sold", "product_category_name_english": "Product Category"},
+        color="product_id",
+        color_continuous_scale=px.colors.sequential.Reds
+    )
+
+    # Update layout for better readability
+    fig_bottom.update_layout(
+        xaxis_title="Number of Products Sold",
+        yaxis_title="Product Category",
+        title_font_size=20,
+        title_x=0.5,  # Center the title
+        yaxis=dict(tickfont=dict(size=12))
+    )
+    return fig_bottom
+
+
+def render(filters):
+    st.title("Product Sales Analysis 🛍️")
+    st.write("")
+
+    # Number of products sold per product_category_name_english, sorted descending
+    sorted_df = load_aggregate("products_by_category", filters)
+    mark("aggregate", "products_by_category")
+
+    # Split data into top and bottom products
+    top_products = sorted_df.head(5)
+    bottom_products = sorted_df.tail(5).sort_values(by="product_id", ascending=False)
+
+    tab1, tab2 = st.tabs(["The Most Sold Products 🔎", "The Least Sold Products 🔎"])
+
+    with tab1:
+        plotly_chart(top_products_figure, top_products, key=figure_key(DATA, filters))
+
+    with tab2:
+        plotly_chart(bottom_products_figure, bottom_products, key=figure_key(DATA, filters))
+        mark("chart", "top and bottom categories")
+    
+    with st.expander("Analysis"):
+        st.write("""
+        1. **Categories with the Most Products**:
+        - **Bed_Bath_Table**: This category has the highest number of products with a `product_id` count of 11,105.
+        - **Health_Beauty**: This category is also very popular with a `product_id` count of 9,426.
+        - **Sports_Leisure**: This category has a significant number of products with a `product_id` count of 8,286.
+        - **Computers_Accessories**: This category has a high number of products with a `product_id` count of 7,286.
+        - **Furniture_Decor**: This category has a large number of products with a `product_id` count of 7,222.
+        
+        2. **Categories with the Fewest Products**:
+        - **Security and Services**: This category has the fewest number of products with a `product_id` count of 2.
+        - **PC Gaming** and **Fashion Children's Clothes**: Both of these categories have very few products with a `product_id` count of 8.
+        - **CDs, DVDs, Musicals**: This category has a very low number of products with a `product_id` count of 12.
+        - **La Cuisine**: This category also has very few products with a `product_id` count of 13.
+        
+        3. **Product Distribution**:
+        - Categories related to home and health (such as `bed_bath_table` and `health_beauty`) tend to have more products.
+        - More specific or niche categories (such as `security_and_services` and `PC Gaming`) have fewer products.
+        
+        4. **Product Category Analysis**:
+        - Categories with a large number of products likely reflect high popularity or demand in those categories.
+        - Categories with a few products may reflect niche markets or very specific product categories with limited demand.
+        """)
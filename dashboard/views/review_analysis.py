@@ -0,0 +1,156 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from instrument import mark
+from reviews import PRIOR_REVIEWS, load_review_stats, score_distribution
+
+# Tables this page reads
+DATA = ["all_data"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+def review_scores_figure(data):
+    # Create a Plotly Express bar chart
+    fig = px.bar(
+        data,
+        x="product_category_name_english",
+        y="bayesian_score",
+        title="✏️ Distribution of Review Scores by Product Category",
+        hover_data=["reviews", "review_score"],
+        labels={
+            "product_category_name_english": "Product Category",
+            "bayesian_score": "Review Score",
+            "review_score": "Average Review Score",
+            "reviews": "Reviews",
+        },
+        height=600
+    )
+
+    # Customize the chart
+    fig.update_layout(
+        xaxis_title="Product Category",
+        yaxis_title="Review Score",
+        xaxis_tickangle=-90,  # Rotate x-axis labels for better readability
+        xaxis_title_font_size=14,
+        yaxis_title_font_size=14,
+        title_font_size=16
+    )
+    return fig
+
+
+def top_categories_figure(top_df):
+    fig = px.bar(
+    top_df,
+    y="product_category_name_english",  # Set y-axis for categories
+    x="bayesian_score",  # Set x-axis for review scores
+    orientation='h',  # Horizontal bars
+    title="✏️ Top 10 Product Categories by Review Score",
+    hover_data=["reviews", "review_score"],
+    labels={
+        "product_category_name_english": "Product Category",
+        "bayesian_score": "Review Score",
+        "review_score": "Average Review Score",
+        "reviews": "Reviews",
+    },
+    height=600
+    )
+
+    # Customize the chart
+    fig.update_layout(
+        xaxis_title="Review Score",
+        yaxis_title="Product Category",
+        yaxis={"categoryorder": "total ascending"},
+        yaxis_title_font_size=14,
+        xaxis_title_font_size=14,
+        title_font_size=16
+    )
+    return fig
+
+
+def score_distribution_figure(top_df):
+    # Share of each score (1-5 stars) in the top 10 categories
+    fig = px.bar(
+        score_distribution(top_df),
+        y="product_category_name_english",
+        x="share",
+        color="review_score",
+        orientation="h",
+        title="✏️ Review Score Distribution of the Top 10 Product Categories",
+        labels={"product_category_name_english": "Product Category", "share": "Share of Reviews", "review_score": "Review Score"},
+        category_orders={"product_category_name_english": list(top_df["product_category_name_english"])},
+        height=500
+    )
+    fig.update_layout(xaxis_tickformat=".0%", title_font_size=16)
+    return fig
+
+
+def render(filters):
+    # Prepare data: review statistics per product category, best Bayesian score first
+    data = load_review_stats(filters)
+    mark("aggregate", "review stats")
+
+    # Display the chart in Streamlit
+    st.title("Distribution of Review Scores by Product Category 📝")
+    st.write(f"""
+    This bar chart shows the review score of every product category. The score is the average review score
+    pulled towards the average of all reviews by the weight of {PRIOR_REVIEWS} reviews, so a category with a
+    handful of reviews cannot rank above categories with hundreds of them.
+    """)
+    key = figure_key(DATA, filters)
+    plotly_chart(review_scores_figure, data, key=key)
+    mark("chart", "review score by category")
+
+    
+    st.markdown("#### Question : Which products have good performance based on review ratings❓")
+
+
+     # Top 10 product categories by review score
+    top_df = data.head(10).assign(
+        product_category_name_english=lambda d: d["product_category_name_english"].cat.remove_unused_categories()
+    )
+    plotly_chart(top_categories_figure, top_df, key=key)
+    mark("chart", "top 10 categories")
+
+    plotly_chart(score_distribution_figure, top_df, key=key)
+    mark("chart", "score distribution")
+
+    with st.expander("Explanation"):
+        # Tabel dibuat dari data saat ini
+        st.dataframe(
+            top_df[["product_category_name_english", "reviews", "review_score", "bayesian_score", "positive_lower_bound"]].rename(columns={
+                "product_category_name_english": "Product Category",
+                "reviews": "Reviews",
+                "review_score": "Average Review Score",
+                "bayesian_score": "Review Score",
+                "positive_lower_bound": "Positive Reviews (95% lower bound)",
+            }).style.format({"Average Review Score": "{:.2f}", "Review Score": "{:.2f}", "Positive Reviews (95% lower bound)": "{:.1%}"}),
+            width=800,
+            hide_index=True,
+        )
+        mark("table", "top 10 categories")
+
+        if len(top_df):
+            best = top_df.iloc[0]
+            highest_mean = data.loc[data["review_score"].idxmax()]
+            st.markdown(f"""
+            **Product Categories with the Highest Review Scores:**
+
+            - **{best['product_category_name_english']}** has the highest review score of **{best['bayesian_score']:.2f}**
+              (average **{best['review_score']:.2f}** over **{best['reviews']:,}** reviews).
+            - At least **{best['positive_lower_bound']:.0%}** of its reviews are expected to be positive (4 or 5 stars),
+              the lower bound of the 95% Wilson interval.
+
+            **Why not the raw average?**
+
+            - The highest raw average belongs to **{highest_mean['product_category_name_english']}** with
+              **{highest_mean['review_score']:.2f}** from **{highest_mean['reviews']:,}** reviews. With few reviews an
+              average is mostly luck, so the review score weighs every average by its number of reviews.
+            - Every review is counted once per product category of its order, whatever the number of items.
+
+            **Focus on High-Performing Products:**
+
+            Increasing stock or focusing marketing efforts on the top categories above could help further boost sales
+            as they combine high review scores with a solid base of reviews.
+            """)
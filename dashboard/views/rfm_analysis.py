@@ -0,0 +1,215 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from clustering import cluster_profile, cluster_rfm
+from data_loader import data_version, load_orders
+from filters import filtered_all_data
+from instrument import mark
+from rfm import DEFAULT_WEIGHTS, RFM_COLUMNS, compute_rfm, segment_counts
+
+# Tables this page reads
+DATA = ["all_data", "orders"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_rfm(version, as_of, weights, filters):
+    # Keyed by data version, as-of date, weights and filters; the data itself is not hashed
+    return compute_rfm(filtered_all_data(RFM_COLUMNS, filters), as_of, weights)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def cached_clusters(version, as_of, weights, filters, k):
+    # Same key as cached_rfm plus k; clusters are numbered by RFM score, so they depend on the weights too
+    return cluster_rfm(cached_rfm(version, as_of, weights, filters), k)
+
+
+def top_customers_figure(top_df, column, title, label, color_scale):
+    # Bar chart of the top 5 customers of one RFM column
+    fig = px.bar(
+        top_df,
+        x=column,
+        y="customer_unique_id",
+        orientation='h',
+        title=title,
+        labels={column: label, "customer_unique_id": "Customer ID"},
+        color=column,
+        color_continuous_scale=color_scale
+    )
+    return fig
+
+
+def customer_segments_figure(customer_segment_df):
+    fig = px.bar(
+        customer_segment_df,
+        x="customer_segment",
+        y="customer_unique_id",
+        title="Number of Customers per Segment",
+        labels={"customer_segment": "Customer Segment", "customer_unique_id": "Number of Customers"},
+        color="customer_segment",
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    return fig
+
+
+def clusters_figure(profile_df):
+    fig = px.bar(
+        profile_df.assign(cluster=profile_df["cluster"].map("Cluster {}".format)),
+        x="cluster",
+        y="customers",
+        hover_data=["recency", "frequency", "monetary", "RFM_score"],
+        title="Number of Customers per Cluster",
+        labels={"cluster": "Cluster", "customers": "Number of Customers"},
+        color="cluster",
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    return fig
+
+
+def render(filters):
+    st.title("RFM Analysis 📈")
+    st.write("""
+    **RFM (Recency, Frequency, Monetary) Analysis** is a method used to segment customers based on how frequently and how much they spend. Here's what each component means:
+
+    1. **Recency**: How recent was the customer's last purchase. Customers who have bought recently have a higher recency value.
+
+    2. **Frequency**: How often the customer makes a purchase. Customers who buy frequently have a higher frequency value.
+
+    3. **Monetary**: How much money the customer spends. Customers who spend more have a higher monetary value.
+
+    By using RFM analysis, businesses can score each customer based on these three factors. This helps businesses to segment customers into categories such as loyal customers, those who need attention, or those who are almost inactive, allowing targeted marketing efforts and appropriate offers.
+    """)
+
+    # Score weights and as-of date; RFM is computed once per data version and
+    # parameter set and shared by the five tabs below
+    orders_df = load_orders()
+    recent_date = pd.to_datetime(orders_df["order_purchase_timestamp"].dt.date.max())
+    mark("load", "orders")
+
+    with st.expander("⚙️ RFM Settings"):
+        as_of = st.date_input("As-of date", value=recent_date.date())
+        weight_cols = st.columns(3)
+        weights = (
+            weight_cols[0].number_input("Recency weight", 0.0, 1.0, DEFAULT_WEIGHTS[0], 0.01),
+            weight_cols[1].number_input("Frequency weight", 0.0, 1.0, DEFAULT_WEIGHTS[1], 0.01),
+            weight_cols[2].number_input("Monetary weight", 0.0, 1.0, DEFAULT_WEIGHTS[2], 0.01),
+        )
+        if sum(weights) == 0:
+            st.warning("All weights are zero, using the default weights.")
+            weights = DEFAULT_WEIGHTS
+        mode = st.radio("Segmentation", ["RFM score thresholds", "Clustering (k-means)"], horizontal=True)
+        k = st.slider("Number of clusters", 2, 10, 5) if mode == "Clustering (k-means)" else None
+
+    rfm_df = cached_rfm(data_version(), pd.Timestamp(as_of), weights, filters)
+    mark("aggregate", "rfm")
+
+    # Number of customers per segment, in segment order
+    customer_segment_df = segment_counts(rfm_df)
+    mark("aggregate", "segment counts")
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📌Recency", "📌Frequency", "📌Monetary", "📌RFM Scores", "📌Customer Segments"])
+    key = figure_key(DATA, filters, pd.Timestamp(as_of), weights)
+
+    # Recency
+    with tab1:
+        st.header("Top 5 Customers by Recency")
+        top_customers = rfm_df.nsmallest(5, "recency")
+        plotly_chart(
+            top_customers_figure, top_customers, "recency", "Top 5 Customers by Recency",
+            "Recency (Days Since Last Purchase)", px.colors.sequential.Blues, key=key + ("recency",),
+        )
+        mark("chart", "recency")
+
+    # Frequency
+    with tab2:
+        st.header("Top 5 Customers by Frequency")
+        top_customers_freq = rfm_df.nlargest(5, "frequency")
+        plotly_chart(
+            top_customers_figure, top_customers_freq, "frequency", "Top 5 Customers by Frequency",
+            "Frequency (Number of Orders)", px.colors.sequential.Greens, key=key + ("frequency",),
+        )
+        mark("chart", "frequency")
+
+    # Monetary
+    with tab3:
+        st.header("Top 5 Customers by Monetary")
+        top_customers_monetary = rfm_df.nlargest(5, "monetary")
+        plotly_chart(
+            top_customers_figure, top_customers_monetary, "monetary", "Top 5 Customers by Monetary",
+            "Monetary Value (Total Spend)", px.colors.sequential.Reds, key=key + ("monetary",),
+        )
+        mark("chart", "monetary")
+
+    # RFM Scores
+    with tab4:
+        st.header("Top 5 Customers by RFM Score")
+        top_customers_rfm = rfm_df.nlargest(5, "RFM_score")
+        plotly_chart(
+            top_customers_figure, top_customers_rfm, "RFM_score", "Top 5 Customers by RFM Score",
+            "RFM Score", px.colors.sequential.Plasma, key=key + ("RFM_score",),
+        )
+        mark("chart", "rfm score")
+
+    # Customer Segments
+    with tab5:
+        st.header("Customer Segments Distribution")
+        if k is None:
+            plotly_chart(customer_segments_figure, customer_segment_df, key=key)
+            mark("chart", "customer segments")
+        else:
+            # Segmen dari k-means pada fitur RFM yang distandarkan
+            clusters, silhouette = cached_clusters(data_version(), pd.Timestamp(as_of), weights, filters, k)
+            profile_df = cluster_profile(rfm_df, clusters)
+            mark("aggregate", "clusters")
+            st.metric("Silhouette (sample)", f"{silhouette:.2f}" if np.isfinite(silhouette) else "-")
+            plotly_chart(clusters_figure, profile_df, key=key + ("clusters", k))
+            st.dataframe(
+                profile_df.style.format({"recency": "{:.0f}", "frequency": "{:.2f}", "monetary": "{:,.2f}", "RFM_score": "{:.2f}"}),
+                hide_index=True,
+            )
+            mark("chart", "clusters")
+
+    with st.expander("RFM Analysis Explanation"):
+        st.write("""
+        
+            ***RFM Analysis provides a numerical ranking for customers in five categories, where higher numbers indicate better results:***
+
+        1. **Top Customers**: Customers who have bought most recently, most frequently, and spent the most.
+        2. **High Value Customers**: Customers who buy most frequently and spend the most.
+        3. **Middle Value Customers**: Customers who have bought most recently and spent the most.
+        4. **Low Value Customers**: Customers who have bought most recently, most frequently, but spent the least.
+        5. **Lost Customers**: Customers who haven't made a purchase for the longest time
+
+        With **Clustering (k-means)** in the RFM settings, customers are instead grouped by k-means on recency, log frequency and log monetary value, each standardized. Clusters are numbered by their mean RFM score (cluster 1 holds the best customers), and the silhouette, from -1 to 1 on a sample of customers, tells how well separated they are.
+        """)
+
+    with st.expander("Conclusion"):
+        st.write("""
+        
+            1. **Top Customers:**
+            - There are 31,050 customers in this segment, the highest among all segments. This indicates that many customers are highly active, having bought recently, frequently, and spent a significant amount of money.
+
+            2. **Low Value Customers:**
+            - This segment includes 29,620 customers, also a significant number. Customers in this category have bought recently and frequently but spend less compared to Top Customers.
+
+            3. **Mid Value Customers:**
+            - There are 16,262 customers in this segment. They have bought recently and spent a lot, but they are not as active as Top or Low Value Customers in terms of purchase frequency.
+
+            4. **High Value Customers:**
+            - This segment contains 16,014 customers. They buy most frequently and spend a lot, but they do not purchase as often or recently as Top or Low Value Customers.
+
+            5. **Lost Customers:**
+            - With only 2,474 customers, this segment has the smallest number. This indicates that relatively few customers have not made a purchase for a long time.
+
+            **Analysis:**
+
+            - **Top Customers** and **Low Value Customers** have significant numbers, suggesting there are many active and frequent buyers with varying spending levels.
+        
+            - **Mid Value Customers** and **High Value Customers** are fewer compared to the other two active segments but show high spending value.
+        
+            - **Lost Customers** are the smallest group, indicating that only a small proportion of customers have not purchased for a long period.
+        """)
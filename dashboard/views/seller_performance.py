@@ -0,0 +1,100 @@
+import streamlit as st
+import plotly.express as px
+
+from charts import figure_key, plotly_chart
+from instrument import mark
+from sellers import METRICS, load_seller_facts
+
+# Tables this page reads
+DATA = ["all_data", "sellers"]
+# Whether the page applies the global sidebar filters
+FILTERS = True
+
+# Display format of every metric
+FORMATS = {
+    "revenue": "{:,.2f}",
+    "orders": "{:,.0f}",
+    "avg_review_score": "{:.2f}",
+    "freight_share": "{:.1%}",
+    "late_shipping_rate": "{:.1%}",
+}
+
+
+def ranking_figure(ranked_df, metric):
+    fig = px.bar(
+        ranked_df.assign(seller=ranked_df["seller_id"].str[:8]),
+        x="seller",
+        y=metric,
+        color="seller_state",
+        hover_data=["seller_id", "seller_city", "orders"],
+        labels={"seller": "Seller", metric: METRICS[metric], "seller_state": "State"},
+    )
+    fig.update_xaxes(categoryorder="array", categoryarray=ranked_df["seller_id"].str[:8])
+    if metric in ("freight_share", "late_shipping_rate"):
+        fig.update_layout(yaxis_tickformat=".0%")
+    return fig
+
+
+def revenue_by_state_figure(state_df):
+    fig = px.bar(
+        state_df,
+        x="seller_state",
+        y="revenue",
+        hover_data=["sellers", "orders"],
+        labels={"seller_state": "State", "revenue": "Revenue"},
+        color="revenue",
+        color_continuous_scale=px.colors.sequential.Blues,
+    )
+    return fig
+
+
+def render(filters):
+    st.title("Seller Performance 🏪")
+    st.write("""This page ranks sellers by revenue, number of orders, average review score, share of freight in
+             what customers paid and the rate of items handed to the carrier after their shipping limit date.""")
+    st.write("")
+
+    # Tabel fakta per penjual (dibangun sekali per versi data)
+    seller_facts = load_seller_facts(filters)
+    mark("load", "seller facts")
+    facts = seller_facts.facts
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Sellers", f"{len(seller_facts):,}")
+    col2.metric("Revenue", f"{facts['revenue'].sum():,.0f}")
+    shipped = facts["shipped"].sum()
+    col3.metric("Late Shipping Rate", f"{facts['late'].sum() / shipped:.1%}" if shipped else "-")
+
+    st.markdown("### 💡Seller Ranking")
+    col1, col2 = st.columns(2)
+    label = col1.selectbox("Metric", list(METRICS.values()))
+    metric = next(column for column, metric_label in METRICS.items() if metric_label == label)
+    bottom = col2.radio("Show", ["Top", "Bottom"], horizontal=True) == "Bottom"
+    col1, col2 = st.columns(2)
+    n = col1.slider("Number of sellers", min_value=5, max_value=50, value=10, step=5)
+    min_orders = col2.number_input("Minimum orders per seller", min_value=1, value=10, step=5)
+
+    ranked_df = seller_facts.rank(metric, n, bottom=bottom, min_orders=min_orders)
+    mark("aggregate", "seller ranking")
+
+    plotly_chart(ranking_figure, ranked_df, metric, key=figure_key(DATA, filters, metric, n, bottom, min_orders))
+    mark("chart", "seller ranking")
+
+    st.dataframe(
+        ranked_df[["seller_id", "seller_city", "seller_state"] + list(METRICS)].style.format(FORMATS),
+        hide_index=True,
+    )
+    mark("table", "seller ranking")
+
+    st.markdown("### 💡Revenue by Seller State")
+    state_df = seller_facts.by_state()
+    plotly_chart(revenue_by_state_figure, state_df, key=figure_key(DATA, filters))
+    mark("chart", "revenue by seller state")
+
+    with st.expander("See explanation"):
+        st.write("""
+        - Revenue is price × quantity of every order line, freight share is freight / (revenue + freight).
+        - The average review score is the mean over the seller's orders of the order's review score.
+        - An item ships late when the carrier received it after its `shipping_limit_date`; items not yet handed to the carrier are not counted.
+        - The minimum number of orders keeps sellers with only a handful of orders out of the ranking.
+        """)
@@ -0,0 +1,50 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Dashboard modules import each other by bare name, as when run by Streamlit
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard"))
+
+
+def all_data_frame(n_rows=3000, seed=0):
+    # Order lines in the all_data layout, with the gaps of the real data
+    # (purchases without a date, lines without a category or review)
+    rng = np.random.default_rng(seed)
+    n_orders = n_rows // 2
+    order = np.sort(rng.integers(n_orders, size=n_rows))
+    customer = rng.integers(n_orders // 3, size=n_orders)
+    purchase = pd.Timestamp("2017-01-01") + pd.to_timedelta(rng.integers(0, 600 * 86400, size=n_orders), unit="s")
+    purchase = pd.Series(purchase).where(rng.random(n_orders) > 0.02)
+    states = np.array(["SP", "RJ", "MG", "PR", "BA"])
+    cities = np.array(["sao paulo", "rio de janeiro", "belo horizonte", "curitiba", "salvador"])
+    categories = np.array(["bed_bath_table", "health_beauty", "sports_leisure", "toys", "watches_gifts", None], dtype=object)
+    customer_state = rng.integers(len(states), size=n_orders)
+    review = rng.integers(1, 6, size=n_orders).astype("float64")
+    review[rng.random(n_orders) < 0.05] = np.nan
+    return pd.DataFrame({
+        "order_id": [f"order-{o:05d}" for o in order],
+        "customer_id": [f"customer-{o:05d}" for o in order],
+        "customer_unique_id": [f"person-{c:05d}" for c in customer[order]],
+        "order_status": rng.choice(["delivered", "shipped", "canceled"], size=n_orders, p=[0.9, 0.05, 0.05])[order],
+        "order_purchase_timestamp": purchase.to_numpy()[order],
+        "customer_state": states[customer_state][order],
+        "customer_city": cities[customer_state][order],
+        "product_id": [f"product-{p:03d}" for p in rng.integers(200, size=n_rows)],
+        "product_category_name_english": rng.choice(categories, size=n_rows, p=[0.25, 0.2, 0.2, 0.15, 0.1, 0.1]),
+        "seller_id": rng.choice([f"seller-{s:02d}" for s in range(30)], size=n_rows),
+        "price": rng.uniform(5, 500, size=n_rows).round(2),
+        "quantity": rng.integers(1, 3, size=n_rows),
+        "review_score": review[order],
+    })
+
+
+@pytest.fixture
+def all_data_dir(tmp_path, monkeypatch):
+    """Folder holding data/all_data.csv, made the working directory as when the dashboard runs."""
+    os.makedirs(tmp_path / "data")
+    all_data_frame().to_csv(tmp_path / "data" / "all_data.csv", index=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
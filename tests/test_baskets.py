@@ -0,0 +1,100 @@
+import itertools
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from baskets import PAIR_METRICS, BasketStats
+
+
+def order_lines(n_orders=300, seed=0):
+    rng = np.random.default_rng(seed)
+    categories = ["bed_bath_table", "health_beauty", "sports_leisure", "toys", "watches_gifts", "pet_shop"]
+    rows = []
+    for order in range(n_orders):
+        customer = f"person-{rng.integers(n_orders // 4):03d}"
+        # Several lines per order, some of the same category, some without one
+        for category in rng.choice(categories + [None], size=rng.integers(1, 5), p=[0.25, 0.2, 0.2, 0.15, 0.1, 0.05, 0.05]):
+            rows.append((f"order-{order:04d}", customer, category))
+    return pd.DataFrame(rows, columns=["order_id", "customer_unique_id", "product_category_name_english"])
+
+
+def brute_force_pairs(df):
+    baskets = df.dropna().groupby("order_id")["product_category_name_english"].agg(lambda s: sorted(set(s)))
+    n = len(baskets)
+    singles = Counter(itertools.chain.from_iterable(baskets))
+    pairs = Counter(itertools.chain.from_iterable(itertools.combinations(basket, 2) for basket in baskets))
+    rows = []
+    for (a, b), both in pairs.items():
+        rows.append({
+            "category_a": a,
+            "category_b": b,
+            "orders": both,
+            "support": both / n,
+            "confidence_a_to_b": both / singles[a],
+            "confidence_b_to_a": both / singles[b],
+            "confidence": max(both / singles[a], both / singles[b]),
+            "lift": (both / n) / ((singles[a] / n) * (singles[b] / n)),
+        })
+    return pd.DataFrame(rows).sort_values(["category_a", "category_b"], ignore_index=True)
+
+
+def brute_force_repeat(df):
+    lines = df.dropna().drop_duplicates()
+    orders = Counter(zip(lines["customer_unique_id"], lines["product_category_name_english"]))
+    customers, repeat = Counter(), Counter()
+    for (customer, category), n_orders in orders.items():
+        customers[category] += 1
+        repeat[category] += n_orders >= 2
+    return pd.DataFrame({
+        "category": sorted(customers),
+        "customers": [customers[c] for c in sorted(customers)],
+        "repeat_customers": [repeat[c] for c in sorted(customers)],
+    }).assign(repeat_rate=lambda d: d["repeat_customers"] / d["customers"])
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_pairs_match_brute_force(seed):
+    df = order_lines(seed=seed)
+    stats = BasketStats(df)
+    expected = brute_force_pairs(df)
+    result = stats.top_pairs(k=len(expected) + 10).sort_values(["category_a", "category_b"], ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert stats.n_orders == df.dropna()["order_id"].nunique()
+
+
+@pytest.mark.parametrize("metric", list(PAIR_METRICS))
+@pytest.mark.parametrize("k, min_orders", [(3, 1), (5, 20), (100, 1000)])
+def test_top_pairs_ranking(metric, k, min_orders):
+    df = order_lines()
+    expected = brute_force_pairs(df)
+    expected = expected[expected["orders"] >= min_orders].sort_values([metric, "orders"], ascending=False)
+    result = BasketStats(df).top_pairs(metric, k=k, min_orders=min_orders)
+    assert len(result) == min(k, len(expected))
+    np.testing.assert_allclose(result[metric], expected[metric].head(k))
+
+
+@pytest.mark.parametrize("min_customers", [1, 15])
+def test_category_repeat_matches_brute_force(min_customers):
+    df = order_lines()
+    expected = brute_force_repeat(df)
+    expected = expected[expected["customers"] >= min_customers]
+    result = BasketStats(df).category_repeat(min_customers)
+    assert result["repeat_rate"].is_monotonic_decreasing
+    pd.testing.assert_frame_equal(
+        result.sort_values("category", ignore_index=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_repeat_summary_matches_brute_force():
+    df = order_lines()
+    lines = df.dropna()
+    orders_per_customer = lines.groupby("customer_unique_id")["order_id"].nunique()
+    repeat = brute_force_repeat(df)
+    summary = BasketStats(df).repeat_summary()
+    assert summary["customers"] == len(orders_per_customer)
+    assert summary["multi_order_customers"] == (orders_per_customer >= 2).sum()
+    same_category = lines.drop_duplicates().groupby(["customer_unique_id", "product_category_name_english"]).size()
+    assert summary["same_category_customers"] == same_category[same_category >= 2].index.get_level_values(0).nunique()
+    assert repeat["repeat_customers"].sum() == (same_category >= 2).sum()
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from charts import MIN_POINTS, FigureTooLarge, build_figure, downsample, lttb, payload_size
+
+
+def series(n=10_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.sort(rng.uniform(0, 1000, size=n))
+    y = np.cumsum(rng.normal(size=n))
+    return x, y
+
+
+@pytest.mark.parametrize("n, max_points", [(10_000, 2000), (10_000, 3), (1001, 100), (5, 3)])
+def test_lttb_keeps_endpoints_and_count(n, max_points):
+    x, y = series(n)
+    kept = lttb(x, y, max_points)
+    assert len(kept) == max_points
+    assert kept[0] == 0 and kept[-1] == n - 1
+    # Positions in order, one per bucket
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_short_series_is_kept_whole():
+    x, y = series(50)
+    np.testing.assert_array_equal(lttb(x, y, 50), np.arange(50))
+    np.testing.assert_array_equal(lttb(x, y, 2000), np.arange(50))
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(10_000, dtype="float64")
+    y = np.zeros(10_000)
+    y[[1234, 5678]] = [100, -100]
+    kept = lttb(x, y, 200)
+    assert {1234, 5678} <= set(kept)
+
+
+def test_downsample_per_trace():
+    x, y = series(6000)
+    df = pd.DataFrame({"x": x, "y": y, "trace": np.repeat(["a", "b", "c"], 2000)})
+    df.loc[::100, "y"] = np.nan
+    sampled = downsample(df, "x", "y", max_points=300, by="trace")
+    assert sampled["y"].notna().all()
+    assert sampled.groupby("trace").size().to_dict() == {"a": 300, "b": 300, "c": 300}
+    assert len(downsample(df.head(100), "x", "y", max_points=300)) == 99
+
+
+def scatter(df, max_points=None):
+    sample = df if max_points is None else downsample(df, "x", "y", max_points)
+    return go.Figure(go.Scatter(x=sample["x"], y=sample["y"], mode="markers"))
+
+
+def test_build_figure_decimates_until_within_budget():
+    x, y = series(20_000)
+    df = pd.DataFrame({"x": x, "y": y})
+    budget = payload_size(scatter(df, max_points=500)) + 100
+    fig = build_figure(scatter, df, budget=budget)
+    assert payload_size(fig) <= budget
+    assert MIN_POINTS <= len(fig.data[0].x) <= 500
+
+
+def test_build_figure_over_budget_raises():
+    x, y = series(20_000)
+    df = pd.DataFrame({"x": x, "y": y})
+
+    def all_points(df):
+        # No max_points, so the figure cannot be decimated
+        return go.Figure(go.Scatter(x=df["x"], y=df["y"], mode="markers"))
+
+    assert payload_size(build_figure(all_points, df.head(10), budget=100_000)) <= 100_000
+    with pytest.raises(FigureTooLarge):
+        build_figure(all_points, df, budget=100_000)
+    # Still over the budget at MIN_POINTS
+    with pytest.raises(FigureTooLarge):
+        build_figure(scatter, df, budget=1000)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from clustering import cluster_profile, cluster_rfm, minibatch_kmeans, silhouette_score, standardize
+
+
+def blobs(centers, n_per_blob=500, spread=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = np.asarray(centers, dtype="float64")
+    truth = np.repeat(np.arange(len(centers)), n_per_blob)
+    points = centers[truth] + rng.normal(scale=spread, size=(len(truth), centers.shape[1]))
+    order = rng.permutation(len(truth))
+    return points[order], truth[order]
+
+
+def assert_same_partition(labels, truth):
+    # Every true group is one cluster and every cluster one true group
+    pairs = pd.crosstab(truth, labels)
+    assert ((pairs > 0).sum(axis=1) == 1).all()
+    assert ((pairs > 0).sum(axis=0) == 1).all()
+
+
+def brute_force_silhouette(points, labels):
+    scores = []
+    for i, point in enumerate(points):
+        distances = np.sqrt(((points - point) ** 2).sum(axis=1))
+        own = (labels == labels[i]) & (np.arange(len(points)) != i)
+        if not own.any():
+            scores.append(0.0)
+            continue
+        a = distances[own].mean()
+        b = min(distances[labels == other].mean() for other in np.unique(labels) if other != labels[i])
+        scores.append((b - a) / max(a, b))
+    return np.mean(scores)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_minibatch_kmeans_recovers_blobs(seed):
+    true_centers = [[0, 0, 0], [8, 0, 0], [0, 8, 0], [0, 0, 8], [8, 8, 8]]
+    points, truth = blobs(true_centers, seed=seed)
+    centers, labels = minibatch_kmeans(points, k=5, seed=seed, batch_size=256)
+    assert_same_partition(labels, truth)
+    # Each center lands on the mean of its blob
+    for label in range(5):
+        np.testing.assert_allclose(centers[label], points[labels == label].mean(axis=0), atol=0.1)
+
+
+def test_silhouette_matches_brute_force():
+    points, truth = blobs([[0, 0], [3, 0], [0, 3]], n_per_blob=80, spread=1.0)
+    # A single point cluster has a silhouette of 0
+    labels = truth.copy()
+    labels[0] = 7
+    for candidate in (truth, labels, np.arange(len(points)) % 4):
+        assert silhouette_score(points, candidate) == pytest.approx(brute_force_silhouette(points, candidate))
+    assert np.isnan(silhouette_score(points, np.zeros(len(points), dtype="int64")))
+
+
+def test_silhouette_of_sample():
+    points, truth = blobs([[0, 0], [10, 0]], n_per_blob=2000)
+    score = silhouette_score(points, truth, sample_size=500, seed=3)
+    assert 0.9 < score <= 1
+    rows = np.random.default_rng(3).choice(len(points), 500, replace=False)
+    assert score == pytest.approx(brute_force_silhouette(points[rows], truth[rows]))
+
+
+def test_cluster_rfm_recovers_groups():
+    rng = np.random.default_rng(0)
+    n = 400
+    # Lost, regular and top customers, far apart in recency and (log) frequency and spend
+    group = np.repeat([0, 1, 2], n)
+    rfm_df = pd.DataFrame({
+        "customer_unique_id": [f"person-{i:04d}" for i in range(3 * n)],
+        "recency": np.array([500, 200, 20])[group] + rng.normal(scale=10, size=3 * n),
+        "frequency": np.array([1, 4, 20])[group],
+        "monetary": np.array([40, 400, 4000])[group] * rng.lognormal(sigma=0.1, size=3 * n),
+        "RFM_score": np.array([0.8, 2.7, 4.6])[group] + rng.uniform(-0.2, 0.2, size=3 * n),
+    })
+
+    clusters, silhouette = cluster_rfm(rfm_df, k=3)
+
+    # Numbered by decreasing RFM score: top customers are cluster 1
+    np.testing.assert_array_equal(clusters, 3 - group)
+    points = standardize(rfm_df)
+    np.testing.assert_allclose(points.mean(axis=0), 0, atol=1e-12)
+    np.testing.assert_allclose(points.std(axis=0), 1)
+    # Fewer customers than the silhouette sample, so every one is used
+    assert silhouette == pytest.approx(brute_force_silhouette(points, clusters))
+    assert silhouette > 0.8
+
+    profile = cluster_profile(rfm_df, clusters)
+    assert profile["cluster"].tolist() == [1, 2, 3]
+    assert profile["customers"].tolist() == [n, n, n]
+    assert profile["RFM_score"].is_monotonic_decreasing
+
+
+def test_cluster_rfm_of_no_customers():
+    clusters, silhouette = cluster_rfm(pd.DataFrame(columns=["recency", "frequency", "monetary", "RFM_score"]), k=3)
+    assert len(clusters) == 0
+    assert np.isnan(silhouette)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cohorts
+from cohorts import _cohort_counts, cohort_matrix
+from conftest import all_data_frame
+
+
+def expected_counts(customers, months):
+    # Customers of every cohort buying n months after their first purchase, with a groupby
+    df = pd.DataFrame({"customer": customers, "month": months}).drop_duplicates()
+    first = df.groupby("customer")["month"].transform("min")
+    n_months = months.max() - months.min() + 1
+    counts = pd.crosstab(first - months.min(), df["month"] - first)
+    counts = counts.reindex(index=range(n_months), columns=range(n_months), fill_value=0).to_numpy(dtype="float64")
+    counts[np.add.outer(np.arange(n_months), np.arange(n_months)) >= n_months] = np.nan
+    return counts
+
+
+@pytest.fixture(params=["bitmap", "sorted keys"])
+def dedupe(request, monkeypatch):
+    if request.param == "sorted keys":
+        monkeypatch.setattr(cohorts, "MAX_BITMAP_CELLS", 0)
+    return request.param
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_cohort_counts_match_groupby(dedupe, seed):
+    rng = np.random.default_rng(seed)
+    n = 5000
+    # Customer codes with gaps, repeat purchases in one month, months since year 0
+    customers = rng.integers(0, 800, size=n) * 3
+    months = 2017 * 12 + rng.integers(0, 20, size=n)
+    counts, labels = _cohort_counts(customers, months)
+    np.testing.assert_array_equal(counts, expected_counts(customers, months))
+    assert labels[0] == f"2017-{months.min() % 12 + 1:02d}"
+    assert len(labels) == months.max() - months.min() + 1
+
+
+def test_cohort_matrix_matches_groupby(dedupe):
+    df = all_data_frame()
+    df["order_purchase_timestamp"] = pd.to_datetime(df["order_purchase_timestamp"])
+    matrix = cohort_matrix(df)
+
+    known = df.dropna(subset=["order_purchase_timestamp"])
+    month = known["order_purchase_timestamp"].dt.to_period("M")
+    cohort = month.groupby(known["customer_unique_id"]).transform("min")
+    sizes = known.assign(cohort=cohort.astype(str)).groupby("cohort")["customer_unique_id"].nunique()
+    pd.testing.assert_series_equal(matrix.sizes, sizes, check_names=False)
+
+    # Retention one month later: customers of the cohort buying in the next month
+    active = known.assign(cohort=cohort, month=month).drop_duplicates(["customer_unique_id", "month"])
+    next_month = active[active["month"] == active["cohort"] + 1].groupby(active["cohort"].astype(str)).size()
+    observed = matrix.counts[1].dropna()
+    pd.testing.assert_series_equal(observed, next_month.reindex(observed.index, fill_value=0).astype("float64"), check_names=False)
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from cube import AGGREGATES, _compute_filtered, _compute_live, compute_aggregate, load_aggregate, materialize
+from data_loader import data_version, load_all_data
+from filters import Filters
+
+
+def assert_same_aggregate(result, expected):
+    # Categorical columns come back from Parquet as strings or categoricals, compare the values
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True).astype({col: str for col in result.select_dtypes(["category", "object", "string"])}),
+        expected.reset_index(drop=True).astype({col: str for col in expected.select_dtypes(["category", "object", "string"])}),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("name", sorted(AGGREGATES))
+def test_materialized_aggregate_matches_live(all_data_dir, name):
+    cube_dir = str(all_data_dir / "data" / "cube")
+    materialize(cube_dir)
+    expected = _compute_live(name, data_version())
+    assert_same_aggregate(load_aggregate(name, cube_dir=cube_dir), expected)
+    assert_same_aggregate(expected, compute_aggregate(name, load_all_data(columns=AGGREGATES[name][0])))
+
+
+@pytest.mark.parametrize("name", sorted(AGGREGATES))
+def test_filtered_aggregate_matches_masked_rows(all_data_dir, name):
+    cube_dir = str(all_data_dir / "data" / "cube")
+    materialize(cube_dir)
+    filters = Filters(start=pd.Timestamp("2017-06-01").date(), states=("RJ", "SP"))
+    df = load_all_data(columns=AGGREGATES[name][0] + ["order_purchase_timestamp", "customer_state"])
+    mask = (df["order_purchase_timestamp"] >= "2017-06-01") & df["customer_state"].isin(filters.states)
+    result = load_aggregate(name, filters, cube_dir=cube_dir)
+    assert_same_aggregate(result, _compute_filtered(name, data_version(), filters))
+    assert_same_aggregate(result, compute_aggregate(name, df[mask]))
+
+
+def test_stale_cube_is_not_used(all_data_dir):
+    cube_dir = str(all_data_dir / "data" / "cube")
+    materialize(cube_dir)
+    # Rewriting all_data changes its version, so the cube no longer applies
+    df = pd.read_csv(all_data_dir / "data" / "all_data.csv")
+    df[df["order_status"] != "canceled"].to_csv(all_data_dir / "data" / "all_data.csv", index=False)
+    assert "canceled" not in set(load_aggregate("order_status_counts", cube_dir=cube_dir)["order_status"].astype(str))
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from delivery import BIN_SECONDS, PERCENTILES, DeliveryStats, DurationHistogram
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_quantile_within_one_bin_of_numpy(seed):
+    rng = np.random.default_rng(seed)
+    # Skewed delivery times of a few days to a few weeks
+    seconds = rng.gamma(2.0, 4 * 86400, size=5000)
+    histogram = DurationHistogram()
+    # Batches add up to the histogram of all values
+    for batch in np.array_split(seconds, 7):
+        histogram.add(batch)
+    q = np.array([0.01, 0.1] + PERCENTILES)
+    np.testing.assert_allclose(histogram.quantile(q), np.quantile(seconds, q), atol=BIN_SECONDS)
+
+
+def test_quantile_of_empty_and_missing_values():
+    histogram = DurationHistogram().add([np.nan])
+    assert histogram.total == 0
+    assert np.isnan(histogram.quantile(PERCENTILES)).all()
+    combined = DurationHistogram().add([86400, np.nan]) + DurationHistogram().add([3 * 86400])
+    assert combined.total == 2
+    assert combined.quantile(0.5) == pytest.approx(86400, abs=BIN_SECONDS)
+
+
+def test_delivery_stats_matches_groupby():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        "order_id": [f"order-{i // 2:04d}" for i in range(n)],
+        "seller_id": rng.choice(["seller-a", "seller-b", "seller-c"], size=n),
+        "customer_state": np.repeat(rng.choice(["SP", "RJ", "MG"], size=n // 2), 2),
+        "order_purchase_timestamp": np.repeat(
+            pd.Timestamp("2017-11-15") + pd.to_timedelta(rng.integers(0, 200 * 86400, size=n // 2), unit="s"), 2
+        ),
+        "shipping_time_seconds": np.repeat(rng.normal(5 * 86400, 6 * 86400, size=n // 2).round(), 2),
+        "shipping_duration_seconds": np.repeat(rng.uniform(86400, 30 * 86400, size=n // 2).round(), 2),
+    })
+    df.loc[df.index % 20 < 2, ["shipping_time_seconds", "shipping_duration_seconds"]] = np.nan
+
+    stats = DeliveryStats(df)
+
+    orders = df.drop_duplicates("order_id")
+    month = orders["order_purchase_timestamp"].dt.strftime("%Y-%m")
+    assert stats.months == sorted(month.unique())
+    by_month = stats.by_month().set_index("month")
+    delivered = orders["shipping_time_seconds"].notna()
+    expected = pd.DataFrame({
+        "delivered": delivered.groupby(month).sum(),
+        "late": (orders["shipping_time_seconds"] < 0).groupby(month).sum(),
+    })
+    pd.testing.assert_frame_equal(by_month[["delivered", "late"]], expected, check_dtype=False, check_names=False)
+
+    seller_lines = df.drop_duplicates(["order_id", "seller_id"])
+    lines_2018 = seller_lines[seller_lines["order_purchase_timestamp"] >= "2018-01-01"]
+    months = [m for m in stats.months if m >= "2018-01"]
+    by_seller = stats.by_seller(months=months).set_index("seller_id")
+    assert by_seller["late"].to_dict() == (lines_2018["shipping_time_seconds"] < 0).groupby(lines_2018["seller_id"]).sum().to_dict()
+
+    summary = stats.summary(states=["RJ"], months=["2017-11"])
+    rj = orders[(orders["customer_state"] == "RJ") & (month == "2017-11")]
+    assert summary["orders"] == len(rj)
+    assert summary["delivered"] == rj["shipping_time_seconds"].notna().sum()
+
+
+def test_summary_of_empty_selection():
+    df = pd.DataFrame({
+        "order_id": ["order-1"],
+        "seller_id": ["seller-a"],
+        "customer_state": ["SP"],
+        "order_purchase_timestamp": pd.to_datetime(["2018-01-05"]),
+        "shipping_time_seconds": [np.nan],
+        "shipping_duration_seconds": [np.nan],
+    })
+    summary = DeliveryStats(df).summary()
+    assert summary["delivered"] == 0
+    assert np.isnan(summary["late_rate"])
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from distance import EARTH_RADIUS_KM, haversine_km, order_distances
+
+# City centres (lat, lng)
+SAO_PAULO = (-23.5505, -46.6333)
+RIO_DE_JANEIRO = (-22.9068, -43.1729)
+BRASILIA = (-15.7939, -47.8828)
+MANAUS = (-3.1190, -60.0217)
+
+
+@pytest.mark.parametrize("origin, destination, km", [
+    (SAO_PAULO, RIO_DE_JANEIRO, 360),
+    (SAO_PAULO, BRASILIA, 873),
+    (BRASILIA, MANAUS, 1935),
+])
+def test_haversine_km_between_cities(origin, destination, km):
+    # Published great-circle distances, within 1%
+    assert haversine_km(*origin, *destination) == pytest.approx(km, rel=0.01)
+    assert haversine_km(*destination, *origin) == pytest.approx(km, rel=0.01)
+
+
+def test_haversine_km_edge_cases():
+    assert haversine_km(*SAO_PAULO, *SAO_PAULO) == 0
+    # Half the circumference between antipodes
+    assert haversine_km(0, 0, 0, 180) == pytest.approx(np.pi * EARTH_RADIUS_KM)
+    distances = haversine_km([SAO_PAULO[0], BRASILIA[0]], [SAO_PAULO[1], BRASILIA[1]], RIO_DE_JANEIRO[0], RIO_DE_JANEIRO[1])
+    assert distances.shape == (2,)
+    assert distances[0] == pytest.approx(haversine_km(*SAO_PAULO, *RIO_DE_JANEIRO))
+
+
+@pytest.mark.parametrize("zip_dtype", ["object", "category"])
+def test_order_distances(zip_dtype):
+    centroids = pd.DataFrame(
+        {"geolocation_lat": [SAO_PAULO[0], RIO_DE_JANEIRO[0], BRASILIA[0]],
+         "geolocation_lng": [SAO_PAULO[1], RIO_DE_JANEIRO[1], BRASILIA[1]]},
+        index=pd.Index(["1037", "20040", "70040"]),
+    )
+    sellers_df = pd.DataFrame({
+        "seller_id": ["seller-sp", "seller-rj", "seller-nowhere"],
+        "seller_zip_code_prefix": ["1037", "20040", "99999"],
+    })
+    all_df = pd.DataFrame({
+        "order_id": ["order-1", "order-2", "order-3", "order-4", "order-5"],
+        "seller_id": ["seller-sp", "seller-rj", "seller-sp", "seller-nowhere", "seller-unknown"],
+        "customer_zip_code_prefix": pd.Series(["20040", "70040", None, "1037", "1037"], dtype=zip_dtype),
+        "shipping_duration": pd.to_timedelta(["2 days", "36 hours", "1 day", None, "3 days"]),
+        "freight_value": [10.0, 20.0, 30.0, 40.0, 50.0],
+    })
+
+    result = order_distances(all_df, sellers_df, centroids)
+
+    np.testing.assert_allclose(result["distance_km"].to_numpy()[:2], [
+        haversine_km(*RIO_DE_JANEIRO, *SAO_PAULO),
+        haversine_km(*BRASILIA, *RIO_DE_JANEIRO),
+    ])
+    # Missing customer prefix, seller prefix without centroid, unknown seller
+    assert result["distance_km"].iloc[2:].isna().all()
+    np.testing.assert_allclose(result["shipping_days"].to_numpy(), [2, 1.5, 1, np.nan, 3])
+    assert result["order_id"].tolist() == all_df["order_id"].tolist()
+    assert result["freight_value"].tolist() == all_df["freight_value"].tolist()
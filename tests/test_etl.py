@@ -0,0 +1,222 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import SECONDS_COLUMNS, build_all_data
+from schema import TABLE_FILES
+
+
+def raw_tables(n_orders=400, n_customers=150, n_products=60, seed=0):
+    # Small raw Olist extract in the layout of the original CSVs
+    rng = np.random.default_rng(seed)
+    categories = ["cama_mesa_banho", "beleza_saude", "pc_gamer", "esporte_lazer"]
+    products = pd.DataFrame({
+        "product_id": [f"product-{i:03d}" for i in range(n_products)],
+        "product_category_name": rng.choice(categories + [None], size=n_products),
+        "product_name_lenght": rng.integers(10, 60, size=n_products).astype(float),
+        "product_description_lenght": rng.integers(50, 2000, size=n_products).astype(float),
+        "product_photos_qty": rng.integers(1, 6, size=n_products).astype(float),
+        "product_weight_g": rng.integers(100, 5000, size=n_products).astype(float),
+        "product_length_cm": rng.integers(10, 80, size=n_products).astype(float),
+        "product_height_cm": rng.integers(2, 60, size=n_products).astype(float),
+        "product_width_cm": rng.integers(10, 60, size=n_products).astype(float),
+    })
+    # Missing sizes, with an even number of known values so the medians can be fractional
+    products.iloc[:4, 2:] = np.nan
+    translation = pd.DataFrame({
+        "product_category_name": categories[:2] + categories[3:],
+        "product_category_name_english": ["bed_bath_table", "health_beauty", "sports_leisure"],
+    })
+
+    customer_ids = [f"customer-{i:04d}" for i in range(n_customers)]
+    customers = pd.DataFrame({
+        "customer_id": customer_ids,
+        # Some people order with several customer ids
+        "customer_unique_id": [f"person-{i % (n_customers // 2):04d}" for i in range(n_customers)],
+        "customer_zip_code_prefix": rng.integers(1000, 99999, size=n_customers),
+        "customer_city": rng.choice(["sao paulo", "rio de janeiro", "curitiba"], size=n_customers),
+        "customer_state": rng.choice(["SP", "RJ", "PR"], size=n_customers),
+    })
+
+    purchase = pd.Timestamp("2017-01-01") + pd.to_timedelta(rng.integers(0, 500 * 86400, size=n_orders), unit="s")
+    delivered = purchase + pd.to_timedelta(rng.integers(2 * 86400, 30 * 86400, size=n_orders), unit="s")
+    delivered = pd.Series(delivered).where(rng.random(n_orders) > 0.1)
+    orders = pd.DataFrame({
+        "order_id": [f"order-{i:05d}" for i in range(n_orders)],
+        "customer_id": rng.choice(customer_ids, size=n_orders),
+        "order_status": rng.choice(["delivered", "shipped", "canceled"], size=n_orders, p=[0.8, 0.1, 0.1]),
+        "order_purchase_timestamp": purchase,
+        "order_approved_at": purchase + pd.Timedelta(hours=1),
+        "order_delivered_carrier_date": purchase + pd.Timedelta(days=1),
+        "order_delivered_customer_date": delivered,
+        # Whole days, like the real estimated dates
+        "order_estimated_delivery_date": purchase.normalize() + pd.Timedelta(days=20),
+    })
+
+    # Orders without items are dropped by the inner merge
+    items = []
+    for order_id in orders["order_id"][rng.random(n_orders) > 0.05]:
+        for item_id in range(1, rng.integers(1, 5)):
+            product = rng.integers(n_products) if item_id == 1 or rng.random() < 0.5 else None
+            items.append((order_id, item_id, product))
+    items = pd.DataFrame(items, columns=["order_id", "order_item_id", "product"])
+    items["product"] = items["product"].ffill().astype(int)
+    order_items = pd.DataFrame({
+        "order_id": items["order_id"],
+        "order_item_id": items["order_item_id"],
+        "product_id": products["product_id"].to_numpy()[items["product"]],
+        "seller_id": rng.choice(["seller-a", "seller-b", "seller-c"], size=len(items)),
+        "shipping_limit_date": pd.Timestamp("2017-06-01 12:30:00"),
+        "price": rng.uniform(5, 300, size=len(items)).round(2),
+        "freight_value": rng.uniform(5, 40, size=len(items)).round(2),
+    })
+
+    # Some orders have no review, some two
+    reviewed = rng.choice(orders["order_id"], size=int(n_orders * 1.05))
+    reviews = pd.DataFrame({
+        "review_id": [f"review-{i:05d}" for i in range(len(reviewed))],
+        "order_id": reviewed,
+        "review_score": rng.integers(1, 6, size=len(reviewed)),
+        "review_comment_title": rng.choice(["recomendo", None], size=len(reviewed), p=[0.1, 0.9]),
+        "review_comment_message": rng.choice(["bom", "ruim", None], size=len(reviewed)),
+        "review_creation_date": pd.Timestamp("2017-07-01"),
+        "review_answer_timestamp": pd.Timestamp("2017-07-02 10:11:12"),
+    })
+    return {
+        "products": products,
+        "product_category_name_translation": translation,
+        "customers": customers,
+        "orders": orders,
+        "order_items": order_items,
+        "order_reviews": reviews,
+    }
+
+
+def map_customer_segment(score):
+    if score > 3:
+        return "Top Customers"
+    elif score > 2.5:
+        return "High Value Customers"
+    elif score > 2:
+        return "Mid Value Customers"
+    elif score > 1:
+        return "Low Value Customers"
+    else:
+        return "Lost Customers"
+
+
+def notebook_all_data(data_dir):
+    # The notebook's preparation of all_data, cell by cell, on the raw CSVs
+    read = lambda table: pd.read_csv(os.path.join(data_dir, TABLE_FILES[table]))
+    customers_df = read("customers")
+    order_items_df = read("order_items")
+    order_reviews_df = read("order_reviews")
+    orders_df = read("orders")
+    products_df = read("products")
+    products_df = products_df.merge(read("product_category_name_translation"), on="product_category_name", how="left")
+
+    customers_df["customer_zip_code_prefix"] = customers_df["customer_zip_code_prefix"].astype(str)
+
+    for col in ["order_purchase_timestamp", "order_approved_at", "order_delivered_carrier_date",
+                "order_delivered_customer_date", "order_estimated_delivery_date"]:
+        orders_df[col] = pd.to_datetime(orders_df[col])
+    orders_df["shipping_time"] = orders_df["order_estimated_delivery_date"] - orders_df["order_delivered_customer_date"]
+    orders_df["shipping_duration"] = orders_df["order_delivered_customer_date"] - orders_df["order_purchase_timestamp"]
+    orders_df["estimated_duration"] = orders_df["order_estimated_delivery_date"] - orders_df["order_purchase_timestamp"]
+    orders_df["order_delivered_customer_date"] = orders_df["order_delivered_customer_date"].ffill()
+
+    order_items_df["order_item_id"] = order_items_df["order_item_id"].astype(str)
+    order_items_df["shipping_limit_date"] = pd.to_datetime(order_items_df["shipping_limit_date"])
+    jumlah_df = order_items_df.groupby(by=["product_id", "order_id"]).agg({
+        "order_item_id": "count",
+        "seller_id": "first",
+        "shipping_limit_date": "first",
+        "price": "first",
+        "freight_value": "first",
+    }).reset_index()
+    jumlah_df.rename(columns={"order_item_id": "quantity"}, inplace=True)
+
+    order_reviews_df["review_creation_date"] = pd.to_datetime(order_reviews_df["review_creation_date"])
+    order_reviews_df["review_answer_timestamp"] = pd.to_datetime(order_reviews_df["review_answer_timestamp"])
+    order_reviews_cleaned_df = order_reviews_df.fillna({
+        "review_comment_title": "No review",
+        "review_comment_message": "No review",
+    })
+    order_reviews_df = pd.merge(order_reviews_df, order_reviews_cleaned_df, how="left", suffixes=("", "_cleaned"))
+
+    products_df.rename(columns={
+        "product_name_lenght": "product_name_length",
+        "product_description_lenght": "product_description_length",
+    }, inplace=True)
+    products_df["product_category_name"] = products_df["product_category_name"].fillna("not defined")
+    products_df["product_category_name_english"] = products_df["product_category_name_english"].fillna("not defined")
+    products_df["product_category_name_english"] = np.where(
+        products_df["product_category_name"] == "pc_gamer", "PC Gaming", products_df["product_category_name_english"]
+    )
+    products_df["product_category_name_english"] = np.where(
+        products_df["product_category_name"] == "portateis_cozinha_e_preparadores_de_alimentos",
+        "portable kitchen food preparers",
+        products_df["product_category_name_english"],
+    )
+    size_columns = ["product_name_length", "product_description_length", "product_photos_qty", "product_weight_g",
+                    "product_length_cm", "product_height_cm", "product_width_cm"]
+    for col in size_columns:
+        products_df[col] = products_df[col].fillna(products_df[col].median())
+    products_df[size_columns] = products_df[size_columns].astype(int)
+
+    merged_sales_data = orders_df.merge(jumlah_df, on="order_id", how="inner")
+    merged_sales_data = merged_sales_data.merge(products_df, on="product_id", how="inner")
+    merged_sales_data = merged_sales_data.merge(order_reviews_df, on="order_id", how="left")
+    all_df = merged_sales_data.merge(customers_df, on="customer_id", how="left")
+    all_df["total_price"] = all_df["quantity"] * all_df["price"]
+
+    rfm_df = all_df.groupby("customer_unique_id", as_index=False).agg(
+        {"order_purchase_timestamp": "max", "order_id": "nunique", "total_price": "sum"}
+    )
+    rfm_df.columns = ["customer_unique_id", "last_order_date", "frequency", "monetary"]
+    recent_date = pd.to_datetime(orders_df["order_purchase_timestamp"].dt.date.max())
+    rfm_df["recency"] = (recent_date - rfm_df["last_order_date"]).dt.days
+    rfm_df.drop("last_order_date", axis=1, inplace=True)
+    rfm_df["color"] = rfm_df["customer_unique_id"]
+    rfm_df["r_rank"] = rfm_df["recency"].rank(ascending=False)
+    rfm_df["f_rank"] = rfm_df["frequency"].rank(ascending=True)
+    rfm_df["m_rank"] = rfm_df["monetary"].rank(ascending=True)
+    for col in ["r_rank", "f_rank", "m_rank"]:
+        rfm_df[f"{col}_norm"] = (rfm_df[col] / rfm_df[col].max()) * 100
+    rfm_df.drop(["r_rank", "f_rank", "m_rank"], axis=1, inplace=True)
+    rfm_df["RFM_score"] = (
+        0.15 * rfm_df["r_rank_norm"] + 0.28 * rfm_df["f_rank_norm"] + 0.57 * rfm_df["m_rank_norm"]
+    ) * 0.05
+    rfm_df["RFM_score"] = rfm_df["RFM_score"].round(2)
+    rfm_df["customer_segment"] = rfm_df["RFM_score"].apply(map_customer_segment)
+    rfm_df.drop(["r_rank_norm", "f_rank_norm", "m_rank_norm"], axis=1, inplace=True)
+    return all_df.merge(rfm_df, on="customer_unique_id", how="left")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for table, df in raw_tables().items():
+        df.to_csv(tmp_path / TABLE_FILES[table], index=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize("chunksize, buckets", [(1000, 1), (37, 4), (50, 7)])
+def test_build_all_data_matches_notebook(data_dir, tmp_path, chunksize, buckets):
+    out_path = tmp_path / "all_data.csv"
+    expected_path = tmp_path / "expected.csv"
+    notebook_all_data(data_dir).to_csv(expected_path, index=False)
+
+    rows = build_all_data(str(data_dir), str(out_path), chunksize=chunksize, buckets=buckets, log=lambda message: None)
+
+    # Same text as the notebook's CSV, apart from the duration seconds the ETL adds
+    with open(out_path, newline="") as f:
+        result = list(csv.reader(f))
+    with open(expected_path, newline="") as f:
+        expected = list(csv.reader(f))
+    assert rows == len(expected) - 1
+    assert set(result[0]) - set(expected[0]) == set(SECONDS_COLUMNS)
+    keep = [result[0].index(col) for col in expected[0]]
+    assert [[row[i] for i in keep] for row in result] == expected
@@ -0,0 +1,80 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import all_data_frame
+from data_loader import load_all_data
+from filters import FILTER_COLUMNS, Filters, RowIndex, date_range, selected_order_ids, selected_rows
+
+D = datetime.date
+
+CASES = [
+    Filters(start=D(2017, 6, 1)),
+    Filters(end=D(2017, 6, 1)),
+    Filters(start=D(2017, 3, 15), end=D(2018, 2, 28)),
+    Filters(start=D(2017, 3, 15), end=D(2017, 3, 15)),
+    Filters(states=("RJ",)),
+    Filters(states=("MG", "SP")),
+    Filters(categories=("toys",)),
+    Filters(categories=("health_beauty", "watches_gifts")),
+    Filters(start=D(2017, 6, 1), states=("RJ", "SP"), categories=("bed_bath_table", "toys")),
+    Filters(end=D(2018, 1, 31), categories=("sports_leisure",)),
+    # Empty selections
+    Filters(states=("XX",)),
+    Filters(start=D(2020, 1, 1)),
+    Filters(end=D(2016, 1, 1)),
+    Filters(start=D(2018, 1, 1), end=D(2017, 1, 1)),
+    Filters(states=("BA",), categories=("unknown",)),
+]
+
+
+def expected_rows(df, filters):
+    # Plain boolean mask over the rows
+    mask = np.ones(len(df), dtype=bool)
+    timestamps = df["order_purchase_timestamp"]
+    if filters.start:
+        mask &= (timestamps >= pd.Timestamp(filters.start)).to_numpy()
+    if filters.end:
+        mask &= (timestamps < pd.Timestamp(filters.end) + pd.Timedelta(days=1)).to_numpy()
+    if filters.states:
+        mask &= df["customer_state"].isin(filters.states).to_numpy()
+    if filters.categories:
+        mask &= df["product_category_name_english"].isin(filters.categories).to_numpy()
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.parametrize("filters", CASES)
+def test_row_index_select_matches_mask(filters):
+    df = all_data_frame()
+    df["order_purchase_timestamp"] = pd.to_datetime(df["order_purchase_timestamp"])
+    np.testing.assert_array_equal(RowIndex(df).select(filters), expected_rows(df, filters))
+
+
+@pytest.mark.parametrize("filters", CASES)
+def test_date_range_matches_mask(filters):
+    timestamps = np.sort(pd.to_datetime(all_data_frame()["order_purchase_timestamp"]).to_numpy())
+    lo, hi = date_range(timestamps, filters)
+    mask = expected_rows(pd.DataFrame({"order_purchase_timestamp": timestamps}), filters._replace(states=(), categories=()))
+    np.testing.assert_array_equal(np.arange(lo, max(lo, hi)), mask)
+
+
+def test_row_index_without_filters():
+    index = RowIndex(all_data_frame())
+    assert index.select(Filters()) is None
+    assert index.states == ["BA", "MG", "PR", "RJ", "SP"]
+    assert "None" not in index.categories
+
+
+@pytest.mark.parametrize("filters", CASES)
+def test_selected_rows_matches_mask(all_data_dir, filters):
+    df = load_all_data(columns=FILTER_COLUMNS + ["order_id"])
+    rows = expected_rows(df, filters)
+    np.testing.assert_array_equal(selected_rows(filters), rows)
+    assert set(selected_order_ids(filters)) == set(df["order_id"].take(rows))
+
+
+def test_selected_rows_without_filters(all_data_dir):
+    assert selected_rows(Filters()) is None
+    assert selected_order_ids(Filters()) is None
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import load_all_data
+from filters import Filters
+from payments import QUANTILES, PaymentStats, payment_selection
+
+
+def payments_frame(order_ids, seed=0):
+    rng = np.random.default_rng(seed)
+    # Most orders paid once, some in several payments, plus orders unknown to all_data
+    orders = np.concatenate([order_ids, order_ids[rng.random(len(order_ids)) < 0.1], ["order-x1", "order-x2"]])
+    n = len(orders)
+    return pd.DataFrame({
+        "order_id": orders,
+        "payment_sequential": rng.integers(1, 4, size=n),
+        "payment_type": rng.choice(["credit_card", "boleto", "voucher", "debit_card"], size=n, p=[0.7, 0.2, 0.07, 0.03]),
+        "payment_installments": rng.integers(0, 11, size=n),
+        "payment_value": rng.uniform(0, 800, size=n).round(2),
+    })
+
+
+def expected_summary(df):
+    grouped = df.groupby("payment_type")["payment_value"]
+    expected = grouped.agg(count="size", total_value="sum", mean_value="mean")
+    for q in QUANTILES:
+        expected[f"p{round(q * 100)}"] = grouped.quantile(q)
+    return expected.reset_index()
+
+
+def expected_histogram(df, column):
+    counts = df.groupby(["payment_type", column]).size().rename("count").reset_index()
+    return counts[counts["count"] > 0].reset_index(drop=True)
+
+
+def assert_matches(stats, selection, df):
+    summary = stats.summary(selection)
+    pd.testing.assert_frame_equal(
+        summary.astype({"payment_type": str}), expected_summary(df), check_dtype=False, check_exact=False
+    )
+    for method, column in [("installments_histogram", "payment_installments"), ("sequential_histogram", "payment_sequential")]:
+        result = getattr(stats, method)(selection).astype({"payment_type": str})
+        pd.testing.assert_frame_equal(result, expected_histogram(df, column), check_dtype=False)
+
+
+def test_payment_stats_matches_groupby():
+    df = payments_frame(np.array([f"order-{i:05d}" for i in range(500)]))
+    stats = PaymentStats(df)
+    assert_matches(stats, None, df)
+
+    wanted = pd.Index(["order-00003", "order-00250", "order-00499", "order-x2", "not-a-payment"])
+    # The selection is over the payments sorted by type and value
+    order = np.lexsort((df["payment_value"].to_numpy(), pd.Categorical(df["payment_type"]).codes))
+    selection = stats.selection(wanted)
+    np.testing.assert_array_equal(selection, df["order_id"].take(order).isin(wanted).to_numpy())
+    assert_matches(stats, selection, df[df["order_id"].isin(wanted)])
+    assert not stats.selection(pd.Index([], dtype=object)).any()
+
+
+@pytest.mark.parametrize("filters", [
+    Filters(states=("RJ",)),
+    Filters(start=pd.Timestamp("2017-09-01").date(), categories=("toys", "health_beauty")),
+    Filters(states=("XX",)),
+])
+def test_payment_selection_follows_all_data(all_data_dir, filters):
+    all_df = load_all_data(columns=["order_id", "order_purchase_timestamp", "customer_state", "product_category_name_english"])
+    df = payments_frame(all_df["order_id"].unique())
+    df.to_csv(all_data_dir / "data" / "order_payments_dataset.csv", index=False)
+    stats = PaymentStats(df)
+
+    mask = pd.Series(True, index=all_df.index)
+    if filters.start:
+        mask &= all_df["order_purchase_timestamp"] >= pd.Timestamp(filters.start)
+    if filters.states:
+        mask &= all_df["customer_state"].isin(filters.states)
+    if filters.categories:
+        mask &= all_df["product_category_name_english"].isin(filters.categories)
+    selected = df[df["order_id"].isin(all_df.loc[mask, "order_id"])]
+
+    selection = payment_selection(filters)
+    assert selection.sum() == len(selected)
+    assert not selection.flags.writeable
+    assert_matches(stats, selection, selected)
+    assert payment_selection(Filters()) is None
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import all_data_frame
+from reviews import PRIOR_REVIEWS, REVIEW_COLUMNS, review_stats, score_distribution
+
+
+def review_lines(seed=0):
+    df = all_data_frame(seed=seed)
+    df["review_id"] = "review-" + df["order_id"]
+    # Some orders have a second review, repeated on every line of the order
+    rng = np.random.default_rng(seed)
+    second = df[df["order_id"].isin(df["order_id"].drop_duplicates().sample(frac=0.1, random_state=seed))].copy()
+    second["review_id"] = "second-" + second["order_id"]
+    second["review_score"] = second.groupby("order_id")["review_score"].transform(lambda s: rng.integers(1, 6))
+    return pd.concat([df, second], ignore_index=True)[REVIEW_COLUMNS]
+
+
+def expected_stats(df):
+    reviews = df.drop_duplicates(["order_id", "review_id", "product_category_name_english"])
+    reviews = reviews.dropna(subset=["product_category_name_english", "review_score"])
+    overall_mean = reviews["review_score"].mean()
+    grouped = reviews.groupby("product_category_name_english")["review_score"]
+    expected = pd.DataFrame({
+        "reviews": grouped.size(),
+        "review_score": grouped.mean(),
+        "bayesian_score": (PRIOR_REVIEWS * overall_mean + grouped.sum()) / (PRIOR_REVIEWS + grouped.size()),
+        "positive_share": grouped.apply(lambda s: (s >= 4).mean()),
+    })
+    for score in range(1, 6):
+        expected[f"score_{score}"] = grouped.apply(lambda s: (s == score).sum())
+    return expected
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_review_stats_matches_groupby(seed):
+    df = review_lines(seed)
+    result = review_stats(df)
+    assert result["bayesian_score"].is_monotonic_decreasing
+    result = result.set_index(result["product_category_name_english"].astype(str)).sort_index()
+    expected = expected_stats(df)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False, check_names=False)
+
+
+@pytest.mark.parametrize("positive, reviews, lower_bound", [
+    # 95% Wilson score interval lower bounds
+    (8, 10, 0.4902),
+    (50, 100, 0.4038),
+    (1, 1, 0.2065),
+    (100, 100, 0.9630),
+    (0, 10, 0.0),
+])
+def test_wilson_lower_bound(positive, reviews, lower_bound):
+    df = pd.DataFrame({
+        "order_id": [f"order-{i}" for i in range(reviews)],
+        "review_id": [f"review-{i}" for i in range(reviews)],
+        "product_category_name_english": "toys",
+        "review_score": [5] * positive + [2] * (reviews - positive),
+    })
+    result = review_stats(df).iloc[0]
+    assert result["positive_share"] == positive / reviews
+    assert result["positive_lower_bound"] == pytest.approx(lower_bound, abs=1e-4)
+
+
+def test_score_distribution_shares():
+    stats = review_stats(review_lines())
+    shares = score_distribution(stats)
+    totals = shares.groupby("product_category_name_english", observed=True)["share"].sum()
+    np.testing.assert_allclose(totals.to_numpy(), 1)
+    assert len(shares) == 5 * len(stats)
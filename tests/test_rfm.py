@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rfm import RFMStore, compute_rfm
+
+
+def order_lines(n_orders=2000, n_customers=300, seed=0):
+    # Order lines in the all_data layout, 1 to 3 lines per order
+    rng = np.random.default_rng(seed)
+    customers = rng.integers(n_customers, size=n_orders)
+    timestamps = pd.Timestamp("2017-01-01") + pd.to_timedelta(rng.integers(0, 600 * 86400, size=n_orders), unit="s")
+    lines = rng.integers(1, 4, size=n_orders)
+    order = np.repeat(np.arange(n_orders), lines)
+    return pd.DataFrame({
+        "customer_unique_id": pd.array([f"customer-{c}" for c in customers[order]], dtype="string[pyarrow]"),
+        "order_id": pd.array([f"order-{o}" for o in order], dtype="string[pyarrow]"),
+        "order_purchase_timestamp": timestamps[order],
+        "price": rng.uniform(5, 500, size=len(order)).round(2),
+        "quantity": rng.integers(1, 3, size=len(order)),
+    })
+
+
+def batches(df, n):
+    # Split into `n` batches of complete orders
+    order = pd.factorize(df["order_id"])[0]
+    return [df[order % n == i] for i in range(n)]
+
+
+def sorted_rfm(rfm_df):
+    return rfm_df.sort_values("customer_unique_id", ignore_index=True)
+
+
+@pytest.fixture
+def orders():
+    return order_lines()
+
+
+def test_add_orders_matches_compute_rfm(orders):
+    first, *rest = batches(orders, 5)
+    store = RFMStore.from_orders(first)
+    for batch in rest:
+        store.add_orders(batch)
+    as_of = pd.Timestamp("2018-09-01")
+    pd.testing.assert_frame_equal(sorted_rfm(store.rfm(as_of)), sorted_rfm(compute_rfm(orders, as_of)))
+    assert store.latest_purchase_date() == orders["order_purchase_timestamp"].max().normalize()
+
+
+def test_add_orders_to_empty_store(orders):
+    store = RFMStore()
+    for batch in batches(orders, 3):
+        store.add_orders(batch)
+    pd.testing.assert_frame_equal(sorted_rfm(store.rfm()), sorted_rfm(compute_rfm(orders)))
+
+
+def test_save_appends_parts(orders, tmp_path):
+    path = tmp_path / "rfm_state.parquet"
+    first, *rest = batches(orders, 4)
+    store = RFMStore.from_orders(first)
+    store.save(path)
+    for batch in rest:
+        store = RFMStore.load(path)
+        store.add_orders(batch)
+        store.save(path)
+    assert len(list(path.glob("part-*.parquet"))) == 4
+    pd.testing.assert_frame_equal(sorted_rfm(RFMStore.load(path).rfm()), sorted_rfm(compute_rfm(orders)))
+
+    # Compacting keeps the state
+    RFMStore.load(path).save(path, compact=True)
+    assert len(list(path.glob("part-*.parquet"))) == 1
+    pd.testing.assert_frame_equal(sorted_rfm(RFMStore.load(path).rfm()), sorted_rfm(compute_rfm(orders)))
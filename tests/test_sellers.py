@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sellers import METRICS, SellerFacts
+
+
+def seller_facts(n_sellers=300, seed=0):
+    rng = np.random.default_rng(seed)
+    # Few distinct values, so ranks have many ties, and some missing metrics
+    facts = pd.DataFrame({
+        "seller_id": [f"seller-{i:04d}" for i in range(n_sellers)],
+        "revenue": rng.integers(0, 20, size=n_sellers) * 100.0,
+        "orders": rng.integers(1, 30, size=n_sellers),
+        "avg_review_score": rng.choice([1.0, 2.5, 4.0, 5.0, np.nan], size=n_sellers),
+        "freight_share": rng.uniform(0, 0.5, size=n_sellers).round(1),
+        "late_shipping_rate": np.where(rng.random(n_sellers) < 0.2, np.nan, rng.integers(0, 4, size=n_sellers) / 4),
+        "seller_city": pd.Categorical(rng.choice(["sao paulo", "curitiba", "ibitinga"], size=n_sellers)),
+        "seller_state": pd.Categorical(rng.choice(["SP", "PR", "RJ"], size=n_sellers)),
+    })
+    return facts
+
+
+@pytest.mark.parametrize("metric", list(METRICS))
+@pytest.mark.parametrize("bottom", [False, True])
+@pytest.mark.parametrize("n, min_orders", [(1, 1), (10, 1), (25, 10), (300, 1), (1000, 5), (10, 40)])
+def test_rank_matches_sort(metric, bottom, n, min_orders):
+    facts = seller_facts()
+    result = SellerFacts(facts).rank(metric, n=n, bottom=bottom, min_orders=min_orders)
+    eligible = facts[(facts["orders"] >= min_orders) & facts[metric].notna()]
+    expected = eligible.sort_values(metric, ascending=bottom, kind="stable").head(n).reset_index(drop=True)
+    pd.testing.assert_frame_equal(result, expected, check_categorical=False)
+
+
+def test_rank_keeps_only_ranked_categories():
+    facts = seller_facts()
+    ranked = SellerFacts(facts).rank("revenue", n=3)
+    assert set(ranked["seller_state"].cat.categories) == set(ranked["seller_state"])
+    assert set(ranked["seller_city"].cat.categories) == set(ranked["seller_city"])
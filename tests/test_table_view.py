@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import load_all_data
+from table_view import csv_export, restrict, search_positions, sort_order, view_positions, write_csv
+
+COLUMNS = ["order_id", "customer_city", "product_category_name_english", "price", "review_score", "order_purchase_timestamp"]
+
+
+def expected_positions(df, base=None, search=None, sort=None):
+    # The same view with plain pandas: filter, then a stable sort with missing values last
+    view = df if base is None else df.iloc[base]
+    if search and search[1]:
+        view = view[view[search[0]].astype("string").str.contains(search[1], case=False, regex=False).fillna(False)]
+    if sort:
+        view = view.sort_values(sort[0], ascending=sort[1], kind="stable", na_position="last")
+    return df.index.get_indexer(view.index)
+
+
+@pytest.mark.parametrize("base", [None, "even"])
+@pytest.mark.parametrize("search", [None, ("customer_city", "RIO"), ("product_category_name_english", "bea"), ("order_id", "0012"), ("customer_city", "nowhere")])
+@pytest.mark.parametrize("sort", [None, ("price", True), ("review_score", False), ("customer_city", True), ("order_purchase_timestamp", False)])
+def test_view_positions_matches_pandas(all_data_dir, base, search, sort):
+    df = load_all_data(columns=COLUMNS)
+    base = None if base is None else np.arange(0, len(df), 2)
+    result = view_positions(len(df), base=base, search=search, sort=sort)
+    np.testing.assert_array_equal(result, expected_positions(df, base, search, sort))
+
+
+def test_building_blocks():
+    values = pd.Series(["Rio", None, "sao paulo", "rio de janeiro"], dtype="category")
+    np.testing.assert_array_equal(search_positions(values, "rio"), [0, 3])
+    np.testing.assert_array_equal(search_positions(values.astype(object), "rio"), [0, 3])
+    np.testing.assert_array_equal(sort_order(pd.Series([2.0, np.nan, 1.0, 2.0]), ascending=False), [0, 3, 2, 1])
+    np.testing.assert_array_equal(restrict(np.array([3, 1, 0, 2]), np.array([0, 3]), 4), [3, 0])
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 1000])
+def test_write_csv_in_chunks(all_data_dir, chunksize):
+    df = load_all_data(columns=COLUMNS)
+    positions = np.arange(len(df))[::-3][:100]
+    columns = ["price", "order_id", "customer_city"]
+    out = io.BytesIO()
+    write_csv(df, positions, columns, out, chunksize=chunksize)
+    expected = df.iloc[positions][columns].to_csv(index=False).encode("utf-8")
+    assert out.getvalue() == expected
+    assert csv_export(df, positions, columns) == expected
+
+
+def test_csv_export_of_empty_view(all_data_dir):
+    df = load_all_data(columns=COLUMNS)
+    assert csv_export(df, np.empty(0, dtype="int64"), ["order_id", "price"]) == b"order_id,price\n"
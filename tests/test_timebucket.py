@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from timebucket import GRANULARITIES, count_unique_per_period, period_starts
+
+# pandas period of every granularity (weeks starting on Monday)
+PERIODS = {"Day": "D", "Week": "W-SUN", "Month": "M", "Quarter": "Q"}
+
+
+def timestamps(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    # Two and a half years, including a leap day and year ends
+    values = pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 900 * 86400, size=n), unit="s")
+    values = pd.Series(values).where(rng.random(n) > 0.05)
+    edges = pd.Series(pd.to_datetime([
+        "2016-02-29 23:59:59", "2016-12-31 23:59:59", "2017-01-01 00:00:00", "2017-01-02 00:00:00", "1969-12-31 12:00:00",
+    ]))
+    return pd.concat([values, edges], ignore_index=True)
+
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+def test_period_starts_match_pandas_periods(granularity):
+    values = timestamps()
+    expected = values.dt.to_period(PERIODS[granularity]).dt.start_time
+    result = period_starts(values, granularity)
+    assert result.dtype == "datetime64[ns]"
+    pd.testing.assert_series_equal(pd.Series(result), expected, check_names=False)
+
+
+@pytest.mark.parametrize("granularity", list(GRANULARITIES))
+def test_count_unique_per_period_matches_groupby(granularity):
+    values = timestamps()
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"order_purchase_timestamp": values, "customer_id": rng.integers(300, size=len(values))})
+    period = df["order_purchase_timestamp"].dt.to_period(PERIODS[granularity]).dt.start_time.rename("period")
+    expected = df.groupby(period)["customer_id"].nunique().reset_index()
+    result = count_unique_per_period(df, "order_purchase_timestamp", "customer_id", granularity)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_unknown_granularity():
+    with pytest.raises(ValueError):
+        period_starts(timestamps(), "Year")